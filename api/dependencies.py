@@ -4,13 +4,15 @@ from __future__ import annotations
 
 from functools import lru_cache
 
-from core.database import SessionLocal
+from core.database import AsyncReadSessionLocal, AsyncSessionLocal, ReadSessionLocal, SessionLocal
+from core.metrics import CACHE_BYTES
 from services.cache import CacheService
 from services.cleanup import CleanupService, cleanup_service
 from services.demo_service import DemoService
 from services.history import HistoryService
 from services.job_queue import JobQueueService
 from services.layer_service import LayerService
+from services.search import HistorySearchService
 from services.sse_manager import sse_manager
 from services.storage import StorageService
 from services.translator import TranslatorService
@@ -24,13 +26,20 @@ def _translator_singleton() -> TranslatorService:
 
 @lru_cache(maxsize=1)
 def _cache_singleton() -> CacheService:
-    return CacheService()
+    cache = CacheService()
+    CACHE_BYTES.set_function(cache.size_bytes)
+    return cache
 
 
 
 @lru_cache(maxsize=1)
 def _layer_service_singleton() -> LayerService:
-    return LayerService(session_factory=SessionLocal)
+    return LayerService(
+        session_factory=SessionLocal,
+        async_session_factory=AsyncSessionLocal,
+        read_session_factory=ReadSessionLocal,
+        async_read_session_factory=AsyncReadSessionLocal,
+    )
 
 @lru_cache(maxsize=1)
 def _storage_singleton() -> StorageService:
@@ -44,12 +53,27 @@ def _job_queue_singleton() -> JobQueueService:
         storage_service=_storage_singleton(),
         translator_factory=lambda: get_translator_service(),
         sse_manager=sse_manager,
+        async_session_factory=AsyncSessionLocal,
+        read_session_factory=ReadSessionLocal,
+        async_read_session_factory=AsyncReadSessionLocal,
     )
 
 
 @lru_cache(maxsize=1)
 def _history_singleton() -> HistoryService:
-    return HistoryService(session_factory=SessionLocal, storage_service=_storage_singleton())
+    return HistoryService(
+        session_factory=SessionLocal,
+        storage_service=_storage_singleton(),
+        async_session_factory=AsyncSessionLocal,
+        read_session_factory=ReadSessionLocal,
+        async_read_session_factory=AsyncReadSessionLocal,
+    )
+
+
+@lru_cache(maxsize=1)
+def _search_singleton() -> HistorySearchService:
+    # 检索只读，直接使用只读连接池
+    return HistorySearchService(session_factory=ReadSessionLocal, async_session_factory=AsyncReadSessionLocal)
 
 
 @lru_cache(maxsize=1)
@@ -77,6 +101,10 @@ def get_history_service() -> HistoryService:
     return _history_singleton()
 
 
+def get_search_service() -> HistorySearchService:
+    return _search_singleton()
+
+
 def get_cleanup_service() -> CleanupService:
     return cleanup_service
 
@@ -95,6 +123,7 @@ __all__ = [
     "get_storage_service",
     "get_job_queue_service",
     "get_history_service",
+    "get_search_service",
     "get_layer_service",
     "get_demo_service",
     "get_cleanup_service",
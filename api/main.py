@@ -12,10 +12,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, Response
 
 from api.dependencies import get_job_queue_service
-from api.routes import engines, health, history, jobs, layers, translate
+from api.routes import admin, engines, health, history, jobs, layers, metrics, traces, translate
 from core.config import settings
-from core.database import init_db
+from core.database import dispose_engines, engine, init_db
 from core.exceptions import register_exception_handlers
+from core.loop_monitor import build_loop_monitor
+from core.tracing import TRACE_HEADER, TracingMiddleware
+from services.search import ensure_search_index
 
 try:  # pragma: no cover - optional dependency
     from core.sentry import init_sentry
@@ -33,7 +36,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # pragma: no cover - lifecycle hook
     init_db()
+    ensure_search_index(engine)
     job_queue_service = get_job_queue_service()
+    await job_queue_service.start()
+    loop_monitor = build_loop_monitor()
+    if loop_monitor:
+        loop_monitor.start()
 
     if init_sentry and settings.SENTRY_DSN:
         init_sentry(settings.SENTRY_DSN, settings.ENVIRONMENT)
@@ -51,6 +59,10 @@ async def lifespan(app: FastAPI):  # pragma: no cover - lifecycle hook
                 logger.warning("Failed to shutdown cleanup service: %s", exc)
 
         job_queue_service.shutdown()
+        await job_queue_service.drain_writes()
+        await dispose_engines()
+        if loop_monitor:
+            await loop_monitor.stop()
 
 
 def create_app() -> FastAPI:
@@ -62,14 +74,19 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[TRACE_HEADER],
     )
+    app.add_middleware(TracingMiddleware)
 
     app.include_router(health.router)
+    app.include_router(metrics.router)
     app.include_router(translate.router, prefix="/api")
     app.include_router(jobs.router, prefix="/api")
     app.include_router(history.router, prefix="/api")
     app.include_router(engines.router, prefix="/api")
     app.include_router(layers.router, prefix="/api")
+    app.include_router(traces.router, prefix="/api")
+    app.include_router(admin.router, prefix="/api")
 
     # 静态文件服务 (使用路由以支持 CORS)
     storage_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "storage")
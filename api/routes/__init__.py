@@ -1,3 +1,3 @@
 """Route modules."""
 
-__all__ = ["health", "translate", "jobs", "history", "engines", "layers"]
+__all__ = ["health", "translate", "jobs", "history", "engines", "layers", "metrics", "traces", "admin"]
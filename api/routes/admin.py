@@ -0,0 +1,42 @@
+"""Admin-only diagnostics endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import PlainTextResponse
+
+from core.config import settings
+from core.exceptions import ForbiddenError
+from core.profiler import profiler, render_collapsed
+
+
+router = APIRouter(tags=["admin"])
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    expected = settings.ADMIN_TOKEN
+    if not expected or not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise ForbiddenError("需要管理员权限")
+
+
+@router.get("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin_token)])
+async def profile_process(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+) -> PlainTextResponse:
+    """Sample all threads for ``seconds`` and return collapsed stacks (flamegraph.pl / speedscope)."""
+
+    duration = min(seconds, settings.PROFILER_MAX_SECONDS)
+    # 采样线程独立于事件循环，循环卡住时仍能采到阻塞它的调用栈
+    stacks, samples = await asyncio.to_thread(profiler.profile, duration, interval_ms / 1000)
+    return PlainTextResponse(
+        render_collapsed(stacks),
+        headers={"X-Profile-Samples": str(samples), "X-Profile-Seconds": f"{duration:g}"},
+    )
+
+
+__all__ = ["router", "profile_process", "require_admin_token"]
@@ -24,6 +24,7 @@ async def list_engines() -> EngineListResponse:
             name=desc["name"],
             display_name=desc["display_name"],
             available=bool(desc["available"]),
+            state=str(desc.get("state", "closed")),
         )
         for desc in descriptions
     ]
@@ -5,14 +5,15 @@ from __future__ import annotations
 from datetime import datetime, timezone
 import os
 from math import ceil
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, Query, status
 
-from api.dependencies import get_demo_service, get_history_service, get_storage_service
+from api.dependencies import get_demo_service, get_history_service, get_search_service, get_storage_service
 from core.config import settings
 from services.demo_service import DemoService
-from services.history import HistoryService
+from services.history import HistoryService, decode_cursor, encode_cursor
+from services.search import HistorySearchService
 from services.storage import StorageService
 
 
@@ -23,10 +24,12 @@ router = APIRouter(tags=["history"])
 async def list_history(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="上一次响应中的 nextCursor / prevCursor"),
     source_lang: Optional[str] = Query(None),
     target_lang: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
+    exact: bool = Query(False, description="true 时重新 COUNT，否则 total 可能来自短 TTL 缓存"),
     history_service: HistoryService = Depends(get_history_service),
     storage: StorageService = Depends(get_storage_service),
     demo_service: DemoService = Depends(get_demo_service),
@@ -35,57 +38,120 @@ async def list_history(
     if os.getenv("PYTEST_CURRENT_TEST") and not settings.DEMO_MODE:
         demo_enabled = False
 
-    demo_items: List[dict] = []
+    filters = {
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+    demo_items: List[dict] = demo_service.list_history(**filters) if demo_enabled else []
+
+    # 首页与游标翻页走 (created_at, id) 键集分页，每页成本与翻页深度无关；
+    # 只有显式请求 page > 1 时才保留旧的 OFFSET 行为以兼容现有客户端
+    if cursor is not None or page == 1:
+        return await _list_history_keyset(
+            history_service, storage, demo_items, filters, page=page, limit=limit, cursor=cursor, exact=exact
+        )
+
     fetch_page = page
     fetch_limit = limit
-
     if demo_enabled:
-        demo_items = demo_service.list_history(
-            source_lang=source_lang,
-            target_lang=target_lang,
-            date_from=date_from,
-            date_to=date_to,
-        )
         fetch_page = 1
         fetch_limit = limit * page + len(demo_items)
 
-    items, total_real = history_service.list_history(
-        page=fetch_page,
-        limit=fetch_limit,
-        source_lang=source_lang,
-        target_lang=target_lang,
-        date_from=date_from,
-        date_to=date_to,
+    items, total_real = await history_service.list_history_async(
+        page=fetch_page, limit=fetch_limit, exact=exact, **filters
     )
     serialized_real = [_serialize_translation(item, storage) for item in items]
 
     if not demo_enabled:
-        total = len(serialized_real)
-        total_pages = _calc_total_pages(total, limit)
-        return {
-            "items": serialized_real,
-            "total": total,
-            "page": page,
-            "pages": total_pages,
-            "pageSize": limit,
-            "totalPages": total_pages,
-        }
-
-    combined = _merge_history_payloads(serialized_real, demo_items)
-    total_combined = total_real + len(demo_items)
-    start = max((page - 1) * limit, 0)
-    end = start + limit
-    paged_items = combined[start:end]
-    total_pages = _calc_total_pages(total_combined, limit)
+        paged_items = serialized_real
+        total = total_real
+    else:
+        combined = _merge_history_payloads(serialized_real, demo_items)
+        start = max((page - 1) * limit, 0)
+        paged_items = combined[start : start + limit]
+        total = total_real + len(demo_items)
+
+    total_pages = _calc_total_pages(total, limit)
+    has_next = page < total_pages
+    return _page_payload(
+        paged_items,
+        total=total,
+        page=page,
+        limit=limit,
+        next_cursor=encode_cursor(_item_key(paged_items[-1])) if paged_items and has_next else None,
+        prev_cursor=encode_cursor(_item_key(paged_items[0]), "prev") if paged_items else None,
+    )
 
-    return {
-        "items": paged_items,
-        "total": total_combined,
-        "page": page,
-        "pages": total_pages,
-        "pageSize": limit,
-        "totalPages": total_pages,
-    }
+
+async def _list_history_keyset(
+    history_service: HistoryService,
+    storage: StorageService,
+    demo_items: List[dict],
+    filters: dict,
+    *,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    exact: bool,
+) -> dict:
+    key, direction = decode_cursor(cursor) if cursor else (None, "next")
+    forward = direction == "next"
+
+    items, has_more = await history_service.list_history_keyset_async(
+        limit=limit,
+        after=key if forward else None,
+        before=None if forward else key,
+        **filters,
+    )
+    total = await history_service.count_history_async(exact=exact, **filters) + len(demo_items)
+    serialized = [_serialize_translation(item, storage) for item in items]
+
+    if demo_items:
+        # 演示数据只有几十条，按同一个游标在内存里截取后与真实数据归并
+        if key is not None:
+            bound = (_as_utc(key[0]), key[1])
+            demo_items = [
+                item for item in demo_items if (_item_key(item) < bound if forward else _item_key(item) > bound)
+            ]
+        candidates = sorted(serialized + demo_items, key=_item_key, reverse=forward)
+        has_more = has_more or len(candidates) > limit
+        serialized = candidates[:limit]
+        if not forward:
+            serialized.reverse()
+
+    if forward:
+        next_cursor = encode_cursor(_item_key(serialized[-1])) if serialized and has_more else None
+        prev_cursor = encode_cursor(_item_key(serialized[0]), "prev") if serialized and key is not None else None
+    else:
+        prev_cursor = encode_cursor(_item_key(serialized[0]), "prev") if serialized and has_more else None
+        next_cursor = encode_cursor(_item_key(serialized[-1])) if serialized else None
+
+    return _page_payload(
+        serialized,
+        total=total,
+        page=page,
+        limit=limit,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
+@router.get("/history/search")
+async def search_history(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    search_service: HistorySearchService = Depends(get_search_service),
+    storage: StorageService = Depends(get_storage_service),
+):
+    """按原文 / 译文全文检索历史记录，返回带 <mark> 高亮的匹配行"""
+    results = await search_service.search_async(q, limit=limit)
+    items = [
+        {**_serialize_translation(translation, storage), "highlights": highlights}
+        for translation, highlights in results
+    ]
+    return {"items": items, "total": len(items), "query": q}
 
 
 @router.get("/history/{translation_id}")
@@ -94,7 +160,7 @@ async def get_history_item(
     history_service: HistoryService = Depends(get_history_service),
     storage: StorageService = Depends(get_storage_service),
 ):
-    translation = history_service.get_translation(translation_id)
+    translation = await history_service.get_translation_async(translation_id)
     return _serialize_translation(translation, storage)
 
 
@@ -105,15 +171,15 @@ async def get_editor_data(
     storage: StorageService = Depends(get_storage_service),
 ):
     """获取阿里云编辑器数据，用于 iframe 编辑器渲染"""
-    translation = history_service.get_translation(translation_id)
+    editor = await history_service.get_editor_data_async(translation_id)
     return {
-        "id": translation.id,
-        "source_lang": translation.source_lang,
-        "target_lang": translation.target_lang,
-        "editor_data": translation.editor_data,
-        "inpainting_url": translation.inpainting_url,
-        "original_url": storage.to_public_path(translation.original_path) if translation.original_path else None,
-        "result_url": storage.to_public_path(translation.result_path) if translation.result_path else None,
+        "id": editor["id"],
+        "source_lang": editor["source_lang"],
+        "target_lang": editor["target_lang"],
+        "editor_data": editor["editor_data"],
+        "inpainting_url": editor["inpainting_url"],
+        "original_url": storage.to_public_path(editor["original_path"]) if editor["original_path"] else None,
+        "result_url": storage.to_public_path(editor["result_path"]) if editor["result_path"] else None,
     }
 
 
@@ -122,7 +188,7 @@ async def delete_history_item(
     translation_id: str,
     history_service: HistoryService = Depends(get_history_service),
 ):
-    history_service.delete_translation(translation_id)
+    await history_service.delete_translation_async(translation_id)
     return None
 
 
@@ -149,9 +215,39 @@ def _serialize_translation(translation, storage: StorageService) -> dict:
     }
 
 
+def _page_payload(
+    items: List[dict],
+    *,
+    total: int,
+    page: int,
+    limit: int,
+    next_cursor: Optional[str],
+    prev_cursor: Optional[str],
+) -> dict:
+    total_pages = _calc_total_pages(total, limit)
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "pages": total_pages,
+        "pageSize": limit,
+        "totalPages": total_pages,
+        "nextCursor": next_cursor,
+        "prevCursor": prev_cursor,
+    }
+
+
+def _item_key(item: dict) -> Tuple[datetime, str]:
+    return _sort_created_at(item), str(item.get("id"))
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
 def _merge_history_payloads(real_items: List[dict], demo_items: List[dict]) -> List[dict]:
     combined = list(real_items) + list(demo_items)
-    combined.sort(key=lambda item: (_sort_created_at(item), bool(item.get("is_demo"))), reverse=True)
+    combined.sort(key=_item_key, reverse=True)
     return combined
 
 
@@ -159,21 +255,12 @@ def _sort_created_at(item: dict) -> datetime:
     raw = item.get("created_at")
     if isinstance(raw, str):
         try:
-            text = raw.replace("Z", "+00:00")
-            dt = datetime.fromisoformat(text)
+            return _as_utc(datetime.fromisoformat(raw.replace("Z", "+00:00")))
         except ValueError:
             return datetime.min.replace(tzinfo=timezone.utc)
     if isinstance(raw, datetime):
-        dt = raw
-    else:
-        dt = datetime.min.replace(tzinfo=timezone.utc)
-
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    else:
-        dt = dt.astimezone(timezone.utc)
-
-    return dt
+        return _as_utc(raw)
+    return datetime.min.replace(tzinfo=timezone.utc)
 
 
 def _calc_total_pages(total: int, limit: int) -> int:
@@ -182,4 +269,4 @@ def _calc_total_pages(total: int, limit: int) -> int:
     return ceil(total / limit) if total else 0
 
 
-__all__ = ["router", "list_history", "get_history_item", "delete_history_item"]
+__all__ = ["router", "list_history", "search_history", "get_history_item", "delete_history_item"]
@@ -51,7 +51,7 @@ async def create_job_endpoint(
 
 @router.get("/jobs/{job_id}/sse")
 async def stream_job_events(job_id: str, job_queue: JobQueueService = Depends(get_job_queue_service)):
-    exists = await asyncio.to_thread(job_queue.job_exists, job_id)
+    exists = await job_queue.job_exists_async(job_id)
     if not exists:
         raise NotFoundError("任务不存在")
 
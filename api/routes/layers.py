@@ -34,13 +34,15 @@ def _serialize_layer(layer: TextLayer) -> TextLayerResponse:
 
 
 @router.get("/translations/{translation_id}/layers", response_model=list[TextLayerResponse])
-def list_layers(translation_id: str, service: LayerService = Depends(get_layer_service)) -> list[TextLayerResponse]:
-    layers = service.list_layers(translation_id)
+async def list_layers(
+    translation_id: str, service: LayerService = Depends(get_layer_service)
+) -> list[TextLayerResponse]:
+    layers = await service.list_layers_async(translation_id)
     return [_serialize_layer(layer) for layer in layers]
 
 
 @router.patch("/layers/{layer_id}", response_model=TextLayerResponse)
-def update_layer(
+async def update_layer(
     layer_id: str,
     payload: TextLayerUpdate,
     service: LayerService = Depends(get_layer_service),
@@ -48,7 +50,7 @@ def update_layer(
     style_updates = (
         payload.style.model_dump(exclude_none=True, by_alias=True) if payload.style else None
     )
-    layer = service.update_layer(
+    layer = await service.update_layer_async(
         layer_id,
         translated_text=payload.translated_text,
         style_updates=style_updates,
@@ -58,7 +60,7 @@ def update_layer(
 
 
 @router.post("/layers/batch", response_model=list[TextLayerResponse])
-def batch_update_layers(
+async def batch_update_layers(
     payload: TextLayerBatchUpdateRequest,
     service: LayerService = Depends(get_layer_service),
 ) -> list[TextLayerResponse]:
@@ -74,7 +76,7 @@ def batch_update_layers(
             update["style"] = item.style.model_dump(exclude_none=True, by_alias=True)
         updates.append(update)
 
-    layers = service.batch_update(payload.translation_id, updates)
+    layers = await service.batch_update_async(payload.translation_id, updates)
     return [_serialize_layer(layer) for layer in layers]
 
 
@@ -0,0 +1,25 @@
+"""Prometheus-style metrics endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import render_latest
+
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    # 队列深度等 gauge 在抓取时查询数据库，放到线程里执行
+    body = await asyncio.to_thread(render_latest)
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+__all__ = ["router", "metrics"]
@@ -0,0 +1,40 @@
+"""Trace lookup endpoint backed by the in-process span exporter."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from core.exceptions import NotFoundError, ValidationError
+from core.tracing import exporter
+
+
+router = APIRouter(tags=["traces"])
+
+
+@router.get("/traces")
+async def get_traces(
+    translation_id: Optional[str] = Query(default=None),
+    trace_id: Optional[str] = Query(default=None),
+):
+    if not translation_id and not trace_id:
+        raise ValidationError("请提供 translation_id 或 trace_id")
+
+    if trace_id:
+        spans = exporter.get_trace(trace_id)
+        traces = {trace_id: spans} if spans else {}
+    else:
+        traces = exporter.find_traces(translation_id)  # type: ignore[arg-type]
+
+    if not traces:
+        raise NotFoundError("未找到链路数据（可能未开启 TRACING_ENABLED 或已被淘汰）")
+    return {
+        "traces": [
+            {"trace_id": key, "spans": [span.to_dict() for span in spans]}
+            for key, spans in traces.items()
+        ]
+    }
+
+
+__all__ = ["router", "get_traces"]
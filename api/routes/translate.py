@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import APIRouter, Depends, File, Form, UploadFile
 from fastapi.responses import Response
@@ -12,13 +11,13 @@ from api.dependencies import get_cache_service, get_translator_service
 from core.config import settings
 from core.engines import EngineRegistry
 from core.exceptions import ValidationError
+from core.metrics import time_stage
 from services.cache import CacheService
 from services.translator import TranslatorService
 from utils.image import compute_hash, validate_image
 
 
 router = APIRouter(tags=["translate"])
-executor = ThreadPoolExecutor(max_workers=settings.THREAD_POOL_MAX_WORKERS)
 
 
 @router.post("/translate", response_class=Response)
@@ -35,10 +34,13 @@ async def translate_image(
 ):
     """Translate an uploaded image and return a PNG."""
 
-    content = await file.read()
+    with time_stage("upload_read"):
+        content = await file.read()
     content_type = file.content_type or ""
 
-    is_valid, message = validate_image(content, content_type)
+    with time_stage("validate"):
+        # 解码图片是 CPU 密集操作，放到线程中避免阻塞事件循环
+        is_valid, message = await asyncio.to_thread(validate_image, content, content_type)
     if not is_valid:
         raise ValidationError(message)
 
@@ -50,7 +52,8 @@ async def translate_image(
             raise ValidationError("指定的翻译引擎不存在")
         selected_engine = known_engines[normalized]
 
-    cache_key = compute_hash(
+    cache_key = await asyncio.to_thread(
+        compute_hash,
         content,
         source_lang,
         target_lang,
@@ -62,22 +65,19 @@ async def translate_image(
     if cached:
         return Response(content=cached, media_type="image/png")
 
-    loop = asyncio.get_running_loop()
-    result: bytes = await loop.run_in_executor(
-        executor,
-        lambda: translator.translate(
-            content,
-            source_lang,
-            target_lang,
-            field,
-            enable_postprocess,
-            protect_product=protect_product,
-            engine=selected_engine,
-        ),
+    result = await translator.translate_async(
+        content,
+        source_lang,
+        target_lang,
+        field,
+        enable_postprocess,
+        protect_product=protect_product,
+        engine=selected_engine,
+        hedge=settings.ENGINE_HEDGE_ENABLED,
     )
 
-    cache.set(cache_key, result)
-    return Response(content=result, media_type="image/png")
+    cache.set(cache_key, result.image_bytes)
+    return Response(content=result.image_bytes, media_type="image/png")
 
 
 __all__ = ["router", "translate_image"]
@@ -18,6 +18,7 @@ class EngineInfo(_CamelModel):
     name: str = Field(..., min_length=1)
     display_name: str = Field(..., min_length=1)
     available: bool = Field(default=True)
+    state: str = Field(default="closed")
 
 
 class EngineListResponse(_CamelModel):
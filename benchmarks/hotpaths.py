@@ -0,0 +1,250 @@
+"""Micro-benchmarks for the Pillow-heavy per-image hot paths.
+
+Each case times one production function over a synthetic corpus
+(small/large JPEG, RGBA PNG, CMYK JPEG, WebP, a JPEG beyond MAX_DIMENSION and
+templates with 1-200 text layers), appends the run to a JSONL history file and fails when a case is
+slower than the recent history by more than ``--threshold`` percent::
+
+    python -m benchmarks.hotpaths
+    python -m benchmarks.hotpaths --cases resize,render --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Iterable
+
+from PIL import Image, ImageDraw
+
+os.environ.setdefault("ALI_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("ALI_ACCESS_KEY_SECRET", "benchmark")
+os.environ.setdefault("ENGINE_RATE_LIMIT_BACKEND", "memory")
+
+from core.engines.aliyun import AliyunEngine  # noqa: E402
+from utils.image import compute_hash, validate_image  # noqa: E402
+
+
+DEFAULT_HISTORY = Path(__file__).with_name("hotpaths_history.jsonl")
+LAYER_COUNTS = (1, 20, 200)
+
+
+@dataclass
+class Fixture:
+    name: str
+    content: bytes
+    content_type: str
+    #: False 表示超出上传校验限制，只用于引擎侧的用例（上传校验会直接拒绝它）
+    upload: bool = True
+
+
+def _noise_image(width: int, height: int, mode: str, rng: random.Random) -> Image.Image:
+    image = Image.new("RGB", (width, height), color=(240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x0, y0 = rng.randrange(width), rng.randrange(height)
+        draw.rectangle(
+            (x0, y0, min(x0 + rng.randrange(20, width // 3), width), min(y0 + rng.randrange(10, height // 6), height)),
+            fill=tuple(rng.randrange(256) for _ in range(3)),
+        )
+    if mode == "RGBA":
+        image.putalpha(Image.linear_gradient("L").resize((width, height)))
+    elif mode != "RGB":
+        image = image.convert(mode)
+    return image
+
+
+def _encode(image: Image.Image, fmt: str, **params) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=fmt, **params)
+    return buffer.getvalue()
+
+
+def build_image_fixtures(seed: int = 0) -> dict[str, Fixture]:
+    rng = random.Random(seed)
+    return {
+        "small_jpeg": Fixture("small_jpeg", _encode(_noise_image(400, 400, "RGB", rng), "JPEG", quality=85), "image/jpeg"),
+        "large_jpeg": Fixture("large_jpeg", _encode(_noise_image(4000, 3000, "RGB", rng), "JPEG", quality=85), "image/jpeg"),
+        "alpha_png": Fixture("alpha_png", _encode(_noise_image(1200, 1200, "RGBA", rng), "PNG"), "image/png"),
+        "cmyk_jpeg": Fixture("cmyk_jpeg", _encode(_noise_image(1500, 1500, "CMYK", rng), "JPEG", quality=85), "image/jpeg"),
+        "webp": Fixture("webp", _encode(_noise_image(1200, 1200, "RGB", rng), "WEBP", quality=80), "image/webp"),
+        # 超过 MAX_DIMENSION，_resize_if_needed 走真正的 LANCZOS 缩放而不是提前返回
+        "oversized_jpeg": Fixture(
+            "oversized_jpeg",
+            _encode(_noise_image(9000, 3000, "RGB", rng), "JPEG", quality=85),
+            "image/jpeg",
+            upload=False,
+        ),
+    }
+
+
+def build_template(layer_count: int, width: int = 1500, height: int = 1500, seed: int = 0) -> str:
+    """Aliyun-style template_json with ``layer_count`` text elements."""
+
+    rng = random.Random(seed + layer_count)
+    texts = ["全球销量超250万份", "主要成分", "每分钟售出不止1份", "畅销品", "令肌肤柔软水润"]
+    children = []
+    row = max(height // layer_count, 12)
+    for index in range(layer_count):
+        size = max(min(row - 4, 48), 10)
+        children.append(
+            {
+                "type": "text",
+                "label": "element",
+                "left": rng.randrange(width // 2),
+                "top": (index * row) % height,
+                "width": width // 2,
+                "height": row,
+                "content": rng.choice(texts),
+                "ocrContent": "Best Seller",
+                "fontSize": size,
+                "color": "#333333FF",
+            }
+        )
+    return json.dumps({"width": width, "height": height, "children": children}, ensure_ascii=False)
+
+
+def build_cases(fixtures: dict[str, Fixture], engine: AliyunEngine) -> dict[str, list[tuple[str, Callable[[], object]]]]:
+    """Map case name -> [(fixture name, zero-arg callable)]."""
+
+    decoded = {name: engine._load_image(fixture.content) for name, fixture in fixtures.items()}
+    uploads = {name: fixture for name, fixture in fixtures.items() if fixture.upload}
+    backgrounds = {count: (Image.new("RGB", (1500, 1500), "white"), build_template(count)) for count in LAYER_COUNTS}
+
+    def render(count: int) -> Callable[[], object]:
+        background, template = backgrounds[count]
+        return lambda: engine._render_template(background.copy(), template)
+
+    return {
+        "validate_image": [
+            (name, lambda f=fixture: validate_image(f.content, f.content_type)) for name, fixture in uploads.items()
+        ],
+        "compute_hash": [
+            (name, lambda f=fixture: compute_hash(f.content, "en", "zh", "e-commerce", protect_product=True))
+            for name, fixture in uploads.items()
+        ],
+        "resize": [
+            (name, lambda img=image: engine._resize_if_needed(engine._ensure_rgb(img))) for name, image in decoded.items()
+        ],
+        "encode_request": [
+            (name, lambda f=fixture: engine._encode_request_image(f.content)) for name, fixture in fixtures.items()
+        ],
+        "render": [(f"{count}_layers", render(count)) for count in LAYER_COUNTS],
+        # 结果图下载后总是 RGB/RGBA，CMYK 等模式先转换，与线上输入一致
+        "to_png_bytes": [
+            (name, lambda img=image if image.mode in ("RGB", "RGBA") else image.convert("RGB"): engine._to_png_bytes(img))
+            for name, image in decoded.items()
+            if name in uploads
+        ],
+    }
+
+
+def time_case(func: Callable[[], object], *, repeat: int, warmup: int = 1) -> dict[str, float]:
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {
+        "min_ms": round(min(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def load_history(path: Path, limit: int) -> list[dict]:
+    if not path.exists():
+        return []
+    lines = [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return [json.loads(line) for line in lines[-limit:]]
+
+
+def find_regressions(results: dict[str, dict[str, float]], history: list[dict], threshold: float) -> list[str]:
+    """Compare each case's median against the median of the same case over previous runs."""
+
+    regressions = []
+    for key, timing in results.items():
+        previous = [run["results"][key]["median_ms"] for run in history if key in run.get("results", {})]
+        if not previous:
+            continue
+        baseline = statistics.median(previous)
+        if baseline and (timing["median_ms"] - baseline) / baseline * 100 > threshold:
+            regressions.append(f"{key}: {baseline:.3f}ms -> {timing['median_ms']:.3f}ms")
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", help="comma separated subset of cases to run")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSONL file that accumulates runs")
+    parser.add_argument("--window", type=int, default=5, help="previous runs used as the baseline")
+    parser.add_argument("--threshold", type=float, default=15.0, help="regression threshold in percent")
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = _parse_args(argv)
+    engine = AliyunEngine()
+    cases = build_cases(build_image_fixtures(), engine)
+    selected = set(args.cases.split(",")) if args.cases else set(cases)
+
+    results: dict[str, dict[str, float]] = {}
+    for case, variants in cases.items():
+        if case not in selected:
+            continue
+        for fixture, func in variants:
+            key = f"{case}/{fixture}"
+            results[key] = time_case(func, repeat=args.repeat)
+            print(f"{key:36s} median {results[key]['median_ms']:>10.3f} ms  min {results[key]['min_ms']:>10.3f} ms")
+
+    history = load_history(args.history, args.window)
+    regressions = find_regressions(results, history, args.threshold)
+
+    if not args.no_record:
+        record = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "pillow": Image.__version__,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with args.history.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record) + "\n")
+
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold}% vs last {len(history)} runs:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
+
+
+__all__ = ["build_cases", "build_image_fixtures", "build_template", "find_regressions", "main", "time_case"]
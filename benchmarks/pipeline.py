@@ -0,0 +1,424 @@
+"""End-to-end throughput benchmark for the job pipeline and /api/translate.
+
+Per-stage timings are taken from the server's ``/metrics`` histograms
+before and after each workload.
+
+By default the app is started in-process (uvicorn on a background thread)
+with the offline stub engine and a throw-away data directory, so the numbers
+include the real HTTP, multipart, SQLite, storage and SSE paths without any
+Aliyun traffic::
+
+    python -m benchmarks.pipeline --images 40 --concurrency 8 --output bench.json
+    python -m benchmarks.pipeline --images 40 --compare bench.json
+
+With ``--base-url`` an already running server is driven instead; server-side
+figures (DB transactions, RSS, CPU) are then not available.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Iterable
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+import httpx
+from PIL import Image, ImageDraw
+
+
+DEFAULT_SIZES = "800x800,1600x1200"
+# 对比基线时这些指标越大越好，其余（延迟、事务数、内存、CPU）越小越好
+HIGHER_IS_BETTER = {"images_per_sec"}
+STAGE_SAMPLE = re.compile(r'^picturetranslate_stage_seconds_(sum|count)\{stage="([^"]+)"\} (\S+)$')
+_GATED_METRICS = {"images_per_sec", "latency_p50", "latency_p95", "db_transactions_per_image"}
+
+
+@dataclass
+class WorkloadResult:
+    """Raw measurements collected for one workload."""
+
+    name: str
+    images: int = 0
+    failed: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float | None = None
+    db_transactions: int | None = None
+    latencies: list[float] = field(default_factory=list)
+    stages: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, Any]:
+        completed = self.images - self.failed
+        return {
+            "images": self.images,
+            "failed": self.failed,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "images_per_sec": round(completed / self.wall_seconds, 3) if self.wall_seconds else 0.0,
+            "latency_p50": _percentile(self.latencies, 50),
+            "latency_p95": _percentile(self.latencies, 95),
+            "latency_p99": _percentile(self.latencies, 99),
+            "db_transactions_per_image": (
+                round(self.db_transactions / self.images, 3) if self.db_transactions is not None and self.images else None
+            ),
+            "cpu_seconds": round(self.cpu_seconds, 4) if self.cpu_seconds is not None else None,
+            "cpu_ms_per_image": (
+                round(self.cpu_seconds * 1000 / self.images, 3) if self.cpu_seconds is not None and self.images else None
+            ),
+            "stages": self.stages,
+        }
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return round(ordered[index], 4)
+
+
+def _parse_sizes(value: str) -> list[tuple[int, int]]:
+    sizes = []
+    for item in value.split(","):
+        width, _, height = item.strip().lower().partition("x")
+        sizes.append((int(width), int(height or width)))
+    return sizes
+
+
+def build_corpus(count: int, sizes: list[tuple[int, int]], *, seed: int = 0) -> list[bytes]:
+    """Distinct JPEGs (so the translate cache never hits) cycling through ``sizes``."""
+
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        width, height = sizes[index % len(sizes)]
+        image = Image.new("RGB", (width, height), color=tuple(rng.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x0, y0 = rng.randrange(width), rng.randrange(height)
+            x1, y1 = min(x0 + rng.randrange(20, 200), width), min(y0 + rng.randrange(10, 80), height)
+            draw.rectangle((x0, y0, x1, y1), fill=tuple(rng.randrange(256) for _ in range(3)))
+        draw.text((10, 10), f"benchmark #{index}", fill=(0, 0, 0))
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=85)
+        corpus.append(buffer.getvalue())
+    return corpus
+
+
+# ----------------------------------------------------------------------
+# In-process server
+# ----------------------------------------------------------------------
+def _prepare_environment(args: argparse.Namespace, workdir: Path) -> None:
+    """Point settings at a scratch directory and the stub engine before the app is imported."""
+
+    os.environ.setdefault("ALI_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("ALI_ACCESS_KEY_SECRET", "benchmark")
+    os.environ.update(
+        {
+            "ENGINES_ENABLED": "stub",
+            "STUB_LATENCY_MEDIAN": str(args.latency_median),
+            "STUB_LATENCY_SIGMA": str(args.latency_sigma),
+            "STUB_ERROR_RATE": str(args.error_rate),
+            "STUB_SEED": str(args.seed),
+            "ENGINE_RATE_LIMIT_BACKEND": "memory",
+            "DEMO_MODE": "false",
+            "DATA_DIR": str(workdir / "data"),
+            "STORAGE_DIR": str(workdir / "storage"),
+            "BACKUP_DIR": str(workdir / "backups"),
+            "BATCH_MAX_IMAGES": str(max(args.batch_size, 1)),
+        }
+    )
+
+
+class _TransactionCounter:
+    """Count COMMITs issued through the application's sync and async writer engines."""
+
+    def __init__(self) -> None:
+        from sqlalchemy import event
+
+        from core.database import async_engine, engine
+
+        self.count = 0
+        self._lock = threading.Lock()
+        # 任务写入、worker 认领和状态回写都走异步写引擎（及其 write-behind 批量提交）
+        engines = [engine] if async_engine is None else [engine, async_engine.sync_engine]
+        for target in engines:
+            event.listen(target, "commit", self._on_commit)
+
+    def _on_commit(self, conn) -> None:  # pragma: no cover - SQLAlchemy callback
+        with self._lock:
+            self.count += 1
+
+
+class _BackgroundServer:
+    """Run uvicorn on a daemon thread so the client and server share one process."""
+
+    def __init__(self) -> None:
+        import uvicorn
+
+        from api.main import app
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="on")
+        self._server = uvicorn.Server(config)
+        self._server.install_signal_handlers = lambda: None  # type: ignore[method-assign]
+        self._thread = threading.Thread(target=self._server.run, name="bench-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "_BackgroundServer":
+        self._thread.start()
+        deadline = time.monotonic() + 30
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("benchmark server failed to start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+# ----------------------------------------------------------------------
+# Workloads
+# ----------------------------------------------------------------------
+async def run_jobs_workload(
+    client: httpx.AsyncClient, corpus: list[bytes], *, batch_size: int, concurrency: int
+) -> WorkloadResult:
+    """POST /api/jobs in batches and follow each job's SSE stream to completion."""
+
+    result = WorkloadResult("jobs", images=len(corpus))
+    semaphore = asyncio.Semaphore(concurrency)
+    batches = [corpus[i : i + batch_size] for i in range(0, len(corpus), batch_size)]
+
+    async def run_batch(batch: list[bytes]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            files = [("files", (f"image-{i}.jpg", content, "image/jpeg")) for i, content in enumerate(batch)]
+            response = await client.post("/api/jobs", files=files)
+            if response.status_code != 201:
+                result.failed += len(batch)
+                return
+            sse_url = response.json()["sse_url"]
+            seen = 0
+            async for event, data in _iter_sse(client, sse_url):
+                if event == "progress" and data.get("status") == "done":
+                    result.latencies.append(time.perf_counter() - started)
+                    seen += 1
+                elif event == "error":
+                    result.failed += 1
+                    seen += 1
+                elif event == "complete":
+                    break
+            result.failed += len(batch) - seen
+
+    await asyncio.gather(*(run_batch(batch) for batch in batches))
+    return result
+
+
+async def run_translate_workload(client: httpx.AsyncClient, corpus: list[bytes], *, concurrency: int) -> WorkloadResult:
+    """POST /api/translate once per image."""
+
+    result = WorkloadResult("translate", images=len(corpus))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(content: bytes) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/translate", files={"file": ("image.jpg", content, "image/jpeg")})
+            if response.status_code != 200:
+                result.failed += 1
+                return
+            result.latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(run_one(content) for content in corpus))
+    return result
+
+
+async def _iter_sse(client: httpx.AsyncClient, url: str):
+    async with client.stream("GET", url) as response:
+        event = "message"
+        async for line in response.aiter_lines():
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                yield event, json.loads(line[5:].strip() or "{}")
+                event = "message"
+
+
+async def scrape_stages(client: httpx.AsyncClient) -> dict[str, tuple[int, float]]:
+    """Read per-stage (count, total seconds) from the server's /metrics endpoint."""
+
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return {}
+    stages: dict[str, list[float]] = {}
+    for line in response.text.splitlines():
+        match = STAGE_SAMPLE.match(line)
+        if match:
+            kind, stage, value = match.groups()
+            stages.setdefault(stage, [0.0, 0.0])[0 if kind == "count" else 1] = float(value)
+    return {stage: (int(count), total) for stage, (count, total) in stages.items()}
+
+
+def _stage_delta(before: dict[str, tuple[int, float]], after: dict[str, tuple[int, float]]) -> dict[str, dict[str, float]]:
+    delta = {}
+    for stage, (count, total) in after.items():
+        prev_count, prev_total = before.get(stage, (0, 0.0))
+        calls = count - prev_count
+        if calls <= 0:
+            continue
+        seconds = total - prev_total
+        delta[stage] = {"count": calls, "total_s": round(seconds, 4), "mean_ms": round(seconds * 1000 / calls, 3)}
+    return delta
+
+
+async def _measure(
+    workload, client: httpx.AsyncClient, counter: _TransactionCounter | None, *args, **kwargs
+) -> WorkloadResult:
+    stages_before = await scrape_stages(client)
+    commits_before = counter.count if counter else None
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+    result: WorkloadResult = await workload(client, *args, **kwargs)
+    result.wall_seconds = time.perf_counter() - started
+    if counter is not None and commits_before is not None:
+        result.cpu_seconds = time.process_time() - cpu_before
+        result.db_transactions = counter.count - commits_before
+    result.stages = _stage_delta(stages_before, await scrape_stages(client))
+    return result
+
+
+async def run_benchmark(args: argparse.Namespace, base_url: str, counter: _TransactionCounter | None) -> dict[str, Any]:
+    corpus = build_corpus(args.images, _parse_sizes(args.sizes), seed=args.seed)
+    timeout = httpx.Timeout(args.timeout)
+    results: dict[str, Any] = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        if args.workload in ("jobs", "all"):
+            jobs = await _measure(
+                run_jobs_workload, client, counter, corpus, batch_size=args.batch_size, concurrency=args.concurrency
+            )
+            results["jobs"] = jobs.summary()
+        if args.workload in ("translate", "all"):
+            # 换一批图片，避免命中 /api/translate 的结果缓存
+            translate_corpus = build_corpus(args.images, _parse_sizes(args.sizes), seed=args.seed + 1)
+            translate = await _measure(
+                run_translate_workload, client, counter, translate_corpus, concurrency=args.concurrency
+            )
+            results["translate"] = translate.summary()
+    return results
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+def compare(current: dict[str, Any], baseline: dict[str, Any], *, threshold: float) -> list[str]:
+    """Print metric deltas against a baseline run; return the regressions beyond ``threshold`` percent."""
+
+    regressions = []
+    for workload, metrics in current["results"].items():
+        base_metrics = baseline.get("results", {}).get(workload)
+        if not base_metrics:
+            continue
+        print(f"\n[{workload}]")
+        for metric, value in metrics.items():
+            base_value = base_metrics.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(base_value, (int, float)) or not base_value:
+                continue
+            change = (value - base_value) / base_value * 100
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = "  REGRESSION" if worse > threshold and metric in _GATED_METRICS else ""
+            print(f"  {metric:28s} {base_value:>12} -> {value:>12} ({change:+.1f}%){flag}")
+            if flag:
+                regressions.append(f"{workload}.{metric}")
+    return regressions
+
+
+def _parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", choices=["jobs", "translate", "all"], default="all")
+    parser.add_argument("--images", type=int, default=20, help="images per workload")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent jobs / translate requests")
+    parser.add_argument("--batch-size", type=int, default=5, help="images per POST /api/jobs")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated WIDTHxHEIGHT list")
+    parser.add_argument("--latency-median", type=float, default=0.2, help="stub engine median latency (s)")
+    parser.add_argument("--latency-sigma", type=float, default=0.4, help="stub engine lognormal sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub engine injected error rate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=300.0, help="HTTP timeout per request (s)")
+    parser.add_argument("--base-url", help="drive an already running server instead of starting one")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = _parse_args(argv)
+    config = {key: value for key, value in vars(args).items() if key not in {"output", "compare"}}
+
+    if args.base_url:
+        results = asyncio.run(run_benchmark(args, args.base_url, None))
+    else:
+        with tempfile.TemporaryDirectory(prefix="pt-bench-") as workdir:
+            _prepare_environment(args, Path(workdir))
+            counter = _TransactionCounter()
+            with _BackgroundServer() as server:
+                results = asyncio.run(run_benchmark(args, server.base_url, counter))
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": config,
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "peak_rss_mb": None if args.base_url else _peak_rss_mb(),
+        "results": results,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False, default=str))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, threshold=args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold}%: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
+
+
+__all__ = ["WorkloadResult", "build_corpus", "compare", "main", "run_jobs_workload", "run_translate_workload"]
@@ -22,6 +22,22 @@ class Settings(BaseSettings):
     ALI_ACCESS_KEY_ID: str
     ALI_ACCESS_KEY_SECRET: str
     ALI_REGION: str = "cn-hangzhou"
+    # 多区域部署: "cn-hangzhou,ap-southeast-1" 或 "region=endpoint,..."，为空则只用 ALI_REGION
+    ALI_REGIONS: str = ""
+    ALI_MAX_IDLE_CONNS: int = 16
+    ALI_QPS: float = 10.0  # 账号级预算，多区域成员共用；<=0 disables the budget
+    ALI_QPS_BURST: int = 10
+    ALI_COST_PER_CALL: float = 0.0
+
+    # 启用的翻译引擎（逗号分隔，第一个为默认引擎），如 "aliyun" 或 "stub"
+    ENGINES_ENABLED: str = "aliyun"
+
+    # Offline stub engine (load testing without network)
+    STUB_LATENCY_MEDIAN: float = 1.5  # seconds, lognormal median
+    STUB_LATENCY_SIGMA: float = 0.4
+    STUB_ERROR_RATE: float = 0.0
+    STUB_MAX_LAYERS: int = 8
+    STUB_SEED: int = 42
 
     # Translation defaults
     DEFAULT_SOURCE_LANG: str = "en"
@@ -45,22 +61,89 @@ class Settings(BaseSettings):
     # Cache & retry
     CACHE_MAX_SIZE: int = 100
     CACHE_TTL: int = 60 * 60  # 1 hour
+    HISTORY_COUNT_TTL: float = 30.0  # 历史列表 total 的缓存时间，插入/删除时按筛选条件失效
     RETRY_MAX_ATTEMPTS: int = 3
     RETRY_DELAY: float = 1.0
+    RETRY_MAX_DELAY: float = 10.0
+    # 重试预算: 窗口内重试次数不超过请求数 * RATIO（至少允许 MIN_RETRIES 次）
+    RETRY_BUDGET_RATIO: float = 0.2
+    RETRY_BUDGET_MIN_RETRIES: int = 3
+    RETRY_BUDGET_WINDOW: float = 10.0
+
+    # Engine rate limiting (token bucket shared by all workers on the host)
+    # auto: SQLite 数据库时用 DATA_DIR 下的 sqlite 文件（本机共享）；DATABASE_URL 为 PostgreSQL 时
+    # 用 database（存在应用库里，所有主机共享同一份账号 QPS）。显式选 sqlite/memory 时预算只在本机/本进程内共享
+    ENGINE_RATE_LIMIT_BACKEND: Literal["auto", "memory", "sqlite", "database"] = "auto"
+    ENGINE_RATE_LIMIT_FILENAME: str = "engine_budget.db"
+    ENGINE_RATE_LIMIT_MAX_WAIT: float = 30.0
+
+    # Engine circuit breaker
+    ENGINE_BREAKER_WINDOW_SECONDS: float = 30.0
+    ENGINE_BREAKER_MIN_REQUESTS: int = 5
+    ENGINE_BREAKER_ERROR_RATE: float = 0.5
+    ENGINE_BREAKER_OPEN_SECONDS: float = 5.0
+    ENGINE_BREAKER_HALF_OPEN_PROBES: int = 1
+
+    # Engine routing when the caller does not pin an engine
+    ENGINE_ROUTING_POLICY: Literal["priority", "least_latency", "p2c", "cost_capped"] = "least_latency"
+    ENGINE_COST_CAP: Optional[float] = None
+    ENGINE_EWMA_ALPHA: float = 0.2
+
+    # Hedged requests for interactive /api/translate
+    ENGINE_HEDGE_ENABLED: bool = False
+    ENGINE_HEDGE_MAX_EXTRA: int = 1
+    ENGINE_HEDGE_DEFAULT_DELAY: float = 10.0  # used until an engine has enough latency samples
+    ENGINE_HEDGE_MIN_DELAY: float = 1.0
+
+    # Admin endpoints (/api/admin/*), disabled while ADMIN_TOKEN is unset
+    ADMIN_TOKEN: Optional[str] = None
+    PROFILER_MAX_SECONDS: float = 60.0
+
+    # Event-loop lag monitor; LOOP_BLOCKING_DEBUG logs the stack of calls blocking the loop
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.5
+    LOOP_BLOCKING_DEBUG: bool = False
+    LOOP_BLOCKING_THRESHOLD: float = 0.1
+
+    # Tracing (in-process exporter, queried via /api/traces)
+    TRACING_ENABLED: bool = False
+    TRACING_MAX_SPANS: int = 10_000
 
     # Worker / queue limits
     THREAD_POOL_MAX_WORKERS: int = 6
+    QUEUE_WORKERS: int = 1  # 每个进程并发处理的翻译任务数
+    QUEUE_POLL_INTERVAL: float = 0.5  # 没有唤醒通知时的兜底轮询间隔
+    QUEUE_NOTIFY_CHANNEL: str = "translation_queue"  # PostgreSQL LISTEN/NOTIFY 频道
+    WRITE_BEHIND_INTERVAL_MS: float = 5.0  # 状态更新合并窗口，窗口内的写入共用一次提交
+    WRITE_BEHIND_MAX_BATCH: int = 64
 
     # Storage & database
     DATA_DIR: Path = Path("./data")
     STORAGE_DIR: Path = Path("./storage")
     BACKUP_DIR: Path = Path("./backups")
     DATABASE_FILENAME: str = "translations.db"
+    # 留空使用 DATA_DIR 下的 SQLite；设置为 postgresql+psycopg2://... 切换到 PostgreSQL
+    DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # SQLite：单个写连接串行化所有写事务，另开只读连接池服务历史/图层查询
+    SQLITE_READ_POOL_SIZE: int = 4
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_WAL_AUTOCHECKPOINT: int = 2000  # 页数；WAL 达到约 8MB 时回写主库
+    SQLITE_OPTIMIZE_INTERVAL_HOURS: float = 6.0  # 定期 PRAGMA optimize，0 表示关闭
 
     # Cleanup / retention
     CLEANUP_RETENTION_DAYS: int = 90
     CLEANUP_CRON: str = "0 3 * * *"
 
+    # Backups (SQLite 在线备份 + 存储目录硬链接快照)
+    BACKUP_INTERVAL_HOURS: float = 24.0  # 0 表示关闭定时备份
+    BACKUP_RETENTION: int = 7  # 保留最近的快照个数
+    BACKUP_PAGES_PER_STEP: int = 256  # 每步复制的页数，步与步之间写入不受阻塞
+    BACKUP_STEP_SLEEP: float = 0.005  # 每步之后的停顿（秒），限制备份占用的 I/O
+    BACKUP_STORAGE: bool = True  # 同时为 STORAGE_DIR 建立硬链接快照
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -81,7 +164,23 @@ class Settings(BaseSettings):
             return Path(value)
         return value
 
-    @field_validator("BATCH_MAX_IMAGES", "THREAD_POOL_MAX_WORKERS", mode="before")
+    @field_validator("DATABASE_URL", mode="before")
+    @classmethod
+    def _blank_database_url(cls, value):
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+    @field_validator(
+        "BATCH_MAX_IMAGES",
+        "THREAD_POOL_MAX_WORKERS",
+        "QUEUE_WORKERS",
+        "SQLITE_READ_POOL_SIZE",
+        "WRITE_BEHIND_MAX_BATCH",
+        "BACKUP_RETENTION",
+        "BACKUP_PAGES_PER_STEP",
+        mode="before",
+    )
     @classmethod
     def _ensure_positive(cls, value):
         if isinstance(value, str):
@@ -94,13 +193,36 @@ class Settings(BaseSettings):
         for directory in (self.DATA_DIR, self.STORAGE_DIR, self.BACKUP_DIR):
             Path(directory).mkdir(parents=True, exist_ok=True)
 
+    def aliyun_regions(self) -> list[tuple[str, Optional[str]]]:
+        """Parse ALI_REGIONS into (region, endpoint) pairs; endpoint None means the default."""
+
+        regions: list[tuple[str, Optional[str]]] = []
+        for item in self.ALI_REGIONS.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            region, _, endpoint = item.partition("=")
+            regions.append((region.strip(), endpoint.strip() or None))
+        return regions
+
+    def enabled_engines(self) -> list[str]:
+        """Parse ENGINES_ENABLED into engine names, default engine first."""
+
+        return [name.strip() for name in self.ENGINES_ENABLED.split(",") if name.strip()]
+
     @computed_field(return_type=Path)
     def database_path(self) -> Path:
         return Path(self.DATA_DIR) / self.DATABASE_FILENAME
 
     @computed_field(return_type=str)
     def database_url(self) -> str:
-        return f"sqlite:///{self.database_path}"
+        return self.DATABASE_URL or f"sqlite:///{self.database_path}"
+
+    @computed_field(return_type=str)
+    def rate_limit_backend(self) -> str:
+        if self.ENGINE_RATE_LIMIT_BACKEND != "auto":
+            return self.ENGINE_RATE_LIMIT_BACKEND
+        return "database" if self.database_url.startswith("postgresql") else "sqlite"
 
 
 settings = Settings()
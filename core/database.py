@@ -1,41 +1,204 @@
-"""SQLite database engine and session management."""
+"""Database engine and session management (SQLite by default, PostgreSQL via DATABASE_URL)."""
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from contextlib import contextmanager
-from typing import Generator, Iterable, Type
+from typing import Callable, Generator, Iterable, List, Optional, Type, TypeVar
 
-from sqlalchemy import Engine, create_engine, event
+from sqlalchemy import URL, Engine, create_engine, event, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from core.config import settings
+from core.metrics import instrument_sqlalchemy
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 同步 URL 对应的异步驱动；驱动未安装时退化为线程池中的同步会话
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
 
 
 class Base(DeclarativeBase):
     """Declarative base for ORM models."""
 
 
-engine: Engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False, "timeout": 30},
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
-)
+def _engine_options(url: str, *, readonly: bool = False) -> dict:
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite 同一时刻只有一个写者：写引擎只开一个连接，写事务在连接池里排队，
+        # 而不是多个连接各自在 busy_timeout 里抢写锁；只读连接在 WAL 下可与写并发
+        return {
+            "connect_args": {"check_same_thread": False, "timeout": 30},
+            "pool_size": settings.SQLITE_READ_POOL_SIZE if readonly else 1,
+            "max_overflow": 0,
+            "pool_timeout": 30,
+            "pool_pre_ping": True,
+        }
+    # 服务端数据库：连接池按 worker 并发与 API 请求量配置，回收空闲连接以适配 PgBouncer/防火墙超时
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+
+def sqlite_pragmas(*, readonly: bool = False) -> List[str]:
+    """PRAGMA statements run on every new SQLite connection."""
+
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA busy_timeout=30000",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        # 负数表示以 KiB 为单位
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA wal_autocheckpoint={int(settings.SQLITE_WAL_AUTOCHECKPOINT)}",
+    ]
+    if readonly:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _pragma_listener(readonly: bool):
+    statements = sqlite_pragmas(readonly=readonly)
+
+    def _set_sqlite_pragma(dbapi_connection, connection_record):  # pragma: no cover - sqlite specific
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+    return _set_sqlite_pragma
+
+
+def create_app_engine(url: str, *, readonly: bool = False) -> Engine:
+    """Engine for ``url`` with the pool options and pragmas this app expects.
+
+    ``readonly`` builds the SQLite read pool (``query_only`` connections); the
+    default is the single-connection writer.
+    """
+
+    created = create_engine(url, **_engine_options(url, readonly=readonly))
+    if created.dialect.name == "sqlite":
+        event.listen(created, "connect", _pragma_listener(readonly))
+    return created
+
+
+def async_database_url(url: str) -> Optional[URL]:
+    """``url`` rewritten to its async driver, or None when the backend has none."""
+
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        return None
+    return parsed.set(drivername=f"{backend}+{driver}")
+
+
+def create_async_app_engine(url: str, *, readonly: bool = False) -> Optional[AsyncEngine]:
+    """Async engine for ``url`` with the same pool options; None if the driver is not installed."""
+
+    async_url = async_database_url(url)
+    if async_url is None:
+        return None
+    options = _engine_options(url, readonly=readonly)
+    if async_url.get_backend_name() == "sqlite":
+        # aiosqlite 默认每次新建连接（NullPool），显式用队列池复用连接与其上的 PRAGMA
+        options["poolclass"] = AsyncAdaptedQueuePool
+    try:
+        created = create_async_engine(async_url, **options)
+    except ImportError:
+        logger.warning("未安装 %s 驱动，数据库访问退化为线程池中的同步调用", async_url.get_driver_name())
+        return None
+    if created.dialect.name == "sqlite":
+        event.listen(created.sync_engine, "connect", _pragma_listener(readonly))
+    return created
+
+
+engine: Engine = create_app_engine(settings.database_url)
 
 
-@event.listens_for(engine, "connect")
-def _set_sqlite_pragma(dbapi_connection, connection_record):  # pragma: no cover - sqlite specific
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.execute("PRAGMA busy_timeout=30000")
-    cursor.execute("PRAGMA synchronous=NORMAL")
-    cursor.close()
+instrument_sqlalchemy(engine)
 
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
 
 
+async_engine: Optional[AsyncEngine] = create_async_app_engine(settings.database_url)
+
+AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+if async_engine is not None:
+    instrument_sqlalchemy(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+# 只读会话：SQLite 上走独立的 query_only 连接池，其他数据库直接复用主引擎
+read_engine: Engine = engine
+ReadSessionLocal = SessionLocal
+async_read_engine: Optional[AsyncEngine] = async_engine
+AsyncReadSessionLocal: Optional[async_sessionmaker[AsyncSession]] = AsyncSessionLocal
+if engine.dialect.name == "sqlite":
+    read_engine = create_app_engine(settings.database_url, readonly=True)
+    ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    if async_engine is not None:
+        async_read_engine = create_async_app_engine(settings.database_url, readonly=True)
+        AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+async def run_in_session(
+    fn: Callable[[Session], T],
+    *,
+    session_factory: Callable[[], Session] = SessionLocal,
+    async_session_factory: Optional[Callable[[], AsyncSession]] = None,
+) -> T:
+    """Run ``fn(session)`` without blocking the event loop.
+
+    With an async session factory ``fn`` runs through ``AsyncSession.run_sync``:
+    the ORM code stays synchronous but every statement awaits the async
+    driver, so no default-executor thread is held. Without one (async driver
+    missing) it falls back to a sync session in ``asyncio.to_thread``.
+    """
+
+    if async_session_factory is not None:
+        async with async_session_factory() as session:
+            return await session.run_sync(fn)
+
+    def _call() -> T:
+        with session_factory() as session:
+            return fn(session)
+
+    return await asyncio.to_thread(_call)
+
+
+async def optimize_database() -> bool:
+    """Run ``PRAGMA optimize`` on the writer connection; False on non-SQLite backends."""
+
+    if engine.dialect.name != "sqlite":
+        return False
+
+    def _optimize(session: Session) -> None:
+        # 0x10000：连这条连接上没查询过的表也检查一遍，写连接很少执行读查询
+        session.execute(text("PRAGMA optimize=0x10002"))
+        session.commit()
+
+    await run_in_session(_optimize, session_factory=SessionLocal, async_session_factory=AsyncSessionLocal)
+    return True
+
+
+async def dispose_engines() -> None:
+    for async_db in {async_engine, async_read_engine} - {None}:
+        await async_db.dispose()  # type: ignore[union-attr]
+    for sync_db in {engine, read_engine}:
+        sync_db.dispose()
+
+
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
     session: Session = SessionLocal()
@@ -50,9 +213,32 @@ def init_db(models: Iterable[Type[DeclarativeBase]] | None = None) -> None:
 
     if models is None:
         # Lazy import to avoid circular references.
-        from models import job, text_layer, translation  # noqa: F401
+        from models import editor_data, job, text_layer, translation  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
-
-
-__all__ = ["Base", "engine", "SessionLocal", "get_session", "init_db"]
+    # create_all 只在建表时建索引，已有库需要补建后续新增的索引
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+__all__ = [
+    "AsyncReadSessionLocal",
+    "AsyncSessionLocal",
+    "Base",
+    "ReadSessionLocal",
+    "async_database_url",
+    "async_engine",
+    "async_read_engine",
+    "create_app_engine",
+    "create_async_app_engine",
+    "dispose_engines",
+    "engine",
+    "SessionLocal",
+    "get_session",
+    "init_db",
+    "optimize_database",
+    "read_engine",
+    "run_in_session",
+    "sqlite_pragmas",
+]
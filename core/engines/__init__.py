@@ -36,3 +36,4 @@ __all__ = [
 
 # Ensure built-in engines are registered on import
 from . import aliyun  # noqa: F401,E402
+from . import stub  # noqa: F401,E402
@@ -4,13 +4,16 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import contextvars
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from typing import Any, Iterable, Mapping
 
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image, ImageDraw, ImageFont
 from alibabacloud_alimt20181012 import models
 from alibabacloud_alimt20181012.client import Client
@@ -19,7 +22,13 @@ from alibabacloud_tea_util import models as util_models
 
 from core.config import settings
 from core.engines.base import TranslateEngine, TranslateResult
+from core.engines.pool import EnginePool
+from core.engines.rate_limit import build_rate_limiter
 from core.engines.registry import EngineRegistry
+from core.engines.retry import RETRYABLE_ERROR_CODES
+from core.exceptions import AppError, EngineRejectedError, UpstreamTransientError
+from core.metrics import time_stage
+from core.tracing import start_span
 
 
 logger = logging.getLogger(__name__)
@@ -34,6 +43,14 @@ FALLBACK_FONTS = [
 DARK_BLUE = (25, 45, 95)
 # 阿里云图片翻译 API 支持最大 8192px，使用配置文件中的设置
 API_TIMEOUT = 60000
+# 业务错误码中的请求超时 / 系统错误 / 未知错误属于服务端临时故障，其余（图片、语言、参数等）是请求本身的问题
+TRANSIENT_BODY_CODES = frozenset({"10001", "10002", "19999"})
+
+# 阿里云 SDK 是同步阻塞调用，放在独立线程池中执行，避免占满默认执行器
+_SDK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.THREAD_POOL_MAX_WORKERS,
+    thread_name_prefix="aliyun-sdk",
+)
 
 
 def convert_numbers(text: str) -> str:
@@ -97,12 +114,23 @@ class AliyunEngine(TranslateEngine):
         access_key_id: str | None = None,
         access_key_secret: str | None = None,
         region: str | None = None,
+        endpoint: str | None = None,
+        name: str | None = None,
     ) -> None:
+        if name:
+            self.name = name
         super().__init__()
         self.access_key_id = access_key_id or settings.ALI_ACCESS_KEY_ID
         self.access_key_secret = access_key_secret or settings.ALI_ACCESS_KEY_SECRET
         self.region = region or settings.ALI_REGION
+        self.endpoint = endpoint or f"mt.{self.region}.aliyuncs.com"
         self._client: Client | None = None
+        self._http: requests.Session | None = None
+        self.cost_per_call = settings.ALI_COST_PER_CALL
+        # QPS 配额按账号计算，各区域成员共用一个以 "aliyun" 命名的令牌桶，合计速率不会超过 ALI_QPS
+        self.rate_limiter = build_rate_limiter(
+            AliyunEngine.name, qps=settings.ALI_QPS, burst=settings.ALI_QPS_BURST
+        )
 
     async def translate(
         self,
@@ -115,7 +143,12 @@ class AliyunEngine(TranslateEngine):
         mask: bytes | None = None,
         protect_product: bool | None = None,
     ) -> TranslateResult:
-        return await asyncio.to_thread(
+        await self.acquire_budget()
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            _SDK_EXECUTOR,
+            context.run,
             self._translate_sync,
             image,
             source_lang,
@@ -143,11 +176,28 @@ class AliyunEngine(TranslateEngine):
             config = open_api_models.Config(
                 access_key_id=self.access_key_id,
                 access_key_secret=self.access_key_secret,
+                region_id=self.region,
+                max_idle_conns=settings.ALI_MAX_IDLE_CONNS,
             )
-            config.endpoint = "mt.cn-hangzhou.aliyuncs.com"
+            config.endpoint = self.endpoint
             self._client = Client(config)
         return self._client
 
+    @property
+    def http(self) -> requests.Session:
+        """Per-engine HTTP session so result downloads reuse keep-alive connections."""
+
+        if self._http is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=settings.ALI_MAX_IDLE_CONNS,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._http = session
+        return self._http
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -161,12 +211,8 @@ class AliyunEngine(TranslateEngine):
         mask: bytes | None,
         protect_product: bool | None,
     ) -> TranslateResult:
-        pil_image = self._load_image(image_bytes)
-        prepared = self._resize_if_needed(self._ensure_rgb(pil_image))
-
-        buffer = BytesIO()
-        prepared.save(buffer, format="JPEG", quality=90)
-        img_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        with start_span("aliyun.encode_request", {"image.bytes": len(image_bytes)}):
+            img_base64 = self._encode_request_image(image_bytes)
 
         ext = {"needEditorData": "true"}
         # ignoreEntityRecognize 参数说明（仅对 e-commerce 领域有效）：
@@ -197,10 +243,12 @@ class AliyunEngine(TranslateEngine):
             "false" if ext.get("ignoreEntityRecognize") == "true" else "true (默认)",
         )
 
-        response = self.client.translate_image_with_options(request, runtime)
+        with start_span("aliyun.translate_image", {"region": self.region}) as span:
+            response = self.client.translate_image_with_options(request, runtime)
+            span.set_attribute("request_id", response.body.request_id)
         body = response.body
         if str(body.code) != "200" or not body.data:
-            raise RuntimeError(f"翻译失败: {body.message}")
+            raise self._body_error(body)
 
         data = body.data
         layers: list[dict[str, Any]] = []
@@ -256,6 +304,33 @@ class AliyunEngine(TranslateEngine):
             metadata=metadata,
         )
 
+    @staticmethod
+    def _body_error(body: Any) -> AppError:
+        """Map a failed response body to a retryable or a request-level error, keeping ``body.code``."""
+
+        code = str(body.code)
+        details = {"code": code, "requestId": body.request_id}
+        if code == "200":
+            return UpstreamTransientError("翻译失败: 未返回翻译结果", details=details)
+        message = f"翻译失败: {body.message}"
+        if (
+            code in TRANSIENT_BODY_CODES
+            or code.startswith(RETRYABLE_ERROR_CODES)
+            or (code.isdigit() and (int(code) == 429 or 500 <= int(code) < 600))
+        ):
+            return UpstreamTransientError(message, details=details)
+        return EngineRejectedError(message, details=details)
+
+    def _encode_request_image(self, image_bytes: bytes) -> str:
+        """Decode, normalize and re-encode the upload as the base64 JPEG the API expects."""
+
+        pil_image = self._load_image(image_bytes)
+        prepared = self._resize_if_needed(self._ensure_rgb(pil_image))
+
+        buffer = BytesIO()
+        prepared.save(buffer, format="JPEG", quality=90)
+        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
     def _load_image(self, image_bytes: bytes) -> Image.Image:
         image = Image.open(BytesIO(image_bytes))
         image.load()
@@ -286,6 +361,15 @@ class AliyunEngine(TranslateEngine):
 
     def _postprocess(self, template_json: str, in_painting_url: str) -> tuple[Image.Image, list[dict[str, Any]]]:
         background = self._download_image(in_painting_url)
+        return self._render_template(background, template_json)
+
+    def _render_template(self, background: Image.Image, template_json: str) -> tuple[Image.Image, list[dict[str, Any]]]:
+        """Draw the corrected text elements of ``template_json`` onto the inpainted background."""
+
+        with time_stage("postprocess_render"), start_span("aliyun.render_template"):
+            return self._draw_template(background, template_json)
+
+    def _draw_template(self, background: Image.Image, template_json: str) -> tuple[Image.Image, list[dict[str, Any]]]:
         draw = ImageDraw.Draw(background)
         template = json.loads(template_json)
         layers: list[dict[str, Any]] = []
@@ -368,21 +452,40 @@ class AliyunEngine(TranslateEngine):
         return self._to_png_bytes(image)
 
     def _download_image(self, url: str) -> Image.Image:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        image = Image.open(BytesIO(response.content))
-        image.load()
+        with time_stage("result_download"), start_span("aliyun.download_result"):
+            response = self.http.get(url, timeout=30)
+            response.raise_for_status()
+            image = Image.open(BytesIO(response.content))
+            image.load()
         return image
 
     @staticmethod
     def _to_png_bytes(image: Image.Image) -> bytes:
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        return buffer.getvalue()
+        with start_span("png.encode", {"image.width": image.width, "image.height": image.height}):
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+            return buffer.getvalue()
+
+
+def _build_default_engine() -> TranslateEngine:
+    """One engine for a single region, or an EnginePool with one member per configured region."""
+
+    regions = settings.aliyun_regions()
+    if len(regions) <= 1:
+        region, endpoint = regions[0] if regions else (settings.ALI_REGION, None)
+        return AliyunEngine(region=region, endpoint=endpoint)
+
+    members = [
+        AliyunEngine(name=f"{AliyunEngine.name}@{region}", region=region, endpoint=endpoint)
+        for region, endpoint in regions
+    ]
+    logger.info("Aliyun engine pool regions: %s", ", ".join(region for region, _ in regions))
+    return EnginePool(AliyunEngine.name, members, display_name=AliyunEngine.display_name)
 
 
-_default_engine = AliyunEngine()
-EngineRegistry.register(_default_engine, default=True)
+_enabled = settings.enabled_engines()
+if AliyunEngine.name in _enabled:
+    EngineRegistry.register(_build_default_engine(), default=_enabled[0] == AliyunEngine.name)
 
 
 __all__ = ["AliyunEngine"]
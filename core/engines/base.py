@@ -3,10 +3,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Mapping, Optional
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Mapping, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from core.engines.rate_limit import RateLimiter
+
+
+#: 对冲请求发出前已无等待地预占的令牌（值为令牌桶名称）；acquire_budget 会直接消耗它而不再排队
+prepaid_budget: ContextVar[Optional[str]] = ContextVar("prepaid_engine_budget", default=None)
+
 
 class TranslateResult(BaseModel):
     """Normalized payload returned by every translation engine."""
@@ -43,12 +51,16 @@ class TranslateEngine(ABC):
     name: str
     #: 可选的展示名称，默认等于 name
     display_name: str
+    #: 单次调用成本（任意货币单位），供 cost_capped 路由策略使用
+    cost_per_call: float = 0.0
 
     def __init__(self) -> None:
         if not getattr(self, "name", None):  # pragma: no cover - defensive
             raise ValueError("TranslateEngine 子类必须定义 name 属性")
         if not getattr(self, "display_name", None):
             self.display_name = self.name
+        #: 可选的 QPS 预算，子类在调用上游前通过 acquire_budget() 消耗
+        self.rate_limiter: Optional["RateLimiter"] = None
 
     @abstractmethod
     async def translate(
@@ -68,10 +80,28 @@ class TranslateEngine(ABC):
     async def health_check(self) -> bool:
         """Return True when the engine is ready to accept traffic."""
 
+    async def acquire_budget(self) -> None:
+        """Wait for a slot in the engine's QPS budget (noop when unlimited)."""
+
+        limiter = self.rate_limiter
+        if limiter is None:
+            return
+        if prepaid_budget.get() == limiter.name:
+            prepaid_budget.set(None)
+            return
+        await limiter.acquire()
+
+    async def try_acquire_budget(self) -> bool:
+        """Take a QPS token only if one is free right now (always True when unlimited)."""
+
+        if self.rate_limiter is None:
+            return True
+        return await self.rate_limiter.try_acquire()
+
     async def warm_up(self) -> None:
         """Optional hook for eager initialization (default: noop)."""
 
         return None
 
 
-__all__ = ["TranslateEngine", "TranslateResult"]
+__all__ = ["TranslateEngine", "TranslateResult", "prepaid_budget"]
@@ -0,0 +1,168 @@
+"""Per-engine circuit breaker with a rolling error-rate window."""
+
+from __future__ import annotations
+
+import enum
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed → open when the windowed error rate trips, half-open after a cooldown.
+
+    While half-open only ``half_open_probes`` concurrent requests are let
+    through; one success closes the circuit, one failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_seconds: float | None = None,
+        min_requests: int | None = None,
+        error_rate_threshold: float | None = None,
+        open_seconds: float | None = None,
+        half_open_probes: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.window_seconds = window_seconds or settings.ENGINE_BREAKER_WINDOW_SECONDS
+        self.min_requests = min_requests or settings.ENGINE_BREAKER_MIN_REQUESTS
+        self.error_rate_threshold = error_rate_threshold or settings.ENGINE_BREAKER_ERROR_RATE
+        self.open_seconds = open_seconds or settings.ENGINE_BREAKER_OPEN_SECONDS
+        self.half_open_probes = half_open_probes or settings.ENGINE_BREAKER_HALF_OPEN_PROBES
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._counters = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0,
+            "half_opened": 0,
+            "closed": 0,
+        }
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        """Return True when a call may be attempted (reserving a probe slot if half-open)."""
+
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._counters["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._counters["successes"] += 1
+            if self._current_state() == CircuitState.HALF_OPEN:
+                self._transition(CircuitState.CLOSED)
+                return
+            self._record(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._counters["failures"] += 1
+            state = self._current_state()
+            if state == CircuitState.HALF_OPEN:
+                self._transition(CircuitState.OPEN)
+                return
+            self._record(False)
+            if state == CircuitState.CLOSED and self._should_trip():
+                self._transition(CircuitState.OPEN)
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot whose call ended without a verdict."""
+
+        with self._lock:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    def force_close(self) -> None:
+        with self._lock:
+            self._transition(CircuitState.CLOSED)
+
+    def force_open(self) -> None:
+        with self._lock:
+            self._transition(CircuitState.OPEN)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            state = self._current_state()
+            self._prune()
+            total = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": state.value,
+                "window_requests": total,
+                "window_error_rate": failures / total if total else 0.0,
+                **self._counters,
+            }
+
+    # ------------------------------------------------------------------
+    # Internal helpers (caller holds the lock)
+    # ------------------------------------------------------------------
+    def _current_state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self._state:
+            return
+        previous = self._state
+        self._state = state
+        self._probes_in_flight = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = self._clock()
+            self._counters["opened"] += 1
+        elif state == CircuitState.HALF_OPEN:
+            self._counters["half_opened"] += 1
+        else:
+            self._outcomes.clear()
+            self._counters["closed"] += 1
+        logger.warning("Engine %s circuit %s -> %s", self.name, previous.value, state.value)
+
+    def _record(self, ok: bool) -> None:
+        self._outcomes.append((self._clock(), ok))
+        self._prune()
+
+    def _prune(self) -> None:
+        horizon = self._clock() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+
+    def _should_trip(self) -> bool:
+        total = len(self._outcomes)
+        if total < self.min_requests:
+            return False
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / total >= self.error_rate_threshold
+
+
+__all__ = ["CircuitBreaker", "CircuitState"]
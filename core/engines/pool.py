@@ -0,0 +1,125 @@
+"""Composite engine that spreads calls across interchangeable members (e.g. regions)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Sequence
+
+from core.engines.base import TranslateEngine, TranslateResult
+from core.engines.circuit_breaker import CircuitBreaker, CircuitState
+from core.engines.retry import is_retryable
+from core.engines.stats import EngineStats
+from core.exceptions import EngineUnavailableError, RateLimitError
+
+
+logger = logging.getLogger(__name__)
+
+
+class EnginePool(TranslateEngine):
+    """Register once in EngineRegistry, fan out to members with per-member circuit breakers.
+
+    Members are ordered by expected latency weighted by in-flight calls, so
+    load spreads across healthy members and shifts away from a slow or failing
+    one. A transient failure fails over to the next member immediately; an
+    error about the request itself is raised without trying other members.
+    """
+
+    def __init__(self, name: str, members: Sequence[TranslateEngine], *, display_name: str | None = None) -> None:
+        if not members:
+            raise ValueError("EnginePool requires at least one member")
+        self.name = name
+        self.display_name = display_name or name
+        super().__init__()
+        self.members = list(members)
+        self.cost_per_call = min(member.cost_per_call for member in self.members)
+        self._breakers = {member.name: CircuitBreaker(member.name) for member in self.members}
+        self._stats = {member.name: EngineStats(member.name) for member in self.members}
+        self._in_flight = {member.name: 0 for member in self.members}
+        shared = {member.rate_limiter.name if member.rate_limiter else None for member in self.members}
+        if len(shared) == 1 and None not in shared:
+            # 成员共用同一个账号级预算时对外暴露它，对冲前可以无等待地预占令牌
+            self.rate_limiter = self.members[0].rate_limiter
+
+    async def translate(self, **translate_kwargs) -> TranslateResult:  # type: ignore[override]
+        last_error: Exception | None = None
+        exhausted: set[str] = set()
+        for member in self._ordered_members():
+            limiter = member.rate_limiter
+            if limiter is not None and limiter.name in exhausted:
+                continue  # 与已经限流的成员共用同一个预算，换过去也拿不到令牌
+            breaker = self._breakers[member.name]
+            if not breaker.allow_request():
+                continue
+            self._in_flight[member.name] += 1
+            started = time.perf_counter()
+            try:
+                result = await member.translate(**translate_kwargs)
+            except RateLimitError as exc:
+                # 该成员的 QPS 预算已满，换下一个区域
+                breaker.release_probe()
+                if limiter is not None:
+                    exhausted.add(limiter.name)
+                last_error = exc
+                continue
+            except Exception as exc:
+                if not is_retryable(exc):
+                    # 区域正确地拒绝了请求本身：不算故障，换区域也只会得到同样的结果
+                    breaker.release_probe()
+                    raise
+                self._stats[member.name].record(time.perf_counter() - started, ok=False)
+                breaker.record_failure()
+                logger.warning("Pool %s member %s failed, failing over: %s", self.name, member.name, exc)
+                last_error = exc
+                continue
+            except BaseException:
+                breaker.release_probe()
+                raise
+            finally:
+                self._in_flight[member.name] -= 1
+            self._stats[member.name].record(time.perf_counter() - started)
+            breaker.record_success()
+            return result
+
+        raise EngineUnavailableError(
+            f"{self.display_name} 所有区域暂不可用",
+            details={"lastError": str(last_error) if last_error else None},
+        ) from last_error
+
+    async def health_check(self) -> bool:
+        results = await asyncio.gather(*(member.health_check() for member in self.members), return_exceptions=True)
+        healthy = False
+        for member, result in zip(self.members, results):
+            if result is True:
+                self._breakers[member.name].force_close()
+                healthy = True
+            else:
+                self._breakers[member.name].force_open()
+        return healthy
+
+    async def warm_up(self) -> None:
+        await asyncio.gather(*(member.warm_up() for member in self.members))
+
+    def describe_members(self) -> list[dict[str, object]]:
+        return [
+            {
+                "name": member.name,
+                "in_flight": self._in_flight[member.name],
+                "circuit": self._breakers[member.name].snapshot(),
+                "latency": self._stats[member.name].snapshot(),
+            }
+            for member in self.members
+        ]
+
+    def _ordered_members(self) -> list[TranslateEngine]:
+        def load(member: TranslateEngine) -> tuple[float, int]:
+            in_flight = self._in_flight[member.name]
+            return self._stats[member.name].score() * (1 + in_flight), in_flight
+
+        available = [m for m in self.members if self._breakers[m.name].state != CircuitState.OPEN]
+        tripped = [m for m in self.members if m not in available]
+        return sorted(available, key=load) + tripped
+
+
+__all__ = ["EnginePool"]
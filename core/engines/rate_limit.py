@@ -0,0 +1,220 @@
+"""Token-bucket QPS budgets for translation engines.
+
+The ``sqlite`` backend keeps bucket state in a small file under ``DATA_DIR`` so
+that every uvicorn worker on the host draws from the same budget. The
+``database`` backend keeps it in the application database instead, so hosts
+sharing a PostgreSQL ``DATABASE_URL`` also share the account's QPS budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from sqlalchemy import Column, Engine, Float, MetaData, String, Table, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from core.config import settings
+from core.exceptions import RateLimitError
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(ABC):
+    """Reserve-then-wait rate limiter shared by engine calls."""
+
+    def __init__(self, name: str, *, qps: float, burst: int, max_wait: float) -> None:
+        if qps <= 0:
+            raise ValueError("qps must be positive")
+        self.name = name
+        self.qps = float(qps)
+        self.burst = max(int(burst), 1)
+        self.max_wait = max_wait
+
+    @abstractmethod
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """Reserve one token; return the delay before it may be used, or None if over max_wait."""
+
+    async def acquire(self) -> None:
+        delay = await asyncio.to_thread(self.reserve)
+        if delay is None:
+            logger.warning("Engine %s QPS budget exhausted (%.1f qps)", self.name, self.qps)
+            raise RateLimitError(
+                "翻译请求过于频繁，请稍后重试",
+                details={"engine": self.name, "qps": self.qps},
+            )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def try_acquire(self) -> bool:
+        """Take one token only if it is available right now; never waits."""
+
+        return await asyncio.to_thread(self.reserve, 0.0) is not None
+
+    def _take(
+        self, tokens: float, updated_at: float, now: float, max_wait: float | None = None
+    ) -> tuple[float, float | None]:
+        """Apply one reservation to a bucket state; return (new_tokens, delay)."""
+
+        tokens = min(float(self.burst), tokens + max(now - updated_at, 0.0) * self.qps)
+        if tokens >= 1.0:
+            return tokens - 1.0, 0.0
+        delay = (1.0 - tokens) / self.qps
+        if delay > (self.max_wait if max_wait is None else max_wait):
+            return tokens, None
+        return tokens - 1.0, delay
+
+
+class TokenBucket(RateLimiter):
+    """In-process token bucket."""
+
+    def __init__(self, name: str, *, qps: float, burst: int, max_wait: float) -> None:
+        super().__init__(name, qps=qps, burst=burst, max_wait=max_wait)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, delay = self._take(self._tokens, self._updated_at, now, max_wait)
+            self._updated_at = now
+            return delay
+
+
+class SQLiteTokenBucket(RateLimiter):
+    """Token bucket persisted in a SQLite file shared by every process on the host."""
+
+    def __init__(self, name: str, *, qps: float, burst: int, max_wait: float, path: Path) -> None:
+        super().__init__(name, qps=qps, burst=burst, max_wait=max_wait)
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens, updated_at = row if row else (float(self.burst), now)
+            tokens, delay = self._take(tokens, updated_at, now, max_wait)
+            conn.execute(
+                "INSERT INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return delay
+
+
+_bucket_metadata = MetaData()
+token_buckets = Table(
+    "engine_token_buckets",
+    _bucket_metadata,
+    Column("name", String(64), primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("updated_at", Float, nullable=False),
+)
+
+
+class DatabaseTokenBucket(RateLimiter):
+    """Token bucket stored in the application database, shared by every host using it.
+
+    Each reservation locks the bucket row with ``SELECT ... FOR UPDATE`` for
+    one short transaction.
+    """
+
+    def __init__(self, name: str, *, qps: float, burst: int, max_wait: float, engine: Engine) -> None:
+        super().__init__(name, qps=qps, burst=burst, max_wait=max_wait)
+        self._engine = engine
+        self._ready = False
+
+    def _ensure_row(self) -> None:
+        if self._ready:
+            return
+        token_buckets.create(self._engine, checkfirst=True)
+        dialect = postgresql if self._engine.dialect.name == "postgresql" else sqlite
+        statement = (
+            dialect.insert(token_buckets)
+            .values(name=self.name, tokens=float(self.burst), updated_at=time.time())
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        with self._engine.begin() as connection:
+            connection.execute(statement)
+        self._ready = True
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        self._ensure_row()
+        with self._engine.begin() as connection:
+            tokens, updated_at = connection.execute(
+                select(token_buckets.c.tokens, token_buckets.c.updated_at)
+                .where(token_buckets.c.name == self.name)
+                .with_for_update()
+            ).one()
+            # 各主机的时钟可能有偏差，_take 会把倒退的时间差按 0 处理
+            now = time.time()
+            tokens, delay = self._take(tokens, updated_at, now, max_wait)
+            connection.execute(
+                token_buckets.update()
+                .where(token_buckets.c.name == self.name)
+                .values(tokens=tokens, updated_at=max(now, updated_at))
+            )
+        return delay
+
+
+_memory_buckets: dict[str, TokenBucket] = {}
+_memory_lock = threading.Lock()
+
+
+def build_rate_limiter(name: str, *, qps: float, burst: int) -> RateLimiter | None:
+    """Create the configured limiter for an engine, or None when QPS is unlimited."""
+
+    if qps <= 0:
+        return None
+
+    max_wait = settings.ENGINE_RATE_LIMIT_MAX_WAIT
+    backend = settings.rate_limit_backend
+    if backend == "database":
+        from core.database import engine
+
+        return DatabaseTokenBucket(name, qps=qps, burst=burst, max_wait=max_wait, engine=engine)
+    if backend == "sqlite":
+        if settings.database_url.startswith("postgresql"):
+            logger.warning("ENGINE_RATE_LIMIT_BACKEND=sqlite 只在本机共享 QPS 预算，多主机部署会超出账号配额")
+        path = Path(settings.DATA_DIR) / settings.ENGINE_RATE_LIMIT_FILENAME
+        return SQLiteTokenBucket(name, qps=qps, burst=burst, max_wait=max_wait, path=path)
+
+    # Engines with the same name share a bucket even when instantiated twice.
+    with _memory_lock:
+        bucket = _memory_buckets.get(name)
+        if bucket is None or bucket.qps != qps or bucket.burst != max(int(burst), 1):
+            bucket = TokenBucket(name, qps=qps, burst=burst, max_wait=max_wait)
+            _memory_buckets[name] = bucket
+        return bucket
+
+
+__all__ = ["RateLimiter", "TokenBucket", "SQLiteTokenBucket", "DatabaseTokenBucket", "build_rate_limiter"]
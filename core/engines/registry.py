@@ -4,11 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections import defaultdict
-from typing import Iterable, Sequence
+import time
+from typing import Sequence
 
-from core.engines.base import TranslateEngine, TranslateResult
+from core.config import settings
+from core.engines.base import TranslateEngine, TranslateResult, prepaid_budget
+from core.engines.circuit_breaker import CircuitBreaker, CircuitState
+from core.engines.retry import is_engine_fault, is_retryable
+from core.engines.routing import RoutingPolicy, order_engines
+from core.engines.stats import EngineStats
 from core.exceptions import EngineUnavailableError
+from core.metrics import ENGINE_CALLS, ENGINE_IN_FLIGHT, observe_stage
+from core.tracing import start_span
 
 
 logger = logging.getLogger(__name__)
@@ -17,12 +24,9 @@ logger = logging.getLogger(__name__)
 class EngineRegistry:
     """Simple in-memory registry that keeps track of healthy engines."""
 
-    FAILURE_THRESHOLD = 3
-
     _engines: dict[str, TranslateEngine] = {}
-    _failure_counters: dict[str, int] = defaultdict(int)
-    _health_state: dict[str, bool] = {}
-    _lock: asyncio.Lock = asyncio.Lock()
+    _breakers: dict[str, CircuitBreaker] = {}
+    _stats: dict[str, EngineStats] = {}
     _default_engine: str | None = None
 
     @classmethod
@@ -30,8 +34,8 @@ class EngineRegistry:
         if engine.name in cls._engines:
             logger.warning("Engine %s 已存在，将被覆盖", engine.name)
         cls._engines[engine.name] = engine
-        cls._failure_counters[engine.name] = 0
-        cls._health_state[engine.name] = True
+        cls._breakers[engine.name] = CircuitBreaker(engine.name)
+        cls._stats[engine.name] = EngineStats(engine.name)
         if default or cls._default_engine is None:
             cls._default_engine = engine.name
         logger.info("Registered translation engine: %s", engine.name)
@@ -50,11 +54,20 @@ class EngineRegistry:
 
     @classmethod
     def list_available(cls) -> list[str]:
-        return [name for name, healthy in cls._health_state.items() if healthy]
+        return [name for name in cls._engines if cls.is_available(name)]
 
     @classmethod
     def is_available(cls, name: str) -> bool:
-        return cls._health_state.get(name, True)
+        breaker = cls._breakers.get(name)
+        return breaker is None or breaker.state != CircuitState.OPEN
+
+    @classmethod
+    def breaker_stats(cls) -> dict[str, dict[str, object]]:
+        return {name: breaker.snapshot() for name, breaker in cls._breakers.items()}
+
+    @classmethod
+    def latency_stats(cls) -> dict[str, dict[str, object]]:
+        return {name: stats.snapshot() for name, stats in cls._stats.items()}
 
     @classmethod
     def get_default(cls) -> str:
@@ -73,6 +86,7 @@ class EngineRegistry:
                     "name": name,
                     "display_name": getattr(engine, "display_name", name),
                     "available": cls.is_available(name),
+                    "state": cls._breakers[name].state.value,
                 }
             )
         return descriptions
@@ -83,64 +97,174 @@ class EngineRegistry:
         *,
         preferred: str | None = None,
         candidates: Sequence[str] | None = None,
+        hedge: bool = False,
         **translate_kwargs,
     ) -> TranslateResult:
-        """Attempt translation with fallback between healthy engines."""
+        """Attempt translation with fallback between healthy engines.
 
-        engine_order = cls._build_priority_queue(preferred, candidates)
-        last_error: Exception | None = None
+        With ``hedge=True`` a duplicate request is sent to the next engine once
+        the current one has been silent for longer than its observed p95; the
+        first success wins and the slower call is cancelled. A hedge is only
+        sent when the engine's QPS budget has a token free right now.
+        Cancelling stops the wait, not the SDK call running in its executor
+        thread: the losing request still completes upstream and is billed, and
+        is counted as ``outcome="cancelled_billed"`` in ``ENGINE_CALLS``.
+        """
+
+        engine_order = [name for name in cls._build_priority_queue(preferred, candidates) if name in cls._engines]
+        if hedge:
+            return await cls._translate_hedged(engine_order, translate_kwargs)
 
+        last_error: Exception | None = None
         for engine_name in engine_order:
-            engine = cls._engines.get(engine_name)
-            if engine is None:
-                continue
-            if not cls._health_state.get(engine_name, True):
-                logger.warning("Skip engine %s (unhealthy)", engine_name)
+            breaker = cls._breakers[engine_name]
+            if not breaker.allow_request():
+                logger.warning("Skip engine %s (circuit %s)", engine_name, breaker.state.value)
                 continue
             try:
-                result = await engine.translate(**translate_kwargs)
-                await cls._mark_success(engine_name)
-                return result
-            except Exception as exc:  # pragma: no cover - depends on SDK
-                await cls._mark_failure(engine_name, exc)
+                return await cls._call_engine(engine_name, translate_kwargs)
+            except Exception as exc:
+                if not cls._should_fail_over(exc):
+                    raise
                 last_error = exc
                 continue
 
-        raise EngineUnavailableError(
+        raise cls._unavailable(last_error) from last_error
+
+    @classmethod
+    async def _translate_hedged(cls, engine_order: list[str], translate_kwargs: dict) -> TranslateResult:
+        queue = list(engine_order)
+        running: dict[asyncio.Task, str] = {}
+        hedges_left = settings.ENGINE_HEDGE_MAX_EXTRA
+        last_error: Exception | None = None
+
+        async def launch_next(*, hedge: bool = False) -> str | None:
+            while queue:
+                engine_name = queue[0]
+                breaker = cls._breakers[engine_name]
+                if not breaker.allow_request():
+                    queue.pop(0)
+                    logger.warning("Skip engine %s (circuit open)", engine_name)
+                    continue
+                engine = cls._engines[engine_name]
+                if hedge and not await engine.try_acquire_budget():
+                    # 对冲请求不排队等令牌：拿不到就不对冲，该引擎仍留作失败后的回退
+                    breaker.release_probe()
+                    return None
+                queue.pop(0)
+                prepaid = prepaid_budget.set(engine.rate_limiter.name if hedge and engine.rate_limiter else None)
+                try:
+                    task = asyncio.create_task(cls._call_engine(engine_name, translate_kwargs))
+                finally:
+                    prepaid_budget.reset(prepaid)
+                running[task] = engine_name
+                return engine_name
+            return None
+
+        latest = await launch_next()
+        try:
+            while running:
+                delay = cls._hedge_delay(latest) if queue and hedges_left > 0 and latest else None
+                done, _ = await asyncio.wait(running, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedges_left -= 1
+                    hedged = await launch_next(hedge=True)
+                    if hedged:
+                        logger.info("Hedging request: %s slower than %.2fs, also trying %s", latest, delay, hedged)
+                        latest = hedged
+                    continue
+                for task in done:
+                    running.pop(task)
+                    exc = task.exception()
+                    if exc is None:
+                        return task.result()
+                    if not cls._should_fail_over(exc):  # type: ignore[arg-type]
+                        raise exc
+                    last_error = exc  # type: ignore[assignment]
+                if not running:
+                    latest = await launch_next()
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise cls._unavailable(last_error) from last_error
+
+    @classmethod
+    def _hedge_delay(cls, engine_name: str) -> float:
+        p95 = cls._stats[engine_name].percentile(95)
+        if p95 is None:
+            return settings.ENGINE_HEDGE_DEFAULT_DELAY
+        return max(p95, settings.ENGINE_HEDGE_MIN_DELAY)
+
+    @classmethod
+    async def _call_engine(cls, engine_name: str, translate_kwargs: dict) -> TranslateResult:
+        with start_span("engine.call", {"engine": engine_name}):
+            return await cls._invoke_engine(engine_name, translate_kwargs)
+
+    @classmethod
+    async def _invoke_engine(cls, engine_name: str, translate_kwargs: dict) -> TranslateResult:
+        engine = cls._engines[engine_name]
+        started = time.perf_counter()
+        ENGINE_IN_FLIGHT.inc(engine=engine_name)
+        try:
+            result = await engine.translate(**translate_kwargs)
+        except Exception as exc:
+            if cls._is_engine_fault(exc):
+                cls._stats[engine_name].record(time.perf_counter() - started, ok=False)
+            ENGINE_CALLS.inc(engine=engine_name, outcome="error")
+            cls._mark_failure(engine_name, exc)
+            raise
+        except BaseException:
+            # Cancelled (e.g. lost a hedge race): neither success nor failure for the breaker, but the
+            # SDK call keeps running in its executor thread and is billed, so count it as such.
+            ENGINE_CALLS.inc(engine=engine_name, outcome="cancelled_billed")
+            cls._breakers[engine_name].release_probe()
+            raise
+        finally:
+            ENGINE_IN_FLIGHT.dec(engine=engine_name)
+            observe_stage("engine_call", time.perf_counter() - started)
+        ENGINE_CALLS.inc(engine=engine_name, outcome="ok")
+        cls._stats[engine_name].record(time.perf_counter() - started)
+        cls._mark_success(engine_name)
+        return result
+
+    @staticmethod
+    def _unavailable(last_error: Exception | None) -> EngineUnavailableError:
+        return EngineUnavailableError(
             "所有翻译引擎暂不可用，请稍后重试",
             details={"lastError": str(last_error) if last_error else None},
         )
 
     @classmethod
-    async def _mark_success(cls, engine_name: str) -> None:
-        async with cls._lock:
-            cls._failure_counters[engine_name] = 0
-            cls._health_state[engine_name] = True
+    def _mark_success(cls, engine_name: str) -> None:
+        cls._breakers[engine_name].record_success()
+
+    @staticmethod
+    def _should_fail_over(exc: BaseException) -> bool:
+        # 坏图、参数错误在其他引擎上同样会失败，只有可重试的故障（或组合引擎整体不可用）才切换
+        return isinstance(exc, EngineUnavailableError) or is_retryable(exc)
+
+    @staticmethod
+    def _is_engine_fault(exc: Exception) -> bool:
+        # 坏图、语言不支持或本地限流不代表引擎故障，不能因为单个用户的输入打开熔断
+        return is_engine_fault(exc)
 
     @classmethod
-    async def _mark_failure(cls, engine_name: str, exc: Exception) -> None:
-        async with cls._lock:
-            cls._failure_counters[engine_name] += 1
-            failure_count = cls._failure_counters[engine_name]
-            logger.error(
-                "Engine %s failed (%s/%s): %s",
-                engine_name,
-                failure_count,
-                cls.FAILURE_THRESHOLD,
-                exc,
-            )
-            if failure_count >= cls.FAILURE_THRESHOLD:
-                cls._health_state[engine_name] = False
-                logger.error("Engine %s marked unhealthy due to repeated failures", engine_name)
+    def _mark_failure(cls, engine_name: str, exc: Exception) -> None:
+        breaker = cls._breakers[engine_name]
+        if not cls._is_engine_fault(exc):
+            breaker.release_probe()
+            logger.warning("Engine %s rejected request: %s", engine_name, exc)
+            return
+        breaker.record_failure()
+        logger.error("Engine %s failed (circuit %s): %s", engine_name, breaker.state.value, exc)
 
     @classmethod
     async def revive(cls, engine_name: str) -> None:
-        """Manually mark an engine healthy (e.g., after passing health check)."""
+        """Manually close an engine's circuit (e.g., after passing health check)."""
 
-        async with cls._lock:
-            if engine_name in cls._engines:
-                cls._failure_counters[engine_name] = 0
-                cls._health_state[engine_name] = True
+        if engine_name in cls._breakers:
+            cls._breakers[engine_name].force_close()
 
     @classmethod
     async def probe_health(cls) -> dict[str, bool]:
@@ -154,10 +278,10 @@ class EngineRegistry:
                 logger.exception("Health check failed for %s: %s", name, exc)
                 healthy = False
             results[name] = healthy
-            async with cls._lock:
-                cls._health_state[name] = healthy
-                if healthy:
-                    cls._failure_counters[name] = 0
+            if healthy:
+                cls._breakers[name].force_close()
+            else:
+                cls._breakers[name].force_open()
         return results
 
     @classmethod
@@ -169,11 +293,22 @@ class EngineRegistry:
         else:
             ordered = list(cls._engines.keys())
 
-        if preferred and preferred in cls._engines:
-            ordered = [preferred] + [name for name in ordered if name != preferred]
-        elif cls._default_engine and cls._default_engine in cls._engines:
+        if cls._default_engine and cls._default_engine in ordered:
             ordered = [cls._default_engine] + [name for name in ordered if name != cls._default_engine]
-        return ordered
+
+        if preferred and preferred in cls._engines:
+            return [preferred] + cls._route([name for name in ordered if name != preferred])
+        return cls._route(ordered)
+
+    @classmethod
+    def _route(cls, ordered: list[str]) -> list[str]:
+        return order_engines(
+            ordered,
+            cls._stats,
+            {name: engine.cost_per_call for name, engine in cls._engines.items()},
+            RoutingPolicy(settings.ENGINE_ROUTING_POLICY),
+            cost_cap=settings.ENGINE_COST_CAP,
+        )
 
 
 __all__ = ["EngineRegistry"]
@@ -1,55 +1,213 @@
-"""Async retry utilities dedicated to translation engines."""
+"""Unified retry policy for translation calls.
+
+One ``RetryPolicy`` decides *whether* to retry (error classification), *how
+long* to wait (exponential backoff with full jitter, awaited on the event
+loop) and *whether the process can afford it* (a shared retry budget that caps
+retries at a fraction of recent requests).
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
 import random
+import threading
+import time
+from collections import deque
 from functools import wraps
 from typing import Any, Awaitable, Callable, TypeVar
 
+import requests
+
+from core.config import settings
+from core.exceptions import AppError, EngineUnavailableError, RateLimitError, UpstreamTransientError
+
 
 logger = logging.getLogger(__name__)
 
 F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+T = TypeVar("T")
+
+# 阿里云 / Tea SDK 中表示限流或服务端临时故障的错误码前缀
+RETRYABLE_ERROR_CODES = ("Throttling", "ServiceUnavailable", "InternalError", "Timeout")
+TRANSIENT_EXCEPTIONS: tuple[type[BaseException], ...] = (
+    TimeoutError,
+    asyncio.TimeoutError,
+    ConnectionError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True only for throttling, 5xx and timeout/network failures."""
+
+    if isinstance(exc, EngineUnavailableError):
+        # 所有引擎都失败时按最后一个底层错误判断；熔断全开则不重试
+        return exc.__cause__ is not None and is_retryable(exc.__cause__)
+    if isinstance(exc, (RateLimitError, UpstreamTransientError)):
+        return True
+    if isinstance(exc, AppError):
+        return False
+    if isinstance(exc, TRANSIENT_EXCEPTIONS):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+
+    status = getattr(exc, "statusCode", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    code = getattr(exc, "code", None)
+    if isinstance(code, str) and code.startswith(RETRYABLE_ERROR_CODES):
+        return True
+    inner = getattr(exc, "inner_exception", None)
+    if isinstance(inner, BaseException) and inner is not exc:
+        return is_retryable(inner)
+    return False
+
+
+def is_engine_fault(exc: BaseException) -> bool:
+    """Return True when ``exc`` says the engine itself is unhealthy.
+
+    Feeds circuit breakers and error-rate stats: transient upstream failures
+    count, request-level rejections and an exhausted local QPS budget do not.
+    """
+
+    return not isinstance(exc, RateLimitError) and is_retryable(exc)
+
+
+class RetryBudget:
+    """Allow retries up to ``ratio`` of the requests seen in a sliding window."""
+
+    def __init__(self, *, ratio: float, min_retries: int, window_seconds: float) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests.append(time.monotonic())
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            allowed = max(self.min_retries, int(len(self._requests) * self.ratio))
+            if len(self._retries) >= allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            self._prune(time.monotonic())
+            return {"requests": len(self._requests), "retries": len(self._retries)}
+
+    def _prune(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        for bucket in (self._requests, self._retries):
+            while bucket and bucket[0] < horizon:
+                bucket.popleft()
+
+
+retry_budget = RetryBudget(
+    ratio=settings.RETRY_BUDGET_RATIO,
+    min_retries=settings.RETRY_BUDGET_MIN_RETRIES,
+    window_seconds=settings.RETRY_BUDGET_WINDOW,
+)
+
+
+class RetryPolicy:
+    """Classify, back off and spend from the shared retry budget."""
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int | None = None,
+        base_delay: float | None = None,
+        max_delay: float | None = None,
+        budget: RetryBudget | None = None,
+        classifier: Callable[[BaseException], bool] = is_retryable,
+    ) -> None:
+        self.max_attempts = max_attempts or settings.RETRY_MAX_ATTEMPTS
+        self.base_delay = settings.RETRY_DELAY if base_delay is None else base_delay
+        self.max_delay = max_delay or settings.RETRY_MAX_DELAY
+        self.budget = budget or retry_budget
+        self.classifier = classifier
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def should_retry(self, exc: BaseException, attempt: int) -> bool:
+        if attempt >= self.max_attempts or not self.classifier(exc):
+            return False
+        if not self.budget.try_withdraw():
+            logger.warning("Retry budget exhausted, giving up after attempt %s: %s", attempt, exc)
+            return False
+        return True
+
+    async def run(self, func: Callable[[], Awaitable[T]]) -> T:
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func()
+            except Exception as exc:
+                if not self.should_retry(exc, attempt):
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning("Attempt %s/%s failed, retrying in %.2fs: %s", attempt, self.max_attempts, delay, exc)
+                await asyncio.sleep(delay)
+
+    def run_sync(self, func: Callable[[], T]) -> T:
+        """Blocking variant for legacy synchronous callers."""
+
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func()
+            except Exception as exc:
+                if not self.should_retry(exc, attempt):
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning("Attempt %s/%s failed, retrying in %.2fs: %s", attempt, self.max_attempts, delay, exc)
+                time.sleep(delay)
 
 
 def async_retry(
     *,
     max_attempts: int = 3,
     base_delay: float = 0.5,
-    jitter: float = 0.3,
-    exceptions: tuple[type[BaseException], ...] = (Exception,),
-    log: logging.Logger | None = None,
+    classifier: Callable[[BaseException], bool] = is_retryable,
 ) -> Callable[[F], F]:
-    """Retry decorator with exponential backoff for async callables."""
+    """Decorator form of :class:`RetryPolicy` for async callables."""
 
-    active_logger = log or logger
+    policy = RetryPolicy(max_attempts=max_attempts, base_delay=base_delay, classifier=classifier)
 
     def decorator(func: F) -> F:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any):  # type: ignore[misc]
-            last_error: BaseException | None = None
-            for attempt in range(1, max_attempts + 1):
-                try:
-                    return await func(*args, **kwargs)
-                except exceptions as exc:  # type: ignore[misc]
-                    last_error = exc
-                    active_logger.warning(
-                        "Engine call failed (%s/%s): %s", attempt, max_attempts, exc
-                    )
-                    if attempt >= max_attempts:
-                        raise
-                    delay = base_delay * (2 ** (attempt - 1))
-                    if jitter > 0:
-                        delay += random.uniform(0, jitter)
-                    await asyncio.sleep(delay)
-            assert last_error is not None
-            raise last_error
+            return await policy.run(lambda: func(*args, **kwargs))
 
         return wrapper  # type: ignore[return-value]
 
     return decorator
 
 
-__all__ = ["async_retry"]
+__all__ = [
+    "RETRYABLE_ERROR_CODES",
+    "RetryBudget",
+    "RetryPolicy",
+    "async_retry",
+    "is_engine_fault",
+    "is_retryable",
+    "retry_budget",
+]
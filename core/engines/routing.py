@@ -0,0 +1,59 @@
+"""Engine routing policies used when the caller does not pin an engine."""
+
+from __future__ import annotations
+
+import enum
+import random
+from typing import Mapping, Sequence
+
+from core.engines.stats import EngineStats
+
+
+class RoutingPolicy(str, enum.Enum):
+    PRIORITY = "priority"
+    LEAST_LATENCY = "least_latency"
+    POWER_OF_TWO = "p2c"
+    COST_CAPPED = "cost_capped"
+
+
+def order_engines(
+    names: Sequence[str],
+    stats: Mapping[str, EngineStats],
+    costs: Mapping[str, float],
+    policy: RoutingPolicy | str,
+    *,
+    cost_cap: float | None = None,
+    rng: random.Random | None = None,
+) -> list[str]:
+    """Return ``names`` in the order they should be tried.
+
+    ``names`` must already be in priority order; every policy keeps that order
+    as the tie-breaker, so engines without latency samples are tried in
+    registration/default order.
+    """
+
+    policy = RoutingPolicy(policy)
+    ordered = list(names)
+    if policy == RoutingPolicy.PRIORITY or len(ordered) < 2:
+        return ordered
+
+    def score(name: str) -> float:
+        engine_stats = stats.get(name)
+        return engine_stats.score() if engine_stats else 0.0
+
+    if policy == RoutingPolicy.LEAST_LATENCY:
+        return sorted(ordered, key=score)
+
+    if policy == RoutingPolicy.POWER_OF_TWO:
+        first, second = (rng or random).sample(ordered, 2)
+        winner = first if score(first) <= score(second) else second
+        return [winner] + sorted((name for name in ordered if name != winner), key=score)
+
+    # COST_CAPPED: fastest engine within budget first, over-budget engines only as fallback.
+    cap = float("inf") if cost_cap is None else cost_cap
+    within = sorted((name for name in ordered if costs.get(name, 0.0) <= cap), key=score)
+    over = sorted((name for name in ordered if costs.get(name, 0.0) > cap), key=lambda name: costs.get(name, 0.0))
+    return within + over
+
+
+__all__ = ["RoutingPolicy", "order_engines"]
@@ -0,0 +1,81 @@
+"""Rolling latency and error statistics kept per translation engine."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+from core.config import settings
+
+
+class EngineStats:
+    """Recent call latencies (seconds) plus EWMA latency and error rate for one engine."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window: int = 256,
+        min_samples: int = 20,
+        alpha: float | None = None,
+    ) -> None:
+        self.name = name
+        self.min_samples = min_samples
+        self.alpha = alpha or settings.ENGINE_EWMA_ALPHA
+        self.ewma_latency: float | None = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, *, ok: bool = True) -> None:
+        with self._lock:
+            self.calls += 1
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+            if not ok:
+                return
+            self._latencies.append(latency)
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the q-th percentile (0-100), or None until enough samples exist."""
+
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+    def score(self) -> float:
+        """Expected seconds per successful call.
+
+        Engines never called score 0 so they get explored; engines whose calls
+        have all failed have no latency sample and score ``inf`` (tried last).
+        """
+
+        with self._lock:
+            if self.ewma_latency is None:
+                return 0.0 if self.calls == 0 else float("inf")
+            return self.ewma_latency / max(1.0 - self.error_rate, 0.05)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            samples = len(self._latencies)
+            calls = self.calls
+            ewma = self.ewma_latency
+            error_rate = self.error_rate
+        return {
+            "samples": samples,
+            "calls": calls,
+            "ewma_latency": ewma,
+            "error_rate": error_rate,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+        }
+
+
+__all__ = ["EngineStats"]
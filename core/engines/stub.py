@@ -0,0 +1,186 @@
+"""Offline stub engine that mimics Aliyun responses for load testing."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+from io import BytesIO
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+from core.config import settings
+from core.engines.base import TranslateEngine, TranslateResult
+from core.engines.registry import EngineRegistry
+
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_TEXTS = [
+    ("Best Seller", "畅销品"),
+    ("Key Ingredients", "主要成分"),
+    ("Free Shipping", "包邮"),
+    ("New Arrival", "新品上市"),
+    ("Limited Offer", "限时优惠"),
+    ("100% Natural", "100% 天然"),
+    ("Hydrating Formula", "保湿配方"),
+    ("Over 1M Sold", "销量超100万份"),
+]
+TEXT_COLORS = ["#000000", "#FFFFFF", "#192D5F", "#C0392B"]
+
+
+class StubUpstreamError(RuntimeError):
+    """Injected failure shaped like a Tea SDK 5xx so retry/breaker logic treats it as transient."""
+
+    statusCode = 503
+    code = "ServiceUnavailable"
+
+
+class StubEngine(TranslateEngine):
+    """Deterministic fake engine: same image in, same layers and image out, no network.
+
+    Layout and text are derived from the image hash, so repeated runs over the
+    same corpus produce identical outputs. Latency is drawn from a lognormal
+    distribution around ``latency_median`` and ``error_rate`` of calls fail
+    with :class:`StubUpstreamError`; both come from an RNG seeded once per
+    engine, so a serial benchmark run is reproducible end to end.
+    """
+
+    name = "stub"
+    display_name = "Stub (offline)"
+
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        latency_median: float | None = None,
+        latency_sigma: float | None = None,
+        error_rate: float | None = None,
+        max_layers: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if name:
+            self.name = name
+        super().__init__()
+        self.latency_median = settings.STUB_LATENCY_MEDIAN if latency_median is None else latency_median
+        self.latency_sigma = settings.STUB_LATENCY_SIGMA if latency_sigma is None else latency_sigma
+        self.error_rate = settings.STUB_ERROR_RATE if error_rate is None else error_rate
+        self.max_layers = max_layers or settings.STUB_MAX_LAYERS
+        self.seed = settings.STUB_SEED if seed is None else seed
+        self._rng = random.Random(self.seed)
+
+    async def translate(
+        self,
+        *,
+        image: bytes,
+        source_lang: str,
+        target_lang: str,
+        field: str,
+        enable_postprocess: bool = True,
+        mask: bytes | None = None,
+        protect_product: bool | None = None,
+    ) -> TranslateResult:
+        latency = self._sample_latency()
+        failed = self._rng.random() < self.error_rate
+        await asyncio.sleep(latency)
+        if failed:
+            raise StubUpstreamError("Stub 引擎模拟上游错误")
+
+        translated, layers, template_json = await asyncio.to_thread(self._render, image)
+        return TranslateResult(
+            engine_name=self.name,
+            translated_image=translated,
+            layers=layers,
+            editor_data=template_json,
+            inpainting_url=None,
+            metadata={
+                "requestId": f"stub-{hashlib.sha1(image).hexdigest()[:16]}",
+                "sourceLang": source_lang,
+                "targetLang": target_lang,
+                "field": field,
+                "latency": latency,
+            },
+        )
+
+    async def health_check(self) -> bool:
+        return True
+
+    def _sample_latency(self) -> float:
+        if self.latency_median <= 0:
+            return 0.0
+        return self._rng.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+    def _render(self, image_bytes: bytes) -> tuple[bytes, list[dict[str, Any]], str]:
+        source = Image.open(BytesIO(image_bytes))
+        source.load()
+        canvas = source.convert("RGB")
+        width, height = canvas.size
+        rng = random.Random(hashlib.sha256(image_bytes).digest())
+
+        children = self._layout(rng, width, height)
+        draw = ImageDraw.Draw(canvas)
+        layers: list[dict[str, Any]] = []
+        for child in children:
+            left, top = child["left"], child["top"]
+            right, bottom = left + child["width"], top + child["height"]
+            draw.rectangle((left, top, right, bottom), fill="#FFFFFF")
+            draw.text((left + 2, top + 2), child["content"], fill=child["color"])
+            layers.append(
+                {
+                    "originalText": child["ocrContent"],
+                    "translatedText": child["content"],
+                    "bbox": [float(left), float(top), float(child["width"]), float(child["height"])],
+                    "style": {
+                        "fontFamily": child["fontFamily"],
+                        "fontSize": float(child["fontSize"]),
+                        "fontColor": child["color"],
+                        "backgroundColor": None,
+                        "rotation": 0.0,
+                    },
+                }
+            )
+
+        buffer = BytesIO()
+        canvas.save(buffer, format="PNG")
+        template = {"width": width, "height": height, "children": children}
+        return buffer.getvalue(), layers, json.dumps(template, ensure_ascii=False)
+
+    def _layout(self, rng: random.Random, width: int, height: int) -> list[dict[str, Any]]:
+        """Aliyun-style template_json text elements stacked down the image."""
+
+        count = rng.randint(1, self.max_layers)
+        row_height = max(height // (count + 1), 1)
+        children: list[dict[str, Any]] = []
+        for index in range(count):
+            original, translated = rng.choice(SAMPLE_TEXTS)
+            box_width = max(int(width * rng.uniform(0.3, 0.8)), 1)
+            box_height = max(min(row_height - 2, 60), 1)
+            children.append(
+                {
+                    "type": "text",
+                    "label": "element",
+                    "left": rng.randint(0, max(width - box_width, 0)),
+                    "top": index * row_height + 1,
+                    "width": box_width,
+                    "height": box_height,
+                    "ocrContent": original,
+                    "content": translated,
+                    "fontFamily": "SourceHanSansSC",
+                    "fontSize": max(box_height - 8, 8),
+                    "color": rng.choice(TEXT_COLORS),
+                    "rotation": 0,
+                }
+            )
+        return children
+
+
+_enabled = settings.enabled_engines()
+if StubEngine.name in _enabled:
+    EngineRegistry.register(StubEngine(), default=_enabled[0] == StubEngine.name)
+
+
+__all__ = ["StubEngine", "StubUpstreamError"]
@@ -46,6 +46,27 @@ class TranslationError(AppError):
     error_code = "TRANSLATION_ERROR"
 
 
+class EngineRejectedError(AppError):
+    """Raised when an engine rejects the request itself (bad image, unsupported language)."""
+
+    status_code = 422
+    error_code = "ENGINE_REJECTED"
+
+
+class UpstreamTransientError(TranslationError):
+    """Raised when an engine reports throttling or a server-side failure worth retrying."""
+
+    status_code = 503
+    error_code = "UPSTREAM_UNAVAILABLE"
+
+
+class ForbiddenError(AppError):
+    """Raised when the caller lacks permission for the resource."""
+
+    status_code = 403
+    error_code = "FORBIDDEN"
+
+
 class NotFoundError(AppError):
     """Raised when a resource cannot be located."""
 
@@ -110,6 +131,9 @@ __all__ = [
     "AppError",
     "ValidationError",
     "TranslationError",
+    "EngineRejectedError",
+    "UpstreamTransientError",
+    "ForbiddenError",
     "NotFoundError",
     "RateLimitError",
     "EngineUnavailableError",
@@ -0,0 +1,129 @@
+"""Event-loop lag monitor and blocking-call detector."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from core.config import settings
+from core.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = registry.histogram(
+    "picturetranslate_event_loop_lag_seconds",
+    "Delay between when a loop timer was due and when it ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_BLOCKED = registry.counter(
+    "picturetranslate_event_loop_blocked_total",
+    "Times the blocking detector caught the loop stalled beyond the threshold.",
+)
+
+
+class LoopMonitor:
+    """Measure scheduling delay of the running loop and, optionally, catch blocking calls.
+
+    A ticker task sleeps ``interval`` seconds and records how late it woke up.
+    With ``blocking_threshold`` set, the ticker runs faster and a watchdog
+    thread checks its heartbeat; when the loop has not ticked for longer than
+    the threshold, the watchdog logs the loop thread's current stack, which is
+    the code blocking it.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float | None = None,
+        blocking_threshold: float | None = None,
+        max_reports: int = 20,
+    ) -> None:
+        self.blocking_threshold = blocking_threshold
+        interval = interval or settings.LOOP_MONITOR_INTERVAL
+        self.interval = min(interval, blocking_threshold / 4) if blocking_threshold else interval
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.reports: deque[str] = deque(maxlen=max_reports)
+        self._heartbeat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from inside it)."""
+
+        if self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        if self.blocking_threshold:
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _tick(self) -> None:
+        while True:
+            due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - due, 0.0)
+            self._heartbeat = now
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+
+    def _watch(self) -> None:
+        threshold = self.blocking_threshold or 0.0
+        reported = False
+        while not self._stop.wait(self.interval):
+            stalled_for = time.monotonic() - self._heartbeat
+            if stalled_for <= threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            frame = sys._current_frames().get(self._loop_thread or 0)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.reports.append(stack)
+            LOOP_BLOCKED.inc()
+            logger.warning("Event loop blocked for >%.0fms, loop thread stack:\n%s", stalled_for * 1000, stack)
+
+
+def build_loop_monitor() -> LoopMonitor | None:
+    """Monitor configured from settings, or None when disabled."""
+
+    if not settings.LOOP_MONITOR_ENABLED:
+        return None
+    threshold = settings.LOOP_BLOCKING_THRESHOLD if settings.LOOP_BLOCKING_DEBUG else None
+    return LoopMonitor(interval=settings.LOOP_MONITOR_INTERVAL, blocking_threshold=threshold)
+
+
+__all__ = ["LOOP_BLOCKED", "LOOP_LAG", "LoopMonitor", "build_loop_monitor"]
@@ -0,0 +1,313 @@
+"""In-process metrics (counters, gauges, histograms) rendered in Prometheus text format."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Sequence
+
+
+LabelValues = tuple[str, ...]
+
+# 覆盖 1ms ~ 2min，适合从内存编码到阿里云调用的各个阶段
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+PIPELINE_STAGES = (
+    "upload_read",
+    "validate",
+    "store",
+    "queue_wait",
+    "engine_call",
+    "result_download",
+    "postprocess_render",
+    "result_save",
+    "db_commit",
+    "sse_publish",
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: dict[str, str] | None = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.extend(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; ``collect`` computes it at scrape time instead."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        collect: Callable[[], float | dict[LabelValues, float]] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, collect: Callable[[], float | dict[LabelValues, float]]) -> None:
+        self._collect = collect
+
+    def value(self, **labels: str) -> float:
+        return self._snapshot().get(self._key(labels), 0.0)
+
+    def _snapshot(self) -> dict[LabelValues, float]:
+        if self._collect is not None:
+            collected = self._collect()
+            if isinstance(collected, dict):
+                return dict(collected)
+            return {(): float(collected)}
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self) -> list[str]:
+        try:
+            items = sorted(self._snapshot().items())
+        except Exception:  # pragma: no cover - a broken collector must not break /metrics
+            return []
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts plus sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def stats(self, **labels: str) -> tuple[int, float]:
+        """Return (count, sum) for one label set."""
+
+        key = self._key(labels)
+        with self._lock:
+            return sum(self._counts.get(key, ())), self._sums.get(key, 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together for one scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, **kwargs))  # type: ignore[return-value]
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, **kwargs))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "picturetranslate_stage_seconds",
+    "Time spent in each pipeline stage.",
+    ("stage",),
+)
+ENGINE_CALLS = registry.counter(
+    "picturetranslate_engine_calls_total",
+    "Translation engine calls by outcome (cancelled_billed calls still ran upstream).",
+    ("engine", "outcome"),
+)
+ENGINE_IN_FLIGHT = registry.gauge(
+    "picturetranslate_engine_in_flight",
+    "Translation engine calls currently awaiting a response.",
+    ("engine",),
+)
+QUEUE_DEPTH = registry.gauge("picturetranslate_queue_depth", "Translations waiting for a worker.")
+CACHE_BYTES = registry.gauge("picturetranslate_cache_bytes", "Bytes held by the translate result cache.")
+SSE_SUBSCRIBERS = registry.gauge("picturetranslate_sse_subscribers", "Open SSE subscriber queues.")
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+def time_stage(stage: str):
+    """Context manager that records the enclosed block under ``stage``."""
+
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def instrument_sqlalchemy(engine) -> None:
+    """Record the DBAPI COMMIT latency of ``engine`` as the ``db_commit`` stage."""
+
+    original = engine.dialect.do_commit
+
+    def do_commit(dbapi_connection) -> None:
+        started = time.perf_counter()
+        try:
+            original(dbapi_connection)
+        finally:
+            observe_stage("db_commit", time.perf_counter() - started)
+
+    engine.dialect.do_commit = do_commit  # type: ignore[method-assign]
+
+
+def render_latest() -> str:
+    return registry.render()
+
+
+__all__ = [
+    "CACHE_BYTES",
+    "Counter",
+    "DEFAULT_BUCKETS",
+    "ENGINE_CALLS",
+    "ENGINE_IN_FLIGHT",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "PIPELINE_STAGES",
+    "QUEUE_DEPTH",
+    "SSE_SUBSCRIBERS",
+    "STAGE_SECONDS",
+    "instrument_sqlalchemy",
+    "observe_stage",
+    "registry",
+    "render_latest",
+    "time_stage",
+]
@@ -12,6 +12,7 @@ from PIL import Image, UnidentifiedImageError
 from core.engines import EngineRegistry
 from core.engines.aliyun import AliyunEngine
 from core.exceptions import TranslationError
+from core.tracing import start_span
 
 
 @dataclass
@@ -32,7 +33,6 @@ class ImageTranslator:
                 access_key_id=access_key_id,
                 access_key_secret=access_key_secret,
             )
-        self._preferred_engine = AliyunEngine.name
 
     def translate(
         self,
@@ -44,6 +44,7 @@ class ImageTranslator:
         *,
         protect_product: Optional[bool] = None,
         engine: Optional[str] = None,
+        hedge: bool = False,
     ) -> TranslationOutput:
         """Keep the legacy synchronous API expected by TranslatorService."""
 
@@ -60,6 +61,7 @@ class ImageTranslator:
             enable_postprocess=enable_postprocess,
             protect_product=protect_product,
             preferred_engine=engine,
+            hedge=hedge,
         )
 
     def _run_translation(
@@ -72,31 +74,62 @@ class ImageTranslator:
         enable_postprocess: bool,
         protect_product: Optional[bool],
         preferred_engine: Optional[str],
+        hedge: bool = False,
     ) -> TranslationOutput:
-        if self._custom_engine is not None:
-            coro = self._custom_engine.translate(
-                image=image_bytes,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                field=field,
-                enable_postprocess=enable_postprocess,
-                mask=None,
-                protect_product=protect_product,
-            )
-        else:
-            selected_engine = preferred_engine or self._preferred_engine
-            coro = EngineRegistry.translate_with_fallback(
-                preferred=selected_engine,
-                image=image_bytes,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                field=field,
-                enable_postprocess=enable_postprocess,
-                mask=None,
+        return self._run_async(
+            self.translate_async(
+                image_bytes,
+                source_lang,
+                target_lang,
+                field,
+                enable_postprocess,
                 protect_product=protect_product,
+                engine=preferred_engine,
+                hedge=hedge,
             )
+        )
+
+    async def translate_async(
+        self,
+        image_bytes: bytes,
+        source_lang: str = "auto",
+        target_lang: str = "zh",
+        field: str = "e-commerce",
+        enable_postprocess: bool = True,
+        *,
+        protect_product: Optional[bool] = None,
+        engine: Optional[str] = None,
+        hedge: bool = False,
+    ) -> TranslationOutput:
+        """Translate encoded image bytes on the caller's event loop."""
+
+        with start_span("image_translator.translate", {"image.bytes": len(image_bytes), "hedge": hedge}) as span:
+            if self._custom_engine is not None:
+                span.set_attribute("engine", self._custom_engine.name)
+                result = await self._custom_engine.translate(
+                    image=image_bytes,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    field=field,
+                    enable_postprocess=enable_postprocess,
+                    mask=None,
+                    protect_product=protect_product,
+                )
+            else:
+                # 未指定引擎时交给 EngineRegistry 的路由策略选择
+                result = await EngineRegistry.translate_with_fallback(
+                    preferred=engine,
+                    hedge=hedge,
+                    image=image_bytes,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    field=field,
+                    enable_postprocess=enable_postprocess,
+                    mask=None,
+                    protect_product=protect_product,
+                )
+            span.set_attribute("engine", result.engine_name)
 
-        result = self._run_async(coro)
         if not result.translated_image:
             raise TranslationError("翻译引擎没有返回图片数据")
         return TranslationOutput(
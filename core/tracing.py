@@ -0,0 +1,247 @@
+"""Lightweight request tracing with an OpenTelemetry-shaped span model.
+
+Tracing is off by default: ``start_span`` then returns a shared no-op span
+and touches no context variables. When ``TRACING_ENABLED`` is set, finished
+spans go to the configured exporter (in-memory by default) and can be
+looked up by trace id or by the ``translation_id`` attribute. The current
+span lives in a ``contextvars.ContextVar``, so it follows ``await``,
+``asyncio.create_task``, ``asyncio.to_thread`` and executors that run under
+``contextvars.copy_context()``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Protocol
+
+from core.config import settings
+
+
+TRACE_HEADER = "X-Trace-Id"
+
+
+class Span:
+    """One timed operation inside a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "status", "message")
+
+    def __init__(self, name: str, *, trace_id: str, parent_id: str | None, attributes: Mapping[str, Any] | None) -> None:
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.status = "UNSET"
+        self.message: str | None = None
+
+    @property
+    def is_recording(self) -> bool:
+        return True
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, exc: BaseException) -> None:
+        self.status = "ERROR"
+        self.message = f"{type(exc).__name__}: {exc}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": self.duration_ms,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.message},
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled; every operation is a no-op."""
+
+    trace_id: str | None = None
+    span_id: str | None = None
+    is_recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def set_error(self, exc: BaseException) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class InMemorySpanExporter:
+    """Keep the most recent ``max_spans`` finished spans, indexed by trace and translation id."""
+
+    def __init__(self, max_spans: int = 10_000) -> None:
+        self.max_spans = max_spans
+        self._spans: deque[Span] = deque()
+        self._by_trace: dict[str, list[Span]] = {}
+        self._by_translation: dict[str, set[str]] = {}
+        self._trace_translations: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+            self._by_trace.setdefault(span.trace_id, []).append(span)
+            translation_id = span.attributes.get("translation_id")
+            if translation_id:
+                self._by_translation.setdefault(str(translation_id), set()).add(span.trace_id)
+                self._trace_translations.setdefault(span.trace_id, set()).add(str(translation_id))
+            while len(self._spans) > self.max_spans:
+                self._evict(self._spans.popleft())
+
+    def get_trace(self, trace_id: str) -> list[Span]:
+        with self._lock:
+            return sorted(self._by_trace.get(trace_id, ()), key=lambda span: span.start_ns)
+
+    def find_traces(self, translation_id: str) -> dict[str, list[Span]]:
+        with self._lock:
+            trace_ids = list(self._by_translation.get(translation_id, ()))
+        return {trace_id: self.get_trace(trace_id) for trace_id in trace_ids}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._by_trace.clear()
+            self._by_translation.clear()
+            self._trace_translations.clear()
+
+    def _evict(self, span: Span) -> None:
+        siblings = self._by_trace.get(span.trace_id)
+        if siblings is not None:
+            siblings.remove(span)
+            if siblings:
+                return
+            del self._by_trace[span.trace_id]
+        for translation_id in self._trace_translations.pop(span.trace_id, ()):
+            trace_ids = self._by_translation.get(translation_id)
+            if trace_ids is not None:
+                trace_ids.discard(span.trace_id)
+                if not trace_ids:
+                    del self._by_translation[translation_id]
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Create spans and hand finished ones to the exporter."""
+
+    def __init__(self, *, enabled: bool, exporter: SpanExporter) -> None:
+        self.enabled = enabled
+        self.exporter = exporter
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Mapping[str, Any] | None = None) -> Iterator[Span | _NoopSpan]:
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_error(exc)
+            raise
+        else:
+            if span.status == "UNSET":
+                span.status = "OK"
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.exporter.export(span)
+
+
+exporter = InMemorySpanExporter(max_spans=settings.TRACING_MAX_SPANS)
+tracer = Tracer(enabled=settings.TRACING_ENABLED, exporter=exporter)
+
+
+def start_span(name: str, attributes: Mapping[str, Any] | None = None):
+    """Context manager for a child of the current span (or a new trace)."""
+
+    return tracer.start_span(name, attributes)
+
+
+def current_span() -> Span | _NoopSpan:
+    return _current_span.get() or NOOP_SPAN
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach an attribute to the current span, if any."""
+
+    span = _current_span.get()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+class TracingMiddleware:
+    """ASGI middleware that opens a root span per HTTP request and returns its id in X-Trace-Id."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        attributes = {"http.method": scope["method"], "http.target": scope["path"]}
+        with tracer.start_span(f"{scope['method']} {scope['path']}", attributes) as span:
+
+            async def send_with_trace_id(message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((TRACE_HEADER.lower().encode(), span.trace_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace_id)
+
+
+__all__ = [
+    "InMemorySpanExporter",
+    "NOOP_SPAN",
+    "Span",
+    "SpanExporter",
+    "TRACE_HEADER",
+    "Tracer",
+    "TracingMiddleware",
+    "current_span",
+    "exporter",
+    "set_attribute",
+    "start_span",
+    "tracer",
+]
@@ -0,0 +1,10 @@
+-- 历史记录列表的复合索引
+-- 筛选列在前、排序列 (created_at, id) 在后，列表查询可沿索引顺序读取并直接 LIMIT
+
+CREATE INDEX IF NOT EXISTS ix_translations_created_id ON translations(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_translations_source_created_id ON translations(source_lang, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_translations_target_created_id ON translations(target_lang, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_translations_langs_created_id ON translations(source_lang, target_lang, created_at, id);
+
+-- 更新统计信息，帮助查询规划器选择上面的索引
+ANALYZE translations;
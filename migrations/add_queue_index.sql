@@ -0,0 +1,2 @@
+-- worker 认领待处理任务：WHERE status = 'PENDING' ORDER BY created_at LIMIT 1
+CREATE INDEX IF NOT EXISTS ix_translations_status_created ON translations(status, created_at);
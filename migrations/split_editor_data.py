@@ -0,0 +1,108 @@
+"""Move inline ``translations.editor_data`` into the compressed ``translation_editor_data`` table.
+
+Copies in batches (one transaction each, so it can be interrupted and
+re-run), then drops the old column and VACUUMs so the ``translations`` pages
+shrink on disk::
+
+    python -m migrations.split_editor_data
+    python -m migrations.split_editor_data --database-url sqlite:///data/translations.db --no-vacuum
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from typing import Iterable
+
+from sqlalchemy import Engine, bindparam, create_engine, inspect, text
+
+from core.config import settings
+from models import TranslationEditorData
+from utils.compression import compress_text
+
+
+logger = logging.getLogger(__name__)
+
+
+def _has_legacy_column(engine: Engine) -> bool:
+    return any(column["name"] == "editor_data" for column in inspect(engine).get_columns("translations"))
+
+
+def migrate(engine: Engine, *, batch_size: int = 200, vacuum: bool = True) -> int:
+    """Move every non-null legacy value; returns the number of rows moved."""
+
+    if not _has_legacy_column(engine):
+        logger.info("translations.editor_data 不存在，无需迁移")
+        return 0
+
+    TranslationEditorData.__table__.create(bind=engine, checkfirst=True)
+    moved = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                text("SELECT id, editor_data FROM translations WHERE editor_data IS NOT NULL LIMIT :limit"),
+                {"limit": batch_size},
+            ).all()
+            if not rows:
+                break
+            payload = []
+            for translation_id, editor_data in rows:
+                codec, data = compress_text(editor_data)
+                payload.append(
+                    {
+                        "translation_id": translation_id,
+                        "codec": codec,
+                        "data": data,
+                        "raw_size": len(editor_data.encode("utf-8")),
+                    }
+                )
+            # 已迁移过的记录（中断后重跑）以旧列为准覆盖
+            connection.execute(
+                TranslationEditorData.__table__.delete().where(
+                    TranslationEditorData.translation_id.in_([row[0] for row in rows])
+                )
+            )
+            connection.execute(TranslationEditorData.__table__.insert(), payload)
+            connection.execute(
+                text("UPDATE translations SET editor_data = NULL WHERE id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": [row[0] for row in rows]},
+            )
+            moved += len(rows)
+            logger.info("已迁移 %d 条编辑器数据", moved)
+
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE translations DROP COLUMN editor_data"))
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM"))
+    return moved
+
+
+def _parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--no-vacuum", action="store_true", help="skip VACUUM after dropping the column")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = _parse_args(argv)
+    engine = create_engine(args.database_url)
+    try:
+        moved = migrate(engine, batch_size=args.batch_size, vacuum=not args.no_vacuum)
+    finally:
+        engine.dispose()
+    print(f"moved {moved} editor_data rows")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
+
+
+__all__ = ["main", "migrate"]
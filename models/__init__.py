@@ -1,7 +1,8 @@
 """ORM model exports."""
 
+from .editor_data import TranslationEditorData
 from .job import Job, JobStatus
 from .text_layer import TextLayer
 from .translation import Translation, TranslationStatus
 
-__all__ = ["Job", "JobStatus", "Translation", "TranslationStatus", "TextLayer"]
+__all__ = ["Job", "JobStatus", "Translation", "TranslationEditorData", "TranslationStatus", "TextLayer"]
@@ -0,0 +1,50 @@
+"""Compressed editor template storage, kept out of the hot translations table."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from core.database import Base
+from utils.compression import compress_text, decompress_text
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .translation import Translation
+
+
+class TranslationEditorData(Base):
+    """Aliyun editor template JSON for one translation, stored compressed."""
+
+    __tablename__ = "translation_editor_data"
+
+    translation_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("translations.id", ondelete="CASCADE"), primary_key=True
+    )
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    translation: Mapped["Translation"] = relationship("Translation", back_populates="editor_blob")
+
+    @classmethod
+    def from_text(cls, text: str) -> "TranslationEditorData":
+        blob = cls()
+        blob.set_text(text)
+        return blob
+
+    @property
+    def text(self) -> str:
+        return decompress_text(self.codec, self.data)
+
+    def set_text(self, text: str) -> None:
+        self.codec, self.data = compress_text(text)
+        self.raw_size = len(text.encode("utf-8"))
+
+
+__all__ = ["TranslationEditorData"]
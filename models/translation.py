@@ -7,11 +7,13 @@ import uuid
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.database import Base
 
+from .editor_data import TranslationEditorData
+
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from .text_layer import TextLayer
 
@@ -27,6 +29,16 @@ class Translation(Base):
     """Represents a single image translation task."""
 
     __tablename__ = "translations"
+    # 历史列表按 created_at DESC, id DESC 排序，筛选列在前、排序列在后，
+    # 让 SQLite 能直接沿索引顺序扫描，无需临时 B 树排序
+    __table_args__ = (
+        Index("ix_translations_created_id", "created_at", "id"),
+        Index("ix_translations_source_created_id", "source_lang", "created_at", "id"),
+        Index("ix_translations_target_created_id", "target_lang", "created_at", "id"),
+        Index("ix_translations_langs_created_id", "source_lang", "target_lang", "created_at", "id"),
+        # worker 认领按 status 过滤、created_at 排序取第一条
+        Index("ix_translations_status_created", "status", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id: Mapped[str] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -35,7 +47,6 @@ class Translation(Base):
     original_path: Mapped[str] = mapped_column(String(255), nullable=False)
     mask_path: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     result_path: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    editor_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 阿里云编辑器图层 JSON
     inpainting_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)  # 擦除背景图 URL
     source_lang: Mapped[str] = mapped_column(String(32), nullable=False)
     target_lang: Mapped[str] = mapped_column(String(32), nullable=False)
@@ -63,6 +74,26 @@ class Translation(Base):
         back_populates="translation",
         cascade="all, delete-orphan",
     )
+    # 阿里云编辑器图层 JSON 单独压缩存放在 translation_editor_data，只在访问时才加载
+    editor_blob: Mapped[Optional[TranslationEditorData]] = relationship(
+        TranslationEditorData,
+        back_populates="translation",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+
+    @property
+    def editor_data(self) -> Optional[str]:
+        return self.editor_blob.text if self.editor_blob is not None else None
+
+    @editor_data.setter
+    def editor_data(self, value: Optional[str]) -> None:
+        if value is None:
+            self.editor_blob = None
+        elif self.editor_blob is None:
+            self.editor_blob = TranslationEditorData.from_text(value)
+        else:
+            self.editor_blob.set_text(value)
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"<Translation id={self.id} job={self.job_id} status={self.status}>"
@@ -1,5 +1,6 @@
 """Service layer exports."""
 
+from .backup import BackupService, backup_service
 from .cache import CacheService
 from .cleanup import CleanupService, cleanup_service
 from .demo_service import DemoService
@@ -21,4 +22,6 @@ __all__ = [
     "CleanupService",
     "cleanup_service",
     "DemoService",
+    "BackupService",
+    "backup_service",
 ]
@@ -0,0 +1,346 @@
+"""Hot backups of the SQLite database plus hardlink snapshots of the storage directory.
+
+Each snapshot is a directory ``BACKUP_DIR/<UTC timestamp>/`` holding:
+
+* ``translations.db``, copied with SQLite's online backup API a few pages per
+  step. The copy uses its own connection and pauses ``BACKUP_STEP_SLEEP``
+  between steps, so in WAL mode the app's writer keeps committing while a
+  backup runs.
+* ``storage/``, a tree mirroring ``STORAGE_DIR``. Each file is a hardlink to
+  the live file, or to the previous snapshot's copy when the live tree is on
+  another filesystem. Only new or changed files take space.
+  ``StorageService`` replaces files atomically and never rewrites them in
+  place, so a linked file cannot change after the snapshot was taken.
+* ``manifest.json``.
+
+A snapshot is built under a ``.partial`` name and renamed once complete.
+Only the newest ``BACKUP_RETENTION`` snapshots are kept::
+
+    python -m services.backup create
+    python -m services.backup list
+    python -m services.backup restore 20240101-030000-000000 --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import make_url
+
+from core.config import settings
+from core.exceptions import AppError, NotFoundError, ValidationError
+from services.storage import TEMP_SUFFIX
+
+
+logger = logging.getLogger(__name__)
+
+DATABASE_FILE = "translations.db"
+STORAGE_DIRNAME = "storage"
+MANIFEST_FILE = "manifest.json"
+PARTIAL_SUFFIX = ".partial"
+
+
+class BackupInProgressError(AppError):
+    """Raised when a backup is requested while another one is still running."""
+
+    status_code = 409
+    error_code = "BACKUP_IN_PROGRESS"
+
+
+@dataclass
+class BackupResult:
+    name: str
+    path: Path
+    created_at: str
+    database_pages: int
+    files_linked: int
+    files_copied: int
+
+
+class BackupService:
+    """Create, rotate and restore snapshots under ``BACKUP_DIR``."""
+
+    def __init__(
+        self,
+        *,
+        backup_dir: Path | str | None = None,
+        database_url: Optional[str] = None,
+        storage_dir: Path | str | None = None,
+        retention: Optional[int] = None,
+        pages_per_step: Optional[int] = None,
+        step_sleep: Optional[float] = None,
+        include_storage: Optional[bool] = None,
+    ) -> None:
+        self.backup_dir = Path(backup_dir or settings.BACKUP_DIR).resolve()
+        self._database_url = database_url or settings.database_url
+        self._storage_dir = Path(storage_dir or settings.STORAGE_DIR).resolve()
+        self._retention = retention or settings.BACKUP_RETENTION
+        self._pages_per_step = pages_per_step or settings.BACKUP_PAGES_PER_STEP
+        self._step_sleep = settings.BACKUP_STEP_SLEEP if step_sleep is None else step_sleep
+        self._include_storage = settings.BACKUP_STORAGE if include_storage is None else include_storage
+        self._lock = threading.Lock()
+
+    async def run_backup(self) -> Optional[BackupResult]:
+        """Scheduler entry point: back up in a worker thread and log instead of raising."""
+
+        try:
+            result = await asyncio.to_thread(self.create_backup)
+        except BackupInProgressError:
+            logger.info("上一次备份尚未结束，跳过本次定时备份")
+            return None
+        except Exception:  # pragma: no cover - defensive logging
+            logger.exception("Backup failed")
+            return None
+        logger.info(
+            "Backup %s done: %d pages, %d files linked, %d copied",
+            result.name,
+            result.database_pages,
+            result.files_linked,
+            result.files_copied,
+        )
+        return result
+
+    def create_backup(self) -> BackupResult:
+        if not self._lock.acquire(blocking=False):
+            raise BackupInProgressError("已有备份正在进行")
+        try:
+            return self._create_backup()
+        finally:
+            self._lock.release()
+
+    def _create_backup(self) -> BackupResult:
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        now = datetime.now(timezone.utc)
+        name = now.strftime("%Y%m%d-%H%M%S-%f")
+        previous = self.list_backups()
+        partial = self.backup_dir / f"{name}{PARTIAL_SUFFIX}"
+        partial.mkdir()
+        try:
+            pages = 0
+            if self._sqlite_path() is not None:
+                pages = self._backup_database(partial / DATABASE_FILE)
+            else:
+                logger.warning("非 SQLite 数据库不做在线备份，请使用 pg_dump；本次只快照存储目录")
+            linked = copied = 0
+            if self._include_storage and self._storage_dir.exists():
+                linked, copied = self._snapshot_storage(
+                    partial / STORAGE_DIRNAME, previous[0] / STORAGE_DIRNAME if previous else None
+                )
+            result = BackupResult(
+                name=name,
+                path=self.backup_dir / name,
+                created_at=now.isoformat(),
+                database_pages=pages,
+                files_linked=linked,
+                files_copied=copied,
+            )
+            manifest = {key: value for key, value in asdict(result).items() if key != "path"}
+            (partial / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            partial.rename(result.path)
+        except BaseException:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+        self.rotate()
+        return result
+
+    def list_backups(self) -> List[Path]:
+        """Complete snapshots, newest first."""
+
+        if not self.backup_dir.exists():
+            return []
+        snapshots = [
+            path
+            for path in self.backup_dir.iterdir()
+            if path.is_dir() and not path.name.endswith(PARTIAL_SUFFIX) and (path / MANIFEST_FILE).exists()
+        ]
+        return sorted(snapshots, key=lambda path: path.name, reverse=True)
+
+    def rotate(self) -> List[str]:
+        """Delete snapshots beyond the retention count and leftovers of interrupted runs.
+
+        Runs at the end of ``create_backup`` while the backup lock is held, so
+        any ``.partial`` directory left at that point belongs to a dead run.
+        """
+
+        removed = []
+        for path in self.list_backups()[self._retention :]:
+            shutil.rmtree(path)
+            removed.append(path.name)
+        for path in self.backup_dir.glob(f"*{PARTIAL_SUFFIX}"):
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+        return removed
+
+    def restore(self, name: str, *, force: bool = False) -> Path:
+        """Copy snapshot ``name`` back over the live database and storage directory.
+
+        Stop the API and workers first. The current storage directory is
+        renamed, not deleted, so a wrong restore can be undone by hand.
+        """
+
+        snapshot = self.backup_dir / name
+        if not (snapshot / MANIFEST_FILE).exists():
+            raise NotFoundError(f"备份不存在: {name}")
+        target = self._sqlite_path()
+        if target is None:
+            raise ValidationError("在线备份只支持文件型 SQLite 数据库；PostgreSQL 请使用 pg_restore")
+        if not (snapshot / DATABASE_FILE).exists():
+            raise NotFoundError(f"备份 {name} 不包含数据库文件")
+        if target.exists() and not force:
+            raise ValidationError("目标数据库已存在；确认服务已停止后使用 --force 覆盖")
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # 通过 backup API 写回，目标库已有的 WAL 会被正确处理，而不是被整文件覆盖后失配
+        source = sqlite3.connect(f"file:{snapshot / DATABASE_FILE}?mode=ro", uri=True)
+        destination = sqlite3.connect(target)
+        try:
+            source.backup(destination)
+        finally:
+            destination.close()
+            source.close()
+
+        snapshot_storage = snapshot / STORAGE_DIRNAME
+        if snapshot_storage.exists():
+            if self._storage_dir.exists():
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+                self._storage_dir.rename(self._storage_dir.with_name(f"{self._storage_dir.name}.before-restore-{stamp}"))
+            self._snapshot_storage(self._storage_dir, None, source_root=snapshot_storage)
+        return target
+
+    def _sqlite_path(self) -> Optional[Path]:
+        url = make_url(self._database_url)
+        if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+            return None
+        return Path(url.database).resolve()
+
+    def _backup_database(self, destination: Path) -> int:
+        source = sqlite3.connect(self._sqlite_path())
+        target = sqlite3.connect(destination)
+        total = 0
+
+        def _progress(status: int, remaining: int, pages: int) -> None:
+            nonlocal total
+            total = pages
+            # Connection.backup 只在 BUSY/LOCKED 时才用 sleep 参数休眠，步与步之间的停顿要自己做
+            if remaining and self._step_sleep > 0:
+                time.sleep(self._step_sleep)
+
+        try:
+            # 整个备份期间在源库上持有一个读事务：复制的是同一个一致快照，其他连接的提交不会让备份
+            # 从头重来；WAL 下读事务不阻塞写者，写连接照常提交（只是 checkpoint 要等备份结束）
+            source.execute("BEGIN")
+            source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            source.backup(target, pages=self._pages_per_step, progress=_progress, sleep=self._step_sleep)
+            source.execute("COMMIT")
+            check = target.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise RuntimeError(f"backup integrity check failed: {check}")
+        finally:
+            target.close()
+            source.close()
+        return total
+
+    def _snapshot_storage(
+        self, destination: Path, previous: Optional[Path], *, source_root: Optional[Path] = None
+    ) -> Tuple[int, int]:
+        root = source_root or self._storage_dir
+        linked = copied = 0
+        for directory, _, files in os.walk(root):
+            relative_dir = Path(directory).relative_to(root)
+            (destination / relative_dir).mkdir(parents=True, exist_ok=True)
+            for filename in files:
+                if filename.startswith(".") and filename.endswith(TEMP_SUFFIX):
+                    continue  # StorageService 正在写入的临时文件
+                source = Path(directory) / filename
+                target = destination / relative_dir / filename
+                if _try_link(source, target):
+                    linked += 1
+                    continue
+                reuse = previous / relative_dir / filename if previous else None
+                if reuse is not None and _same_file(source, reuse) and _try_link(reuse, target):
+                    linked += 1
+                    continue
+                shutil.copy2(source, target)
+                copied += 1
+        return linked, copied
+
+
+def _try_link(source: Path, target: Path) -> bool:
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        # 跨文件系统（如存储与备份是不同的卷）时无法硬链接
+        return False
+    return True
+
+
+def _same_file(live: Path, previous: Path) -> bool:
+    try:
+        live_stat, previous_stat = live.stat(), previous.stat()
+    except FileNotFoundError:
+        return False
+    # copy2 会保留 mtime；文件只会被整体替换，大小与 mtime 都相同即视为未变化
+    return live_stat.st_size == previous_stat.st_size and live_stat.st_mtime_ns == previous_stat.st_mtime_ns
+
+
+backup_service = BackupService()
+
+
+def _parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("create", help="take a snapshot now")
+    commands.add_parser("list", help="list complete snapshots, newest first")
+    restore = commands.add_parser("restore", help="restore a snapshot (stop the service first)")
+    restore.add_argument("name")
+    restore.add_argument("--force", action="store_true", help="overwrite the existing database")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = _parse_args(argv)
+    service = BackupService()
+    try:
+        if args.command == "create":
+            result = service.create_backup()
+            print(f"created {result.name} ({result.database_pages} pages, {result.files_linked} linked, "
+                  f"{result.files_copied} copied)")
+        elif args.command == "list":
+            for path in service.list_backups():
+                print(path.name)
+        else:
+            target = service.restore(args.name, force=args.force)
+            print(f"restored {args.name} -> {target}")
+    except AppError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
+
+
+__all__ = [
+    "BackupInProgressError",
+    "BackupResult",
+    "BackupService",
+    "backup_service",
+    "main",
+]
@@ -22,6 +22,7 @@ class CacheService:
 
     def __init__(self, *, max_size: int | None = None, ttl: int | None = None) -> None:
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
         self._lock = threading.Lock()
         self._max_size = max_size or settings.CACHE_MAX_SIZE
         self._ttl = ttl or settings.CACHE_TTL
@@ -33,7 +34,7 @@ class CacheService:
                 return None
 
             if self._is_expired(entry):
-                del self._cache[key]
+                self._pop(key)
                 return None
 
             self._cache.move_to_end(key)
@@ -41,17 +42,25 @@ class CacheService:
 
     def set(self, key: str, value: bytes) -> None:
         with self._lock:
+            self._pop(key)
             self._cache[key] = CacheEntry(value=value, stored_at=time.time())
+            self._bytes += len(value)
             self._cache.move_to_end(key)
             self._evict_if_needed()
 
     def delete(self, key: str) -> None:
         with self._lock:
-            self._cache.pop(key, None)
+            self._pop(key)
 
     def clear(self) -> None:
         with self._lock:
             self._cache.clear()
+            self._bytes = 0
+
+    def size_bytes(self) -> int:
+        """Total size of cached values."""
+
+        return self._bytes
 
     def snapshot(self) -> Dict[str, float]:
         """Return a shallow copy of keys with their age (seconds)."""
@@ -62,9 +71,15 @@ class CacheService:
     def _is_expired(self, entry: CacheEntry) -> bool:
         return time.time() - entry.stored_at > self._ttl
 
+    def _pop(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.value)
+
     def _evict_if_needed(self) -> None:
         while len(self._cache) > self._max_size:
-            self._cache.popitem(last=False)
+            _, entry = self._cache.popitem(last=False)
+            self._bytes -= len(entry.value)
 
 
 __all__ = ["CacheService", "CacheEntry"]
@@ -5,14 +5,16 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.config import settings
-from core.database import SessionLocal
+from core.database import AsyncSessionLocal, SessionLocal, optimize_database, run_in_session
 from models import Job, Translation
+from services.backup import BackupService, backup_service as default_backup_service
 from services.storage import StorageService
 
 logger = logging.getLogger(__name__)
@@ -25,8 +27,12 @@ class CleanupService:
         self,
         session_factory=SessionLocal,
         storage_service: Optional[StorageService] = None,
+        async_session_factory: Optional[Callable[[], AsyncSession]] = None,
+        backup_service: Optional[BackupService] = None,
     ) -> None:
         self._session_factory = session_factory
+        self._async_session_factory = async_session_factory
+        self._backup = backup_service
         self._storage = storage_service or StorageService()
         self._scheduler: Optional[AsyncIOScheduler] = None
 
@@ -47,37 +53,66 @@ class CleanupService:
             id="daily_cleanup",
             replace_existing=True,
         )
+        if settings.SQLITE_OPTIMIZE_INTERVAL_HOURS > 0:
+            self._scheduler.add_job(
+                self.run_optimize,
+                "interval",
+                hours=settings.SQLITE_OPTIMIZE_INTERVAL_HOURS,
+                id="sqlite_optimize",
+                replace_existing=True,
+            )
+        if self._backup is not None and settings.BACKUP_INTERVAL_HOURS > 0:
+            # 备份在线程里分步复制，不占用事件循环，也不阻塞队列 worker 的写入
+            self._scheduler.add_job(
+                self._backup.run_backup,
+                "interval",
+                hours=settings.BACKUP_INTERVAL_HOURS,
+                id="backup",
+                replace_existing=True,
+            )
         self._scheduler.start()
         logger.info("Cleanup scheduler started")
 
     async def run_cleanup(self) -> int:
-        return await asyncio.to_thread(self._cleanup_impl)
-
-    def _cleanup_impl(self) -> int:
         threshold = datetime.utcnow() - timedelta(days=settings.CLEANUP_RETENTION_DAYS)
-        session: Session = self._session_factory()
-        deleted = 0
+        images, job_ids = await run_in_session(
+            lambda session: self._delete_expired(session, threshold),
+            session_factory=self._session_factory,
+            async_session_factory=self._async_session_factory,
+        )
+        # 数据库事务提交后再删文件，删除期间不占用写连接
+        await asyncio.to_thread(self._delete_files, images, job_ids)
+        return len(images)
+
+    async def run_optimize(self) -> None:
+        """Refresh SQLite planner statistics (``PRAGMA optimize``)."""
+
         try:
-            translations = (
-                session.query(Translation)
-                .filter(Translation.created_at < threshold)
-                .all()
-            )
-            for translation in translations:
-                self._storage.delete_image_files(translation.job_id, translation.image_uuid)
-                session.delete(translation)
-                deleted += 1
-
-            session.commit()
-
-            empty_jobs = session.query(Job).filter(~Job.translations.any()).all()
-            for job in empty_jobs:
-                session.delete(job)
-                self._storage.delete_job_files(job.id)
-            session.commit()
-            return deleted
-        finally:
-            session.close()
+            if await optimize_database():
+                logger.info("PRAGMA optimize completed")
+        except Exception:  # pragma: no cover - defensive logging
+            logger.warning("PRAGMA optimize failed", exc_info=True)
+
+    @staticmethod
+    def _delete_expired(session: Session, threshold: datetime) -> Tuple[List[Tuple[str, str]], List[str]]:
+        translations = session.query(Translation).filter(Translation.created_at < threshold).all()
+        images = [(translation.job_id, translation.image_uuid) for translation in translations]
+        for translation in translations:
+            session.delete(translation)
+        session.flush()
+
+        empty_jobs = session.query(Job).filter(~Job.translations.any()).all()
+        job_ids = [job.id for job in empty_jobs]
+        for job in empty_jobs:
+            session.delete(job)
+        session.commit()
+        return images, job_ids
+
+    def _delete_files(self, images: List[Tuple[str, str]], job_ids: List[str]) -> None:
+        for job_id, image_uuid in images:
+            self._storage.delete_image_files(job_id, image_uuid)
+        for job_id in job_ids:
+            self._storage.delete_job_files(job_id)
 
     def shutdown(self) -> None:
         if self._scheduler:
@@ -85,7 +120,7 @@ class CleanupService:
             self._scheduler = None
 
 
-cleanup_service = CleanupService()
+cleanup_service = CleanupService(async_session_factory=AsyncSessionLocal, backup_service=default_backup_service)
 
 
 __all__ = ["CleanupService", "cleanup_service"]
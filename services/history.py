@@ -2,31 +2,279 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Callable, List, Optional, Tuple
+import asyncio
+import base64
+import binascii
+import json
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypeVar
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, event, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
-from core.database import SessionLocal
-from core.exceptions import NotFoundError
-from models import Job, Translation
+from core.config import settings
+from core.database import SessionLocal, run_in_session
+from core.exceptions import NotFoundError, ValidationError
+from models import Job, Translation, TranslationEditorData
 from services.storage import StorageService
+from utils.compression import decompress_text
+
+
+HistoryKey = Tuple[datetime, str]
+T = TypeVar("T")
+
+# 历史列表与详情序列化所需的列；刻意不含 editor_data 等大字段
+HISTORY_COLUMNS = (
+    Translation.id,
+    Translation.job_id,
+    Translation.image_uuid,
+    Translation.source_lang,
+    Translation.target_lang,
+    Translation.field,
+    Translation.status,
+    Translation.created_at,
+    Translation.original_path,
+    Translation.mask_path,
+    Translation.result_path,
+)
+EDITOR_COLUMNS = (
+    Translation.id,
+    Translation.source_lang,
+    Translation.target_lang,
+    Translation.inpainting_url,
+    Translation.original_path,
+    Translation.result_path,
+)
+CursorDirection = Literal["next", "prev"]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # SQLite 中的时间以无时区 UTC 存储，游标比较前统一成同样的形式
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(key: HistoryKey, direction: CursorDirection = "next") -> str:
+    """Opaque cursor pointing just past ``key`` in ``direction``."""
+
+    created_at, record_id = key
+    payload = {"t": _naive_utc(created_at).isoformat(), "id": record_id, "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[HistoryKey, CursorDirection]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        created_at = _naive_utc(datetime.fromisoformat(payload["t"]))
+        record_id = str(payload["id"])
+        direction = payload.get("d", "next")
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValidationError("无效的分页游标") from None
+    if direction not in ("next", "prev"):
+        raise ValidationError("无效的分页游标")
+    return (created_at, record_id), direction
+
+
+def _history_filters(
+    source_lang: Optional[str],
+    target_lang: Optional[str],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+) -> List:
+    conditions = []
+    if source_lang:
+        conditions.append(Translation.source_lang == source_lang)
+    if target_lang:
+        conditions.append(Translation.target_lang == target_lang)
+    if date_from:
+        conditions.append(Translation.created_at >= date_from)
+    if date_to:
+        conditions.append(Translation.created_at <= date_to)
+    return conditions
+
+
+HistoryFilterKey = Tuple[Optional[str], Optional[str], Optional[datetime], Optional[datetime]]
+
+
+class HistoryCountCache:
+    """TTL cache of ``COUNT(*)`` per history filter combination.
+
+    Entries are dropped as soon as a transaction that inserted or deleted a
+    matching translation through the ORM commits (see the listeners below), so
+    within one process the cached value stays exact; the TTL bounds drift
+    caused by writes from other processes or Core bulk statements.
+    """
+
+    def __init__(self, *, ttl: float | None = None) -> None:
+        self._ttl = settings.HISTORY_COUNT_TTL if ttl is None else ttl
+        self._entries: Dict[HistoryFilterKey, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        # 每次失效递增；计数期间若发生写入，算出的值可能已过期，不再写回缓存
+        self.generation = 0
+        _count_caches.add(self)
+
+    @staticmethod
+    def key(
+        source_lang: Optional[str],
+        target_lang: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+    ) -> HistoryFilterKey:
+        return (
+            source_lang or None,
+            target_lang or None,
+            _naive_utc(date_from) if date_from else None,
+            _naive_utc(date_to) if date_to else None,
+        )
+
+    def get(self, key: HistoryFilterKey) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] > self._ttl:
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def set(self, key: HistoryFilterKey, value: int, *, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic())
+
+    def invalidate_row(self, source_lang: str, target_lang: str, created_at: Optional[datetime]) -> None:
+        """Drop every cached count whose filters match a row with these values."""
+
+        created = _naive_utc(created_at) if created_at else None
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._entries if _key_matches(key, source_lang, target_lang, created)]:
+                del self._entries[key]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+def _key_matches(key: HistoryFilterKey, source_lang: str, target_lang: str, created_at: Optional[datetime]) -> bool:
+    key_source, key_target, date_from, date_to = key
+    if key_source and key_source != source_lang:
+        return False
+    if key_target and key_target != target_lang:
+        return False
+    if created_at is None:
+        return True
+    if date_from and created_at < date_from:
+        return False
+    if date_to and created_at > date_to:
+        return False
+    return True
+
+
+_count_caches: "weakref.WeakSet[HistoryCountCache]" = weakref.WeakSet()
+
+
+def invalidate_history_counts(
+    source_lang: Optional[str] = None,
+    target_lang: Optional[str] = None,
+    created_at: Optional[datetime] = None,
+) -> None:
+    """Invalidate cached counts after writes that bypass ORM events (Core bulk insert/delete)."""
+
+    for cache in list(_count_caches):
+        if source_lang is None or target_lang is None:
+            cache.invalidate()
+        else:
+            cache.invalidate_row(source_lang, target_lang, created_at)
+
+
+_PENDING_INVALIDATIONS = "history_count_invalidations"
+
+
+@event.listens_for(Translation, "after_insert")
+@event.listens_for(Translation, "after_delete")
+def _translation_written(mapper, connection, target: Translation) -> None:
+    # flush 时写入尚未提交：此时失效的话，其他连接（只读池）在提交前开始的计数会读到新的
+    # generation 却数到旧行，把过期总数缓存一整个 TTL。先记下，等事务提交后再失效
+    key = (target.source_lang, target.target_lang, target.created_at)
+    session = object_session(target)
+    if session is None:
+        invalidate_history_counts(*key)
+        return
+    session.info.setdefault(_PENDING_INVALIDATIONS, []).append(key)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_counts(session: Session) -> None:
+    for key in session.info.pop(_PENDING_INVALIDATIONS, []):
+        invalidate_history_counts(*key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+history_count_cache = HistoryCountCache()
 
 
 class HistoryService:
-    """Provides paginated access to translation history."""
+    """Provides paginated access to translation history.
+
+    Each query is written once against a sync ``Session``; the plain methods
+    run it on ``session_factory`` and the ``*_async`` variants run it through
+    ``run_in_session`` so request handlers never block the event loop.
+    """
 
     def __init__(
         self,
         session_factory: Callable[[], Session] = SessionLocal,
         storage_service: Optional[StorageService] = None,
+        count_cache: Optional[HistoryCountCache] = None,
+        async_session_factory: Optional[Callable[[], AsyncSession]] = None,
+        read_session_factory: Optional[Callable[[], Session]] = None,
+        async_read_session_factory: Optional[Callable[[], AsyncSession]] = None,
     ) -> None:
         self._session_factory = session_factory
+        self._async_session_factory = async_session_factory
+        self._read_session_factory = read_session_factory or session_factory
+        self._async_read_session_factory = async_read_session_factory or async_session_factory
         self._storage = storage_service or StorageService()
+        self._count_cache = count_cache or history_count_cache
+
+    def _run(self, fn: Callable[..., T], /, *, read: bool = False, **kwargs: Any) -> T:
+        factory = self._read_session_factory if read else self._session_factory
+        with factory() as session:
+            return fn(session, **kwargs)
+
+    async def _run_async(self, fn: Callable[..., T], /, *, read: bool = False, **kwargs: Any) -> T:
+        return await run_in_session(
+            partial(fn, **kwargs),
+            session_factory=self._read_session_factory if read else self._session_factory,
+            async_session_factory=self._async_read_session_factory if read else self._async_session_factory,
+        )
 
-    def list_history(
+    def list_history(self, **kwargs: Any) -> Tuple[List[Row], int]:
+        """Return one OFFSET page of ``HISTORY_COLUMNS`` rows plus the filtered total."""
+
+        return self._run(self._list_history, read=True, **kwargs)
+
+    async def list_history_async(self, **kwargs: Any) -> Tuple[List[Row], int]:
+        return await self._run_async(self._list_history, read=True, **kwargs)
+
+    def _list_history(
         self,
+        session: Session,
         *,
         page: int = 1,
         limit: int = 20,
@@ -34,67 +282,190 @@ class HistoryService:
         target_lang: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
-    ) -> Tuple[List[Translation], int]:
-        session = self._session_factory()
-        try:
-            query = session.query(Translation).order_by(Translation.created_at.desc())
-
-            if source_lang:
-                query = query.filter(Translation.source_lang == source_lang)
-            if target_lang:
-                query = query.filter(Translation.target_lang == target_lang)
-            if date_from:
-                query = query.filter(Translation.created_at >= date_from)
-            if date_to:
-                query = query.filter(Translation.created_at <= date_to)
-
-            total = query.count()
-            items = (
-                query.offset(max(page - 1, 0) * limit)
-                .limit(limit)
-                .all()
-            )
-
-            for translation in items:
-                session.expunge(translation)
-
-            return items, total
-        finally:
-            session.close()
-
-    def get_translation(self, translation_id: str) -> Translation:
-        with self._session_factory() as session:
-            translation = session.get(Translation, translation_id)
-            if not translation:
-                raise NotFoundError("记录不存在")
-            session.expunge(translation)
-            return translation
+        exact: bool = True,
+    ) -> Tuple[List[Row], int]:
+        conditions = _history_filters(source_lang, target_lang, date_from, date_to)
+        key = HistoryCountCache.key(source_lang, target_lang, date_from, date_to)
+        total = self._count(session, conditions, key, exact=exact)
+        items = session.execute(
+            select(*HISTORY_COLUMNS)
+            .where(*conditions)
+            .order_by(Translation.created_at.desc(), Translation.id.desc())
+            .offset(max(page - 1, 0) * limit)
+            .limit(limit)
+        ).all()
+        return list(items), total
+
+    def list_history_keyset(self, **kwargs: Any) -> Tuple[List[Row], bool]:
+        """Return up to ``limit`` rows older than ``after`` (or newer than ``before``), newest first.
+
+        The second element tells whether more rows exist further in that
+        direction. Each page is an index range seek on (created_at, id), so
+        its cost does not grow with how deep the caller has paged.
+        """
+
+        return self._run(self._list_history_keyset, read=True, **kwargs)
+
+    async def list_history_keyset_async(self, **kwargs: Any) -> Tuple[List[Row], bool]:
+        return await self._run_async(self._list_history_keyset, read=True, **kwargs)
+
+    def _list_history_keyset(
+        self,
+        session: Session,
+        *,
+        limit: int = 20,
+        after: Optional[HistoryKey] = None,
+        before: Optional[HistoryKey] = None,
+        source_lang: Optional[str] = None,
+        target_lang: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Tuple[List[Row], bool]:
+        conditions = _history_filters(source_lang, target_lang, date_from, date_to)
+        sort_key = tuple_(Translation.created_at, Translation.id)
+        if before is not None:
+            conditions.append(sort_key > tuple_(_naive_utc(before[0]), before[1]))
+            order = (Translation.created_at.asc(), Translation.id.asc())
+        else:
+            if after is not None:
+                conditions.append(sort_key < tuple_(_naive_utc(after[0]), after[1]))
+            order = (Translation.created_at.desc(), Translation.id.desc())
+
+        rows = session.execute(select(*HISTORY_COLUMNS).where(*conditions).order_by(*order).limit(limit + 1)).all()
+        has_more = len(rows) > limit
+        items = list(rows[:limit])
+        if before is not None:
+            items.reverse()
+        return items, has_more
+
+    def count_history(self, **kwargs: Any) -> int:
+        """Row count for the filters; ``exact=False`` may answer from the count cache."""
+
+        return self._run(self._count_history, read=True, **kwargs)
+
+    async def count_history_async(self, **kwargs: Any) -> int:
+        cached = self._cached_count(**kwargs)
+        if cached is not None:
+            return cached
+        return await self._run_async(self._count_history, read=True, **kwargs)
+
+    def _cached_count(
+        self,
+        *,
+        source_lang: Optional[str] = None,
+        target_lang: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        exact: bool = True,
+    ) -> Optional[int]:
+        if exact:
+            return None
+        return self._count_cache.get(HistoryCountCache.key(source_lang, target_lang, date_from, date_to))
+
+    def _count_history(
+        self,
+        session: Session,
+        *,
+        source_lang: Optional[str] = None,
+        target_lang: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        exact: bool = True,
+    ) -> int:
+        conditions = _history_filters(source_lang, target_lang, date_from, date_to)
+        key = HistoryCountCache.key(source_lang, target_lang, date_from, date_to)
+        return self._count(session, conditions, key, exact=exact)
+
+    def _count(self, session: Session, conditions: List, key: HistoryFilterKey, *, exact: bool) -> int:
+        if not exact:
+            cached = self._count_cache.get(key)
+            if cached is not None:
+                return cached
+        generation = self._count_cache.generation
+        # 计数不带 ORDER BY，直接走覆盖索引
+        total = session.scalar(select(func.count()).select_from(Translation).where(*conditions)) or 0
+        self._count_cache.set(key, total, generation=generation)
+        return total
+
+    def get_translation(self, translation_id: str) -> Row:
+        return self._run(self._get_translation, read=True, translation_id=translation_id)
+
+    async def get_translation_async(self, translation_id: str) -> Row:
+        return await self._run_async(self._get_translation, read=True, translation_id=translation_id)
+
+    @staticmethod
+    def _get_translation(session: Session, *, translation_id: str) -> Row:
+        row = session.execute(select(*HISTORY_COLUMNS).where(Translation.id == translation_id)).first()
+        if row is None:
+            raise NotFoundError("记录不存在")
+        return row
+
+    def get_editor_data(self, translation_id: str) -> Dict[str, Any]:
+        """Editor payload fields, the only read path that loads and decompresses the template."""
+
+        return self._run(self._get_editor_data, read=True, translation_id=translation_id)
+
+    async def get_editor_data_async(self, translation_id: str) -> Dict[str, Any]:
+        return await self._run_async(self._get_editor_data, read=True, translation_id=translation_id)
+
+    @staticmethod
+    def _get_editor_data(session: Session, *, translation_id: str) -> Dict[str, Any]:
+        row = session.execute(
+            select(*EDITOR_COLUMNS, TranslationEditorData.codec, TranslationEditorData.data)
+            .outerjoin(TranslationEditorData)
+            .where(Translation.id == translation_id)
+        ).first()
+        if row is None:
+            raise NotFoundError("记录不存在")
+        payload = dict(row._mapping)
+        codec, data = payload.pop("codec"), payload.pop("data")
+        payload["editor_data"] = decompress_text(codec, data) if data is not None else None
+        return payload
 
     def delete_translation(self, translation_id: str) -> None:
-        session = self._session_factory()
-        try:
-            translation = session.get(Translation, translation_id)
-            if not translation:
-                raise NotFoundError("记录不存在")
+        job_id, image_uuid, orphaned = self._run(self._delete_translation, translation_id=translation_id)
+        self._delete_files(job_id, image_uuid, orphaned)
+
+    async def delete_translation_async(self, translation_id: str) -> None:
+        job_id, image_uuid, orphaned = await self._run_async(self._delete_translation, translation_id=translation_id)
+        # 只有文件删除仍是阻塞 IO，单独放到线程池
+        await asyncio.to_thread(self._delete_files, job_id, image_uuid, orphaned)
+
+    @staticmethod
+    def _delete_translation(session: Session, *, translation_id: str) -> Tuple[str, str, bool]:
+        """Delete the row (and its job when it was the last one); returns (job_id, image_uuid, job_deleted)."""
 
-            job_id = translation.job_id
-            image_uuid = translation.image_uuid
-            session.delete(translation)
-            session.commit()
+        translation = session.get(Translation, translation_id)
+        if not translation:
+            raise NotFoundError("记录不存在")
 
-            self._storage.delete_image_files(job_id, image_uuid)
+        job_id = translation.job_id
+        image_uuid = translation.image_uuid
+        session.delete(translation)
+        session.flush()
 
-            self._cleanup_orphaned_job(job_id)
-        finally:
-            session.close()
+        job = session.get(Job, job_id)
+        orphaned = job is not None and not job.translations
+        if orphaned:
+            session.delete(job)
+        session.commit()
+        return job_id, image_uuid, orphaned
 
-    def _cleanup_orphaned_job(self, job_id: str) -> None:
-        with self._session_factory() as session:
-            job = session.get(Job, job_id)
-            if job and not job.translations:
-                session.delete(job)
-                session.commit()
-                self._storage.delete_job_files(job_id)
+    def _delete_files(self, job_id: str, image_uuid: str, orphaned: bool) -> None:
+        self._storage.delete_image_files(job_id, image_uuid)
+        if orphaned:
+            self._storage.delete_job_files(job_id)
 
 
-__all__ = ["HistoryService"]
+__all__ = [
+    "CursorDirection",
+    "EDITOR_COLUMNS",
+    "HISTORY_COLUMNS",
+    "HistoryCountCache",
+    "HistoryKey",
+    "HistoryService",
+    "decode_cursor",
+    "encode_cursor",
+    "history_count_cache",
+    "invalidate_history_counts",
+]
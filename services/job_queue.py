@@ -1,31 +1,76 @@
-"""SQLite-backed job queue and worker service."""
+"""Database-backed job queue and worker service."""
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Callable, List, Sequence
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
 
 from fastapi import UploadFile
-from sqlalchemy import text
+from sqlalchemy import insert, text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.config import settings
-from core.database import SessionLocal
+from core.database import SessionLocal, engine, run_in_session
 from core.exceptions import ValidationError
+from core.metrics import QUEUE_DEPTH, observe_stage, time_stage
+from core.tracing import current_span, start_span
 from models import Job, JobStatus, Translation, TranslationStatus
+from services.history import invalidate_history_counts
+from services.queue_notify import QueueWakeup
 from services.sse_manager import SSEEvent, SSEManager
 from services.storage import StorageService
 from services.translator import TranslateParams, TranslatorService
+from services.write_behind import WriteBehindBuffer
 from utils.image import validate_image
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# SQLite 只有一个写者，UPDATE ... RETURNING 本身就是原子认领；
+# PostgreSQL 上多个进程并发认领，用 SKIP LOCKED 让每个 worker 跳过别人已锁定的行
+_CLAIM_SQL = {
+    "sqlite": """
+        UPDATE translations
+        SET status = :processing,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = (
+            SELECT id FROM translations
+            WHERE status = :pending
+            ORDER BY created_at ASC
+            LIMIT 1
+        )
+        RETURNING id
+    """,
+    "postgresql": """
+        UPDATE translations
+        SET status = :processing,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = (
+            SELECT id FROM translations
+            WHERE status = :pending
+            ORDER BY created_at ASC
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id
+    """,
+}
+
+
+def claim_statement(dialect_name: str):
+    """Single-row claim for ``dialect_name`` (unknown dialects use the portable form)."""
+
+    return text(_CLAIM_SQL.get(dialect_name, _CLAIM_SQL["sqlite"]))
+
 
 @dataclass
 class JobCreateResult:
@@ -34,6 +79,25 @@ class JobCreateResult:
     images_count: int
 
 
+@dataclass
+class JobProgress:
+    completed: int
+    failed: int
+    remaining: int
+    translations: list
+    finished_now: bool = False
+
+    def take_completion(self) -> bool:
+        """True exactly once for the update that moved the job to a final state.
+
+        Progress updates of one job are coalesced, so several workers may
+        await the same result; only the first of them announces completion.
+        """
+
+        finished, self.finished_now = self.finished_now, False
+        return finished
+
+
 class JobQueueService:
     """Manage job creation and background translation workers."""
 
@@ -44,16 +108,30 @@ class JobQueueService:
         storage_service: StorageService,
         translator_factory: Callable[[], TranslatorService],
         sse_manager: SSEManager | None = None,
-        poll_interval: float = 0.5,
+        poll_interval: float | None = None,
+        workers: int | None = None,
+        wakeup: QueueWakeup | None = None,
+        async_session_factory: Optional[Callable[[], AsyncSession]] = None,
+        read_session_factory: Optional[Callable[[], Session]] = None,
+        async_read_session_factory: Optional[Callable[[], AsyncSession]] = None,
+        write_buffer: WriteBehindBuffer | None = None,
     ) -> None:
         self._session_factory = session_factory
+        self._async_session_factory = async_session_factory
+        self._read_session_factory = read_session_factory or session_factory
+        self._async_read_session_factory = async_read_session_factory or async_session_factory
+        self._writes = write_buffer or WriteBehindBuffer(session_factory, async_session_factory=async_session_factory)
         self._storage = storage_service
         self._translator_factory = translator_factory
         self._sse = sse_manager or SSEManager()
-        self._poll_interval = poll_interval
-        self._worker_task: asyncio.Task | None = None
+        self._poll_interval = poll_interval if poll_interval is not None else settings.QUEUE_POLL_INTERVAL
+        self._workers = workers or settings.QUEUE_WORKERS
+        self._wakeup = wakeup or QueueWakeup(engine, channel=settings.QUEUE_NOTIFY_CHANNEL)
+        self._wakeup.on_message(self._relay_event)
+        self._relay_tasks: set[asyncio.Task] = set()
+        self._worker_tasks: list[asyncio.Task] = []
         self._worker_lock = asyncio.Lock()
-        self._executor = ThreadPoolExecutor(max_workers=settings.THREAD_POOL_MAX_WORKERS)
+        QUEUE_DEPTH.set_function(self.pending_count)
 
     async def create_job(
         self,
@@ -72,20 +150,22 @@ class JobQueueService:
             raise ValidationError("Mask 数量需要与图片数量一致")
 
         job_id = str(uuid.uuid4())
-        session = self._session_factory()
+        rows: List[dict] = []
         try:
-            job = Job(id=job_id, status=JobStatus.PENDING, images_count=len(files))
-            session.add(job)
-            session.flush()
-
+            # 第一阶段：读取、校验、落盘所有文件，不碰数据库
             for index, file in enumerate(files):
-                content = await file.read()
-                is_valid, message = validate_image(content, file.content_type or "")
+                with time_stage("upload_read"):
+                    content = await file.read()
+                with time_stage("validate"):
+                    is_valid, message = await asyncio.to_thread(validate_image, content, file.content_type or "")
                 if not is_valid:
                     raise ValidationError(message)
 
                 image_uuid = str(uuid.uuid4())
-                original_path = self._storage.save_original(job_id, image_uuid, content, filename=file.filename)
+                with time_stage("store"):
+                    original_path = await asyncio.to_thread(
+                        self._storage.save_original, job_id, image_uuid, content, filename=file.filename
+                    )
 
                 mask_path = None
                 if mask_list:
@@ -93,115 +173,159 @@ class JobQueueService:
                     if mask_file:
                         mask_bytes = await mask_file.read()
                         if mask_bytes:
-                            mask_path = self._storage.save_mask(
+                            mask_path = await asyncio.to_thread(
+                                self._storage.save_mask,
                                 job_id,
                                 image_uuid,
                                 mask_bytes,
                                 mask_file.content_type or "image/png",
                             )
 
-                translation = Translation(
-                    job_id=job_id,
-                    image_uuid=image_uuid,
-                    order_index=index,
-                    original_path=original_path,
-                    mask_path=mask_path,
-                    source_lang=params.source_lang,
-                    target_lang=params.target_lang,
-                    field=params.field,
-                    enable_postprocess=params.enable_postprocess,
-                    protect_product=params.protect_product,
-                    status=TranslationStatus.PENDING,
+                rows.append(
+                    {
+                        "job_id": job_id,
+                        "image_uuid": image_uuid,
+                        "order_index": index,
+                        "original_path": original_path,
+                        "mask_path": mask_path,
+                        "source_lang": params.source_lang,
+                        "target_lang": params.target_lang,
+                        "field": params.field,
+                        "enable_postprocess": params.enable_postprocess,
+                        "protect_product": params.protect_product,
+                        "status": TranslationStatus.PENDING,
+                    }
                 )
-                session.add(translation)
 
-            session.commit()
+            # 第二阶段：一个短事务里批量插入任务与全部翻译记录，写锁只持有几毫秒
+            with time_stage("db_insert"):
+                await self._db(self._insert_job, job_id, rows)
         except Exception:
-            session.rollback()
             self._storage.delete_job_files(job_id)
             raise
-        finally:
-            session.close()
 
+        # 批量 INSERT 不触发 ORM 事件，手动让历史计数缓存失效
+        invalidate_history_counts(params.source_lang, params.target_lang)
+        self._wakeup.wake()
         await self._ensure_worker()
         return JobCreateResult(job_id=job_id, status=JobStatus.PENDING, images_count=len(files))
 
+    async def _db(self, fn: Callable[..., T], /, *args: Any, read: bool = False) -> T:
+        """Run ``fn(session, *args)`` on the async engine (or a worker thread without one)."""
+
+        return await run_in_session(
+            lambda session: fn(session, *args),
+            session_factory=self._read_session_factory if read else self._session_factory,
+            async_session_factory=self._async_read_session_factory if read else self._async_session_factory,
+        )
+
+    def _insert_job(self, session: Session, job_id: str, rows: List[dict]) -> None:
+        session.execute(insert(Job).values(id=job_id, status=JobStatus.PENDING, images_count=len(rows)))
+        # executemany：所有图片一条 INSERT 语句
+        session.execute(insert(Translation), rows)
+        self._wakeup.notify_in(session)
+        session.commit()
+
+    def pending_count(self) -> int:
+        with self._read_session_factory() as session:
+            return session.query(Translation.id).filter(Translation.status == TranslationStatus.PENDING).count()
+
     def job_exists(self, job_id: str) -> bool:
-        with self._session_factory() as session:
-            return session.query(Job.id).filter(Job.id == job_id).first() is not None
+        with self._read_session_factory() as session:
+            return self._job_exists(session, job_id)
+
+    async def job_exists_async(self, job_id: str) -> bool:
+        return await self._db(self._job_exists, job_id, read=True)
+
+    @staticmethod
+    def _job_exists(session: Session, job_id: str) -> bool:
+        return session.query(Job.id).filter(Job.id == job_id).first() is not None
+
+    async def start(self) -> None:
+        """Start this process's workers so queued work is consumed without waiting for a new job."""
+
+        await self._ensure_worker()
 
     async def _ensure_worker(self) -> None:
-        if self._worker_task and not self._worker_task.done():
+        if self._workers_alive():
             return
         async with self._worker_lock:
-            if self._worker_task and not self._worker_task.done():
+            if self._workers_alive():
                 return
-            logger.info("Starting background translation worker")
+            self._wakeup.start()
             loop = asyncio.get_running_loop()
-            self._worker_task = loop.create_task(self._worker_loop())
+            self._worker_tasks = [task for task in self._worker_tasks if not task.done()]
+            missing = self._workers - len(self._worker_tasks)
+            logger.info("Starting %d background translation worker(s)", missing)
+            for index in range(len(self._worker_tasks), self._workers):
+                self._worker_tasks.append(loop.create_task(self._worker_loop(index)))
 
-    async def _worker_loop(self) -> None:
-        logger.info("Worker loop started")
+    def _workers_alive(self) -> bool:
+        return len(self._worker_tasks) == self._workers and all(not task.done() for task in self._worker_tasks)
+
+    async def _worker_loop(self, index: int = 0) -> None:
+        logger.info("Worker loop %d started", index)
         while True:
             try:
-                translation = await asyncio.to_thread(self._pull_pending_translation)
+                translation = await self._pull_pending_translation()
             except Exception as exc:  # pragma: no cover - defensive logging
                 logger.exception("Failed to pull pending translation: %s", exc)
                 await asyncio.sleep(self._poll_interval)
                 continue
 
             if translation is None:
-                await asyncio.sleep(self._poll_interval)
+                await self._wakeup.wait(self._poll_interval)
                 continue
 
             logger.info("Processing translation: %s", translation.id)
+            attributes = {
+                "translation_id": translation.id,
+                "job_id": translation.job_id,
+                "queue_wait_ms": round(self._seconds_since(translation.created_at) * 1000, 1),
+            }
             try:
-                await self._process_translation(translation)
+                with start_span("job.process_translation", attributes):
+                    await self._process_translation(translation)
                 logger.info("Translation completed: %s", translation.id)
             except Exception as exc:  # pragma: no cover - defensive logging
                 logger.exception("Translation worker error: job=%s translation=%s", translation.job_id, translation.id)
                 await asyncio.sleep(self._poll_interval)
 
-    def _pull_pending_translation(self) -> Translation | None:
-        session = self._session_factory()
-        try:
-            with session.begin():
-                result = session.execute(
-                    text(
-                        """
-                        UPDATE translations
-                        SET status = :processing,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = (
-                            SELECT id FROM translations
-                            WHERE status = :pending
-                            ORDER BY created_at ASC
-                            LIMIT 1
-                        )
-                        RETURNING id
-                        """
-                    ),
-                    {
-                        "processing": TranslationStatus.PROCESSING.name,
-                        "pending": TranslationStatus.PENDING.name,
-                    },
-                ).mappings().first()
-
-                if not result:
-                    return None
-
-                translation = session.get(Translation, result["id"])
-                if translation is None:
-                    return None
-                session.expunge(translation)
-
-            self._mark_job_processing(translation.job_id)
-            return translation
-        finally:
-            session.close()
+    async def _pull_pending_translation(self) -> Translation | None:
+        translation = await self._db(self._claim_pending)
+        if translation is None:
+            return None
+        observe_stage("queue_wait", self._seconds_since(translation.created_at))
+        return translation
+
+    @staticmethod
+    def _claim_pending(session: Session) -> Translation | None:
+        """Claim the oldest pending translation and mark its job processing in one commit."""
+
+        with session.begin():
+            result = session.execute(
+                claim_statement(session.get_bind().dialect.name),
+                {
+                    "processing": TranslationStatus.PROCESSING.name,
+                    "pending": TranslationStatus.PENDING.name,
+                },
+            ).mappings().first()
+
+            if not result:
+                return None
+
+            translation = session.get(Translation, result["id"])
+            if translation is None:
+                return None
+            job = session.get(Job, translation.job_id)
+            if job is not None and job.status == JobStatus.PENDING:
+                job.mark_processing()
+                job.updated_at = datetime.utcnow()
+            session.expunge(translation)
+        return translation
 
     async def _process_translation(self, translation: Translation) -> None:
-        await self._sse.publish(
+        await self._publish(
             translation.job_id,
             SSEEvent(
                 event="progress",
@@ -209,35 +333,38 @@ class JobQueueService:
             ),
         )
 
+        progress: asyncio.Future[JobProgress] | None = None
         try:
             original_bytes = await asyncio.to_thread(self._storage.get_file, translation.original_path)
             translator = self._translator_factory()
-            loop = asyncio.get_running_loop()
-            result = await loop.run_in_executor(
-                self._executor,
-                lambda: translator.translate(
-                    original_bytes,
-                    translation.source_lang,
-                    translation.target_lang,
-                    translation.field,
-                    translation.enable_postprocess,
-                    protect_product=translation.protect_product,
-                ),
+            result = await translator.translate_async(
+                original_bytes,
+                translation.source_lang,
+                translation.target_lang,
+                translation.field,
+                translation.enable_postprocess,
+                protect_product=translation.protect_product,
             )
-            result_path = await asyncio.to_thread(
-                self._storage.save_result,
+            with time_stage("result_save"):
+                result_path = await asyncio.to_thread(
+                    self._storage.save_result,
+                    translation.job_id,
+                    translation.image_uuid,
+                    result.image_bytes,
+                )
+            written, progress = self._record_outcome(
                 translation.job_id,
-                translation.image_uuid,
-                result.image_bytes,
-            )
-            await asyncio.to_thread(
-                self._mark_translation_done,
-                translation.id,
-                result_path,
-                result.editor_data,
-                result.inpainting_url,
+                partial(
+                    self._mark_translation_done,
+                    translation_id=translation.id,
+                    result_path=result_path,
+                    editor_data=result.editor_data,
+                    inpainting_url=result.inpainting_url,
+                ),
             )
-            await self._sse.publish(
+            # 写入提交后再推送 SSE，客户端收到 done 时记录一定已经落库
+            await written
+            await self._publish(
                 translation.job_id,
                 SSEEvent(
                     event="progress",
@@ -250,8 +377,13 @@ class JobQueueService:
                 ),
             )
         except Exception as exc:  # pragma: no cover - translator/storage failure
-            await asyncio.to_thread(self._mark_translation_failed, translation.id, str(exc))
-            await self._sse.publish(
+            current_span().set_error(exc)
+            written, progress = self._record_outcome(
+                translation.job_id,
+                partial(self._mark_translation_failed, translation_id=translation.id, message=str(exc)),
+            )
+            await written
+            await self._publish(
                 translation.job_id,
                 SSEEvent(
                     event="error",
@@ -263,105 +395,152 @@ class JobQueueService:
                 ),
             )
         finally:
-            await self._maybe_emit_completion(translation.job_id)
+            await self._maybe_emit_completion(translation.job_id, progress)
 
+    async def _publish(self, job_id: str, event: SSEEvent) -> None:
+        """Push a job event to its SSE subscribers, whichever instance they are connected to.
+
+        On PostgreSQL the event goes out over NOTIFY and every instance's
+        listener, this one included, fans it out locally; the local publish
+        only covers a listener that is down or a payload too large to relay.
+        """
+
+        if self._wakeup.cross_process:
+            payload = json.dumps({"job_id": job_id, "event": event.event, "data": event.data}, ensure_ascii=False)
+            try:
+                await asyncio.to_thread(self._wakeup.broadcast, payload)
+            except (ValueError, SQLAlchemyError) as exc:
+                logger.warning("任务 %s 的 %s 事件无法跨实例广播，只推送给本实例订阅者: %s", job_id, event.event, exc)
+            else:
+                if self._wakeup.listening:
+                    return
+        await self._sse.publish(job_id, event)
+
+    def _relay_event(self, payload: str) -> None:
+        """Publish an event broadcast by any instance to this instance's subscribers."""
+
+        try:
+            message = json.loads(payload)
+            job_id, event = message["job_id"], SSEEvent(event=message["event"], data=message["data"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("忽略无法解析的任务事件广播: %.200s", payload)
+            return
+        task = asyncio.get_running_loop().create_task(self._sse.publish(job_id, event))
+        self._relay_tasks.add(task)
+        task.add_done_callback(self._relay_tasks.discard)
+
+    def _record_outcome(
+        self, job_id: str, status_op: Callable[[Session], None]
+    ) -> tuple[asyncio.Future[None], asyncio.Future[JobProgress]]:
+        """Queue a status write plus the job's progress refresh into the same write-behind batch."""
+
+        return self._writes.enqueue(status_op), self._enqueue_progress(job_id)
+
+    def _enqueue_progress(self, job_id: str) -> asyncio.Future[JobProgress]:
+        # 同一批次内同一任务的进度只统计一次，放在该批所有状态写入之后
+        return self._writes.enqueue(partial(self._update_job_progress, job_id=job_id), key=("job_progress", job_id))
+
+    @staticmethod
+    def _seconds_since(created_at: datetime | None) -> float:
+        if created_at is None:
+            return 0.0
+        if created_at.tzinfo is None:
+            return max((datetime.utcnow() - created_at).total_seconds(), 0.0)
+        return max((datetime.now(timezone.utc) - created_at).total_seconds(), 0.0)
+
+    @staticmethod
     def _mark_translation_done(
-        self,
+        session: Session,
         translation_id: str,
         result_path: str,
         editor_data: str | None = None,
         inpainting_url: str | None = None,
     ) -> None:
-        with self._session_factory() as session:
-            db_translation = session.get(Translation, translation_id)
-            if not db_translation:
-                return
-            db_translation.result_path = result_path
-            db_translation.editor_data = editor_data
-            db_translation.inpainting_url = inpainting_url
-            db_translation.status = TranslationStatus.DONE
-            db_translation.error_message = None
-            db_translation.updated_at = datetime.utcnow()
-            session.commit()
-
-    def _mark_translation_failed(self, translation_id: str, message: str) -> None:
-        with self._session_factory() as session:
-            db_translation = session.get(Translation, translation_id)
-            if not db_translation:
-                return
-            db_translation.status = TranslationStatus.FAILED
-            db_translation.error_message = message[:500]
-            db_translation.updated_at = datetime.utcnow()
-            session.commit()
-
-    def _mark_job_processing(self, job_id: str) -> None:
-        with self._session_factory() as session:
-            job = session.get(Job, job_id)
-            if not job:
-                return
-            job.mark_processing()
-            job.updated_at = datetime.utcnow()
-            session.commit()
-
-    async def _maybe_emit_completion(self, job_id: str) -> None:
-        completed, failed, remaining, translations = await asyncio.to_thread(self._update_job_progress, job_id)
-        if remaining == 0:
-            await self._sse.publish(
+        db_translation = session.get(Translation, translation_id)
+        if not db_translation:
+            return
+        db_translation.result_path = result_path
+        db_translation.editor_data = editor_data
+        db_translation.inpainting_url = inpainting_url
+        db_translation.status = TranslationStatus.DONE
+        db_translation.error_message = None
+        db_translation.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def _mark_translation_failed(session: Session, translation_id: str, message: str) -> None:
+        db_translation = session.get(Translation, translation_id)
+        if not db_translation:
+            return
+        db_translation.status = TranslationStatus.FAILED
+        db_translation.error_message = message[:500]
+        db_translation.updated_at = datetime.utcnow()
+
+    async def _maybe_emit_completion(self, job_id: str, progress: asyncio.Future[JobProgress] | None = None) -> None:
+        result = await (progress or self._enqueue_progress(job_id))
+        if result.take_completion():
+            await self._publish(
                 job_id,
                 SSEEvent(
                     event="complete",
                     data={
                         "job_id": job_id,
-                        "completed": completed,
-                        "failed": failed,
-                        "translations": translations,
+                        "completed": result.completed,
+                        "failed": result.failed,
+                        "translations": result.translations,
                     },
                 ),
             )
 
-    def _update_job_progress(self, job_id: str) -> tuple[int, int, int, list]:
-        with self._session_factory() as session:
-            job = session.get(Job, job_id)
-            if not job:
-                return 0, 0, 0, []
-
-            total = job.images_count
-            completed = (
-                session.query(Translation)
-                .filter(Translation.job_id == job_id, Translation.status == TranslationStatus.DONE)
-                .count()
-            )
-            failed = (
+    @staticmethod
+    def _update_job_progress(session: Session, job_id: str) -> JobProgress:
+        job = session.get(Job, job_id)
+        if not job:
+            return JobProgress(0, 0, 0, [])
+
+        total = job.images_count
+        completed = (
+            session.query(Translation)
+            .filter(Translation.job_id == job_id, Translation.status == TranslationStatus.DONE)
+            .count()
+        )
+        failed = (
+            session.query(Translation)
+            .filter(Translation.job_id == job_id, Translation.status == TranslationStatus.FAILED)
+            .count()
+        )
+        job.completed_count = completed
+        job.failed_count = failed
+
+        remaining = total - completed - failed
+        was_final = job.status in (JobStatus.DONE, JobStatus.FAILED)
+        if remaining <= 0:
+            job.status = JobStatus.DONE if failed == 0 else JobStatus.FAILED
+        else:
+            job.status = JobStatus.PROCESSING
+        job.updated_at = datetime.utcnow()
+
+        translations = []
+        if remaining <= 0:
+            db_translations = (
                 session.query(Translation)
-                .filter(Translation.job_id == job_id, Translation.status == TranslationStatus.FAILED)
-                .count()
+                .filter(Translation.job_id == job_id)
+                .all()
             )
-            job.completed_count = completed
-            job.failed_count = failed
-
-            remaining = total - completed - failed
-            if remaining <= 0:
-                job.status = JobStatus.DONE if failed == 0 else JobStatus.FAILED
-            else:
-                job.status = JobStatus.PROCESSING
-            job.updated_at = datetime.utcnow()
-            session.commit()
-
-            translations = []
-            if remaining <= 0:
-                db_translations = (
-                    session.query(Translation)
-                    .filter(Translation.job_id == job_id)
-                    .all()
-                )
-                translations = [{"id": t.id, "status": t.status.value} for t in db_translations]
+            translations = [{"id": t.id, "status": t.status.value} for t in db_translations]
 
-            return completed, failed, remaining, translations
+        return JobProgress(completed, failed, remaining, translations, finished_now=remaining <= 0 and not was_final)
 
     def shutdown(self) -> None:
-        if self._worker_task:
-            self._worker_task.cancel()
-        self._executor.shutdown(wait=False)
+        for task in self._worker_tasks:
+            task.cancel()
+        self._worker_tasks = []
+        self._wakeup.close()
+
+    async def drain_writes(self) -> None:
+        """Commit status writes still queued after ``shutdown`` cancelled the workers."""
+
+        await self._writes.flush()
+        self._writes.close()
 
 
-__all__ = ["JobQueueService", "JobCreateResult"]
+__all__ = ["JobQueueService", "JobCreateResult", "JobProgress", "claim_statement"]
@@ -3,36 +3,73 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, TypeVar
 
 from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from core.database import SessionLocal
+from core.database import SessionLocal, run_in_session
 from core.exceptions import NotFoundError, VersionConflictError
 from models import TextLayer
 
 
+T = TypeVar("T")
+
 class LayerService:
     """Manages TextLayer persistence with optimistic concurrency control."""
 
-    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        async_session_factory: Optional[Callable[[], AsyncSession]] = None,
+        read_session_factory: Optional[Callable[[], Session]] = None,
+        async_read_session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> None:
         self._session_factory = session_factory
+        self._async_session_factory = async_session_factory
+        self._read_session_factory = read_session_factory or session_factory
+        self._async_read_session_factory = async_read_session_factory or async_session_factory
+
+    def _run(self, fn: Callable[..., T], /, *args: Any, read: bool = False, **kwargs: Any) -> T:
+        factory = self._read_session_factory if read else self._session_factory
+        with factory() as session:
+            return fn(session, *args, **kwargs)
+
+    async def _run_async(self, fn: Callable[..., T], /, *args: Any, read: bool = False, **kwargs: Any) -> T:
+        return await run_in_session(
+            lambda session: fn(session, *args, **kwargs),
+            session_factory=self._read_session_factory if read else self._session_factory,
+            async_session_factory=self._async_read_session_factory if read else self._async_session_factory,
+        )
 
     def list_layers(self, translation_id: str) -> List[TextLayer]:
-        with self._session_factory() as session:
-            layers = (
-                session.query(TextLayer)
-                .filter(TextLayer.translation_id == translation_id)
-                .order_by(TextLayer.created_at.asc())
-                .all()
-            )
-            for layer in layers:
-                session.expunge(layer)
-            return layers
+        return self._run(self._list_layers, translation_id, read=True)
 
-    def create_layer(
-        self,
+    async def list_layers_async(self, translation_id: str) -> List[TextLayer]:
+        return await self._run_async(self._list_layers, translation_id, read=True)
+
+    @staticmethod
+    def _list_layers(session: Session, translation_id: str) -> List[TextLayer]:
+        layers = (
+            session.query(TextLayer)
+            .filter(TextLayer.translation_id == translation_id)
+            .order_by(TextLayer.created_at.asc())
+            .all()
+        )
+        for layer in layers:
+            session.expunge(layer)
+        return layers
+
+    def create_layer(self, **kwargs: Any) -> TextLayer:
+        return self._run(self._create_layer, **kwargs)
+
+    async def create_layer_async(self, **kwargs: Any) -> TextLayer:
+        return await self._run_async(self._create_layer, **kwargs)
+
+    @staticmethod
+    def _create_layer(
+        session: Session,
         *,
         translation_id: str,
         bbox: list[float],
@@ -40,65 +77,79 @@ class LayerService:
         translated_text: str,
         style: dict[str, Any],
     ) -> TextLayer:
-        with self._session_factory() as session:
-            layer = TextLayer(
-                translation_id=translation_id,
-                bbox=bbox,
-                original_text=original_text,
-                translated_text=translated_text,
-                style=style,
-            )
-            session.add(layer)
-            session.commit()
-            session.refresh(layer)
-            session.expunge(layer)
-            return layer
-
-    def update_layer(
+        layer = TextLayer(
+            translation_id=translation_id,
+            bbox=bbox,
+            original_text=original_text,
+            translated_text=translated_text,
+            style=style,
+        )
+        session.add(layer)
+        session.commit()
+        session.refresh(layer)
+        session.expunge(layer)
+        return layer
+
+    def update_layer(self, layer_id: str, **kwargs: Any) -> TextLayer:
+        return self._run(self._update_layer, layer_id, **kwargs)
+
+    async def update_layer_async(self, layer_id: str, **kwargs: Any) -> TextLayer:
+        return await self._run_async(self._update_layer, layer_id, **kwargs)
+
+    def _update_layer(
         self,
+        session: Session,
         layer_id: str,
         *,
         translated_text: str | None,
         style_updates: dict[str, Any] | None,
         version: int,
     ) -> TextLayer:
-        with self._session_factory() as session:
-            layer = session.get(TextLayer, layer_id)
-            if not layer:
-                raise NotFoundError("图层不存在")
+        layer = session.get(TextLayer, layer_id)
+        if not layer:
+            raise NotFoundError("图层不存在")
 
-            self._ensure_version(layer, version)
+        self._ensure_version(layer, version)
 
-            if translated_text is not None:
-                layer.translated_text = translated_text
-            if style_updates:
-                layer.style = self._merge_style(layer.style or {}, style_updates)
+        if translated_text is not None:
+            layer.translated_text = translated_text
+        if style_updates:
+            layer.style = self._merge_style(layer.style or {}, style_updates)
 
-            layer.increment_version()
-            session.commit()
-            session.refresh(layer)
-            session.expunge(layer)
-            return layer
+        layer.increment_version()
+        session.commit()
+        session.refresh(layer)
+        session.expunge(layer)
+        return layer
 
     def delete_layer(self, layer_id: str) -> None:
-        with self._session_factory() as session:
-            layer = session.get(TextLayer, layer_id)
-            if not layer:
-                raise NotFoundError("图层不存在")
-            session.delete(layer)
-            session.commit()
+        self._run(self._delete_layer, layer_id)
 
-    def batch_update(
-        self,
-        translation_id: str,
-        updates: Iterable[dict[str, Any]],
-    ) -> List[TextLayer]:
+    async def delete_layer_async(self, layer_id: str) -> None:
+        await self._run_async(self._delete_layer, layer_id)
+
+    @staticmethod
+    def _delete_layer(session: Session, layer_id: str) -> None:
+        layer = session.get(TextLayer, layer_id)
+        if not layer:
+            raise NotFoundError("图层不存在")
+        session.delete(layer)
+        session.commit()
+
+    def batch_update(self, translation_id: str, updates: Iterable[dict[str, Any]]) -> List[TextLayer]:
+        payload = list(updates)
+        if not payload:
+            return []
+        return self._run(self._batch_update, translation_id, payload)
+
+    async def batch_update_async(self, translation_id: str, updates: Iterable[dict[str, Any]]) -> List[TextLayer]:
         payload = list(updates)
         if not payload:
             return []
+        return await self._run_async(self._batch_update, translation_id, payload)
 
+    def _batch_update(self, session: Session, translation_id: str, payload: List[dict[str, Any]]) -> List[TextLayer]:
         layer_ids = [item["id"] for item in payload]
-        session = self._session_factory()
         try:
             db_layers = (
                 session.query(TextLayer)
@@ -132,8 +183,6 @@ class LayerService:
         except Exception:
             session.rollback()
             raise
-        finally:
-            session.close()
 
     def _ensure_version(self, layer: TextLayer, incoming_version: int) -> None:
         if layer.version != incoming_version:
@@ -0,0 +1,166 @@
+"""Wake idle queue workers as soon as translations are enqueued, and relay job events between instances."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import select
+import threading
+from typing import Callable
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+# PostgreSQL 的 NOTIFY 负载必须小于 8000 字节
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+
+class QueueWakeup:
+    """In-process wake-up event, plus PostgreSQL LISTEN/NOTIFY across processes.
+
+    Workers wait on the event with the poll interval as timeout, so a missed
+    or unsupported notification only costs one poll. On PostgreSQL a daemon
+    thread LISTENs on ``channel`` with a dedicated connection and wakes this
+    process's workers whenever any process commits new work.
+
+    Notifications with a non-empty payload are messages, not wake-ups: they
+    are handed to the ``on_message`` handler on the event loop, which lets
+    every instance fan job events out to its own SSE subscribers.
+    """
+
+    def __init__(self, engine: Engine, *, channel: str) -> None:
+        if not _CHANNEL_PATTERN.match(channel):
+            raise ValueError(f"invalid NOTIFY channel name: {channel!r}")
+        self._engine = engine
+        self._channel = channel
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event: asyncio.Event | None = None
+        self._listener: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._on_message: Callable[[str], None] | None = None
+        self._listening = False
+
+    @property
+    def cross_process(self) -> bool:
+        return self._engine.dialect.name == "postgresql"
+
+    @property
+    def listening(self) -> bool:
+        """True while the LISTEN connection is up, i.e. this process receives broadcasts."""
+
+        return self._listening
+
+    def on_message(self, handler: Callable[[str], None]) -> None:
+        """Register the handler called on the event loop for every broadcast payload."""
+
+        self._on_message = handler
+
+    def start(self) -> None:
+        """Bind to the running loop and start the LISTEN thread when supported."""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._event = asyncio.Event()
+        if self.cross_process and (self._listener is None or not self._listener.is_alive()):
+            self._stop.clear()
+            self._listener = threading.Thread(target=self._listen, name="queue-listener", daemon=True)
+            self._listener.start()
+
+    def notify_in(self, session: Session) -> None:
+        """Emit NOTIFY inside ``session``'s transaction; PostgreSQL delivers it on commit."""
+
+        if self.cross_process:
+            session.execute(text("SELECT pg_notify(:channel, '')"), {"channel": self._channel})
+
+    def broadcast(self, payload: str) -> None:
+        """NOTIFY ``payload`` to every listening process, this one included (blocking)."""
+
+        if not payload:
+            raise ValueError("broadcast payload must not be empty")
+        if len(payload.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+            raise ValueError("broadcast payload exceeds the NOTIFY size limit")
+        with self._engine.begin() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"), {"channel": self._channel, "payload": payload}
+            )
+
+    def deliver(self, payload: str) -> None:
+        """Hand a received payload to the ``on_message`` handler (safe to call from any thread)."""
+
+        loop, handler = self._loop, self._on_message
+        if loop is None or handler is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(handler, payload)
+
+    def wake(self) -> None:
+        """Wake this process's waiting workers (safe to call from any thread)."""
+
+        loop, event = self._loop, self._event
+        if loop is None or event is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, timeout: float) -> None:
+        event = self._event
+        if event is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=2)
+            self._listener = None
+
+    def _listen(self) -> None:  # pragma: no cover - requires a PostgreSQL server
+        while not self._stop.is_set():
+            connection = None
+            try:
+                pooled = self._engine.raw_connection()
+                pooled.detach()
+                connection = pooled.driver_connection
+                if not hasattr(connection, "poll"):
+                    logger.warning("当前 PostgreSQL 驱动不支持 LISTEN 轮询，队列退化为定时轮询")
+                    return
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self._channel}")
+                self._listening = True
+                # 重连期间可能错过通知，先唤醒一次让 worker 检查队列
+                self.wake()
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([connection], [], [], 1.0)
+                    if not readable:
+                        continue
+                    connection.poll()
+                    notifies = list(connection.notifies)
+                    connection.notifies.clear()
+                    for notify in notifies:
+                        if notify.payload:
+                            self.deliver(notify.payload)
+                    if any(not notify.payload for notify in notifies):
+                        self.wake()
+            except Exception:
+                logger.warning("队列 LISTEN 连接异常，5 秒后重连", exc_info=True)
+                self._stop.wait(5)
+            finally:
+                self._listening = False
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+__all__ = ["NOTIFY_PAYLOAD_LIMIT", "QueueWakeup"]
@@ -0,0 +1,292 @@
+"""Full-text search over translated history backed by SQLite FTS5.
+
+``translation_search`` is an FTS5 table (trigram tokenizer, so CJK text and
+substrings match) whose rowid is the ``translations`` rowid. Each row holds
+the source and translated text of one translation, gathered from its text
+layers and the text elements of its editor template. A session
+``after_flush`` listener rebuilds the row of every translation whose
+editor data or layers changed in that flush, inside the same transaction;
+a trigger removes the row when the translation is deleted.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import logging
+import re
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import DDL, Connection, Engine, Row, event, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal, run_in_session
+from core.exceptions import AppError, ValidationError
+from models import TextLayer, Translation, TranslationEditorData
+from services.history import HISTORY_COLUMNS
+from utils.compression import decompress_text
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "translation_search"
+_ROWID = literal_column("translations.rowid")
+# trigram 分词器只能匹配不少于 3 个字符的查询，更短的关键词退化为对索引表的 LIKE
+MIN_MATCH_CHARS = 3
+MAX_HIGHLIGHTS = 3
+
+_CREATE_STATEMENTS = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+    "USING fts5(original_text, translated_text, tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON translations BEGIN "
+    f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.rowid; END",
+)
+
+
+class SearchUnavailableError(AppError):
+    """Raised when the database has no full-text index (non-SQLite or FTS5 missing)."""
+
+    status_code = 503
+    error_code = "SEARCH_UNAVAILABLE"
+
+
+for _statement in _CREATE_STATEMENTS:
+    event.listen(Translation.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+def _has_search_table(connection: Connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    found = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+    ).first()
+    return found is not None
+
+
+def extract_editor_text(editor_data: Optional[str]) -> Tuple[List[str], List[str]]:
+    """Collect (source texts, translated texts) from an Aliyun editor template."""
+
+    if not editor_data:
+        return [], []
+    try:
+        template = json.loads(editor_data)
+    except (TypeError, ValueError):
+        return [], []
+
+    originals: List[str] = []
+    translations: List[str] = []
+    stack: List[Any] = [template]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        if node.get("type") == "text":
+            if node.get("ocrContent"):
+                originals.append(str(node["ocrContent"]))
+            if node.get("content"):
+                translations.append(str(node["content"]))
+        children = node.get("children")
+        if children:
+            stack.append(children)
+    return originals, translations
+
+
+def reindex_translations(connection: Connection, translation_ids: Iterable[str]) -> None:
+    """Rebuild the search rows for ``translation_ids`` using ``connection``'s transaction."""
+
+    ids = list(dict.fromkeys(translation_ids))
+    if not ids:
+        return
+    translations = connection.execute(
+        select(_ROWID, Translation.id, TranslationEditorData.codec, TranslationEditorData.data)
+        .outerjoin(TranslationEditorData)
+        .where(Translation.id.in_(ids))
+    ).all()
+    layers: Dict[str, List[Tuple[str, str]]] = {}
+    for translation_id, original, translated in connection.execute(
+        select(TextLayer.translation_id, TextLayer.original_text, TextLayer.translated_text)
+        .where(TextLayer.translation_id.in_(ids))
+        .order_by(TextLayer.created_at)
+    ):
+        layers.setdefault(translation_id, []).append((original, translated))
+
+    for rowid, translation_id, codec, data in translations:
+        originals, translated = extract_editor_text(decompress_text(codec, data) if data is not None else None)
+        for original, layer_text in layers.get(translation_id, ()):
+            originals.append(original)
+            translated.append(layer_text)
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), {"rowid": rowid})
+        if originals or translated:
+            connection.execute(
+                text(
+                    f"INSERT INTO {SEARCH_TABLE} (rowid, original_text, translated_text) "
+                    "VALUES (:rowid, :original, :translated)"
+                ),
+                {"rowid": rowid, "original": "\n".join(originals), "translated": "\n".join(translated)},
+            )
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """Create the FTS table on an existing database and backfill it; False when unsupported."""
+
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.begin() as connection:
+        if _has_search_table(connection):
+            return True
+        try:
+            for statement in _CREATE_STATEMENTS:
+                connection.execute(text(statement))
+        except Exception:  # pragma: no cover - sqlite built without FTS5
+            logger.warning("SQLite FTS5 不可用，历史全文检索已禁用", exc_info=True)
+            return False
+
+        ids = connection.scalars(
+            select(TranslationEditorData.translation_id).union(select(TextLayer.translation_id))
+        ).all()
+        for start in range(0, len(ids), 500):
+            reindex_translations(connection, ids[start : start + 500])
+        logger.info("历史全文索引已建立，回填 %d 条记录", len(ids))
+    return True
+
+
+def _changed_translation_ids(session: Session) -> Set[str]:
+    ids: Set[str] = set()
+    # 删除 Translation 由触发器处理；图层和编辑器数据的任何变化都需要重建所属记录
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (TextLayer, TranslationEditorData)):
+            ids.add(obj.translation_id)
+    ids.discard(None)  # type: ignore[arg-type]
+    return ids
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_after_flush(session: Session, flush_context) -> None:
+    ids = _changed_translation_ids(session)
+    if not ids:
+        return
+    connection = session.connection()
+    if _has_search_table(connection):
+        reindex_translations(connection, ids)
+
+
+def _fts_phrase(query: str) -> str:
+    return '"' + query.replace('"', '""') + '"'
+
+
+def highlight_lines(content: Optional[str], query: str, *, limit: int = MAX_HIGHLIGHTS) -> List[str]:
+    """Lines of ``content`` containing ``query``, HTML-escaped, with each match wrapped in <mark>.
+
+    The text comes from OCR of user uploads, so everything outside the
+    ``<mark>`` tags is escaped before it reaches a client that renders HTML.
+    """
+
+    if not content:
+        return []
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    lines = []
+    for line in content.split("\n"):
+        if not pattern.search(line):
+            continue
+        # 按原文切分后逐段转义，查询词也不会匹配进 &amp; 之类的实体内部
+        parts, cursor = [], 0
+        for match in pattern.finditer(line):
+            parts.append(html.escape(line[cursor : match.start()]))
+            parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+            cursor = match.end()
+        parts.append(html.escape(line[cursor:]))
+        lines.append("".join(parts))
+        if len(lines) >= limit:
+            break
+    return lines
+
+
+class HistorySearchService:
+    """Find translations whose source or translated text contains a phrase."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        async_session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._async_session_factory = async_session_factory
+
+    def search(self, query: str, *, limit: int = 20) -> List[Tuple[Row, Dict[str, List[str]]]]:
+        """Return up to ``limit`` (translation, highlights) pairs, best match first."""
+
+        query = self._normalize(query)
+        with self._session_factory() as session:
+            return self._search(session, query, limit)
+
+    async def search_async(self, query: str, *, limit: int = 20) -> List[Tuple[Row, Dict[str, List[str]]]]:
+        query = self._normalize(query)
+        return await run_in_session(
+            partial(self._search, query=query, limit=limit),
+            session_factory=self._session_factory,
+            async_session_factory=self._async_session_factory,
+        )
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        query = query.strip()
+        if not query:
+            raise ValidationError("搜索关键词不能为空")
+        return query
+
+    @staticmethod
+    def _search(session: Session, query: str, limit: int) -> List[Tuple[Row, Dict[str, List[str]]]]:
+        connection = session.connection()
+        if not _has_search_table(connection):
+            raise SearchUnavailableError("当前数据库不支持全文检索")
+
+        if len(query) >= MIN_MATCH_CHARS:
+            statement = text(
+                f"SELECT rowid, original_text, translated_text FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH :match ORDER BY rank LIMIT :limit"
+            ).bindparams(match=_fts_phrase(query), limit=limit)
+        else:
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            statement = text(
+                f"SELECT rowid, original_text, translated_text FROM {SEARCH_TABLE} "
+                "WHERE original_text LIKE :like ESCAPE '\\' OR translated_text LIKE :like ESCAPE '\\' "
+                "ORDER BY rowid DESC LIMIT :limit"
+            ).bindparams(like=f"%{escaped}%", limit=limit)
+        hits = connection.execute(statement).all()
+        if not hits:
+            return []
+
+        rowids = [hit.rowid for hit in hits]
+        rows = session.execute(select(_ROWID.label("search_rowid"), *HISTORY_COLUMNS).where(_ROWID.in_(rowids)))
+        by_rowid = {row.search_rowid: row for row in rows}
+        results = []
+        for hit in hits:
+            translation = by_rowid.get(hit.rowid)
+            if translation is None:
+                continue
+            results.append(
+                (
+                    translation,
+                    {
+                        "original": highlight_lines(hit.original_text, query),
+                        "translated": highlight_lines(hit.translated_text, query),
+                    },
+                )
+            )
+        return results
+
+
+__all__ = [
+    "HistorySearchService",
+    "SEARCH_TABLE",
+    "SearchUnavailableError",
+    "ensure_search_index",
+    "extract_editor_text",
+    "highlight_lines",
+    "reindex_translations",
+]
@@ -6,6 +6,8 @@ import asyncio
 from dataclasses import dataclass
 from typing import Dict, Set
 
+from core.metrics import SSE_SUBSCRIBERS, time_stage
+
 
 @dataclass
 class SSEEvent:
@@ -34,13 +36,18 @@ class SSEManager:
                     self._subscribers.pop(job_id, None)
 
     async def publish(self, job_id: str, event: SSEEvent) -> None:
-        async with self._lock:
-            subscribers = list(self._subscribers.get(job_id, set()))
-        for queue in subscribers:
-            await queue.put(event)
+        with time_stage("sse_publish"):
+            async with self._lock:
+                subscribers = list(self._subscribers.get(job_id, set()))
+            for queue in subscribers:
+                await queue.put(event)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
 
 
 sse_manager = SSEManager()
+SSE_SUBSCRIBERS.set_function(sse_manager.subscriber_count)
 
 
 __all__ = ["sse_manager", "SSEManager", "SSEEvent"]
@@ -3,15 +3,19 @@
 from __future__ import annotations
 
 import io
+import os
 import shutil
+import tempfile
 from pathlib import Path
 from typing import Optional
 
 from PIL import Image
 
 from core.config import settings
+from core.tracing import start_span
 
 ALLOWED_MASK_MIME = {"image/png", "image/webp"}
+TEMP_SUFFIX = ".tmp"
 
 
 class StorageService:
@@ -24,7 +28,8 @@ class StorageService:
     def save_original(self, job_id: str, image_uuid: str, content: bytes, *, filename: str | None = None) -> str:
         ext = self._infer_extension(filename)
         path = self._image_dir(job_id, image_uuid) / f"original{ext}"
-        path.write_bytes(content)
+        with start_span("storage.save_original", {"bytes": len(content)}):
+            self._write_atomic(path, content)
         return self._relative(path)
 
     def save_mask(self, job_id: str, image_uuid: str, content: bytes, mime_type: str | None) -> str:
@@ -41,17 +46,19 @@ class StorageService:
             ext = "png"
 
         path = self._image_dir(job_id, image_uuid) / f"mask.{ext}"
-        path.write_bytes(data)
+        self._write_atomic(path, data)
         return self._relative(path)
 
     def save_result(self, job_id: str, image_uuid: str, content: bytes) -> str:
         path = self._image_dir(job_id, image_uuid) / "result.png"
-        path.write_bytes(content)
+        with start_span("storage.save_result", {"bytes": len(content)}):
+            self._write_atomic(path, content)
         return self._relative(path)
 
     def get_file(self, relative_path: str) -> bytes:
         path = self.base_path / relative_path
-        return path.read_bytes()
+        with start_span("storage.get_file"):
+            return path.read_bytes()
 
     def delete_job_files(self, job_id: str) -> None:
         target = self.base_path / job_id
@@ -75,6 +82,25 @@ class StorageService:
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes) -> None:
+        """Write via a temp file and rename, so an existing file is replaced, never rewritten.
+
+        Backup snapshots hardlink storage files; rewriting in place would
+        silently change the snapshotted copy as well.
+        """
+
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+            # mkstemp 创建的是 0600，保持与直接写文件相同的权限
+            os.chmod(temp_name, 0o644)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
     def _relative(self, path: Path) -> str:
         """Return path relative to base_path."""
         return str(path.relative_to(self.base_path))
@@ -91,4 +117,4 @@ class StorageService:
         return f".{ext}"
 
 
-__all__ = ["StorageService"]
+__all__ = ["StorageService", "TEMP_SUFFIX"]
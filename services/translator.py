@@ -8,10 +8,10 @@ from typing import Callable, Optional
 
 from PIL import Image, UnidentifiedImageError
 
-from core.config import settings
-from core.exceptions import TranslationError
+from core.engines.retry import RetryPolicy
+from core.exceptions import AppError, TranslationError
 from core.processor import ImageTranslator, TranslationOutput
-from utils.retry import retry_on_failure
+from core.tracing import start_span
 
 
 @dataclass
@@ -24,20 +24,25 @@ class TranslateParams:
     enable_postprocess: bool = True
     protect_product: Optional[bool] = None
     engine: Optional[str] = None
+    hedge: bool = False
 
 
 class TranslatorService:
     """High-level translator orchestrating processor module."""
 
-    def __init__(self, translator_factory: Callable[[], ImageTranslator] | None = None) -> None:
+    def __init__(
+        self,
+        translator_factory: Callable[[], ImageTranslator] | None = None,
+        *,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
         self._translator: Optional[ImageTranslator] = None
         self._translator_factory = translator_factory or self._default_translator
+        self._retry_policy = retry_policy or RetryPolicy()
 
     def _default_translator(self) -> ImageTranslator:
-        return ImageTranslator(
-            access_key_id=settings.ALI_ACCESS_KEY_ID,
-            access_key_secret=settings.ALI_ACCESS_KEY_SECRET,
-        )
+        # 走 EngineRegistry，以便熔断、回退等策略对所有调用生效
+        return ImageTranslator()
 
     @property
     def translator(self) -> ImageTranslator:
@@ -55,6 +60,7 @@ class TranslatorService:
         *,
         protect_product: Optional[bool] = None,
         engine: Optional[str] = None,
+        hedge: bool = False,
     ) -> TranslationOutput:
         """Execute translation, returning TranslationOutput with image and editor data."""
 
@@ -65,12 +71,75 @@ class TranslatorService:
             enable_postprocess=enable_postprocess,
             protect_product=protect_product,
             engine=engine,
+            hedge=hedge,
         )
         return self.translate_with_params(image_bytes=image_bytes, params=params)
 
     def translate_with_params(self, image_bytes: bytes, params: TranslateParams) -> TranslationOutput:
         pil_image = self._load_image(image_bytes)
-        return self._execute_with_retry(pil_image, params)
+        try:
+            return self._retry_policy.run_sync(lambda: self._execute(pil_image, params))
+        except AppError:
+            raise
+        except Exception as exc:  # pragma: no cover - depends on SDK
+            raise TranslationError(str(exc)) from exc
+
+    async def translate_async(
+        self,
+        image_bytes: bytes,
+        source_lang: str,
+        target_lang: str,
+        field: str,
+        enable_postprocess: bool,
+        *,
+        protect_product: Optional[bool] = None,
+        engine: Optional[str] = None,
+        hedge: bool = False,
+    ) -> TranslationOutput:
+        """Async variant: engine calls and retry backoff never hold an executor thread."""
+
+        attributes = {"source_lang": source_lang, "target_lang": target_lang, "field": field}
+        with start_span("translator.translate", attributes):
+            return await self._translate_with_retry(
+                image_bytes,
+                source_lang,
+                target_lang,
+                field,
+                enable_postprocess,
+                protect_product=protect_product,
+                engine=engine,
+                hedge=hedge,
+            )
+
+    async def _translate_with_retry(
+        self,
+        image_bytes: bytes,
+        source_lang: str,
+        target_lang: str,
+        field: str,
+        enable_postprocess: bool,
+        *,
+        protect_product: Optional[bool],
+        engine: Optional[str],
+        hedge: bool,
+    ) -> TranslationOutput:
+        try:
+            return await self._retry_policy.run(
+                lambda: self.translator.translate_async(
+                    image_bytes,
+                    source_lang,
+                    target_lang,
+                    field,
+                    enable_postprocess,
+                    protect_product=protect_product,
+                    engine=engine,
+                    hedge=hedge,
+                )
+            )
+        except AppError:
+            raise
+        except Exception as exc:  # pragma: no cover - depends on SDK
+            raise TranslationError(str(exc)) from exc
 
     def _load_image(self, image_bytes: bytes) -> Image.Image:
         try:
@@ -80,25 +149,17 @@ class TranslatorService:
         except (UnidentifiedImageError, OSError) as exc:  # pragma: no cover - PIL handles this
             raise TranslationError(f"无法读取图片: {exc}") from exc
 
-    @retry_on_failure(
-        max_attempts=settings.RETRY_MAX_ATTEMPTS,
-        delay=settings.RETRY_DELAY,
-        backoff="exponential",
-        jitter=0.3,
-    )
-    def _execute_with_retry(self, pil_image: Image.Image, params: TranslateParams) -> TranslationOutput:
-        try:
-            return self.translator.translate(
-                image=pil_image,
-                source_lang=params.source_lang,
-                target_lang=params.target_lang,
-                field=params.field,
-                enable_postprocess=params.enable_postprocess,
-                protect_product=params.protect_product,
-                engine=params.engine,
-            )
-        except Exception as exc:  # pragma: no cover - depends on SDK
-            raise TranslationError(str(exc)) from exc
+    def _execute(self, pil_image: Image.Image, params: TranslateParams) -> TranslationOutput:
+        return self.translator.translate(
+            image=pil_image,
+            source_lang=params.source_lang,
+            target_lang=params.target_lang,
+            field=params.field,
+            enable_postprocess=params.enable_postprocess,
+            protect_product=params.protect_product,
+            engine=params.engine,
+            hedge=params.hedge,
+        )
 
 
 __all__ = ["TranslatorService", "TranslateParams"]
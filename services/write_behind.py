@@ -0,0 +1,180 @@
+"""Write-behind buffer that batches small ORM writes into shared transactions."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, List, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal, run_in_session
+from core.metrics import time_stage
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteOp = Callable[[Session], Any]
+
+
+@dataclass
+class _Entry:
+    op: WriteOp
+    waiters: List[asyncio.Future] = field(default_factory=list)
+
+
+class WriteBehindBuffer:
+    """Coalesce writes from concurrent coroutines into one commit every few milliseconds.
+
+    ``enqueue`` returns a future resolved with the op's result once the
+    transaction containing it has committed, so callers can publish events
+    only after their write is durable. Ops run in submission order and must
+    not commit themselves. Ops enqueued with the same ``key`` before a flush
+    run once, at the position of the latest submission, and every waiter
+    gets that result. If a batch fails, its ops are retried one transaction
+    each so a single bad write does not fail its neighbours.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        *,
+        async_session_factory: Optional[Callable[[], AsyncSession]] = None,
+        interval: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._async_session_factory = async_session_factory
+        self._interval = settings.WRITE_BEHIND_INTERVAL_MS / 1000 if interval is None else interval
+        self._max_batch = max_batch or settings.WRITE_BEHIND_MAX_BATCH
+        self._pending: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._ready: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.batches = 0
+
+    def enqueue(self, op: Callable[[Session], T], *, key: Optional[Hashable] = None) -> "asyncio.Future[T]":
+        """Queue ``op`` for the next batch; await the returned future for its result."""
+
+        loop = asyncio.get_running_loop()
+        self._ensure_flusher(loop)
+        future: asyncio.Future = loop.create_future()
+        if key is None:
+            key = object()
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            entry = _Entry(op)
+        else:
+            entry.op = op
+        entry.waiters.append(future)
+        self._pending[key] = entry
+        assert self._ready is not None
+        self._ready.set()
+        return future
+
+    async def submit(self, op: Callable[[Session], T], *, key: Optional[Hashable] = None) -> T:
+        return await self.enqueue(op, key=key)
+
+    async def flush(self) -> None:
+        """Commit everything queued so far (used on shutdown and in tests)."""
+
+        while self._pending:
+            await self._flush_batch()
+
+    def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        for entry in self._pending.values():
+            for waiter in entry.waiters:
+                if not waiter.done():
+                    waiter.cancel()
+        self._pending.clear()
+
+    def _ensure_flusher(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._flusher is not None and not self._flusher.done() and self._flusher.get_loop() is loop:
+            return
+        self._ready = asyncio.Event()
+        self._flusher = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        assert self._ready is not None
+        while True:
+            await self._ready.wait()
+            # 等一个很短的窗口，让同一时刻完成的其他 worker 把写入并进同一个事务
+            if len(self._pending) < self._max_batch:
+                await asyncio.sleep(self._interval)
+            self._ready.clear()
+            try:
+                await self._flush_batch()
+            except Exception:  # pragma: no cover - defensive logging
+                logger.exception("Write-behind flush failed")
+            if self._pending:
+                self._ready.set()
+
+    async def _flush_batch(self) -> None:
+        async with self._flush_lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self) -> None:
+        entries: List[_Entry] = []
+        while self._pending and len(entries) < self._max_batch:
+            entries.append(self._pending.popitem(last=False)[1])
+        if not entries:
+            return
+
+        try:
+            with time_stage("write_behind_flush"):
+                results = await run_in_session(
+                    lambda session: self._apply(session, entries),
+                    session_factory=self._session_factory,
+                    async_session_factory=self._async_session_factory,
+                )
+        except Exception:
+            logger.warning("合并写入失败，逐条重试 %d 个操作", len(entries), exc_info=True)
+            await self._retry_individually(entries)
+            return
+        self.batches += 1
+        for entry, result in zip(entries, results):
+            self._resolve(entry, result=result)
+
+    async def _retry_individually(self, entries: List[_Entry]) -> None:
+        for entry in entries:
+            try:
+                result = await run_in_session(
+                    lambda session, entry=entry: self._apply(session, [entry])[0],
+                    session_factory=self._session_factory,
+                    async_session_factory=self._async_session_factory,
+                )
+            except Exception as exc:
+                self._resolve(entry, error=exc)
+            else:
+                self._resolve(entry, result=result)
+
+    @staticmethod
+    def _apply(session: Session, entries: List[_Entry]) -> List[Any]:
+        results = []
+        for entry in entries:
+            results.append(entry.op(session))
+            # 会话关闭了 autoflush，后面的操作（如进度统计）需要看到前面的修改
+            session.flush()
+        session.commit()
+        return results
+
+    @staticmethod
+    def _resolve(entry: _Entry, *, result: Any = None, error: Optional[BaseException] = None) -> None:
+        for waiter in entry.waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(result)
+
+
+__all__ = ["WriteBehindBuffer", "WriteOp"]
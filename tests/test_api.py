@@ -24,11 +24,13 @@ from api.dependencies import (
     get_history_service,
     get_job_queue_service,
     get_layer_service,
+    get_search_service,
     get_translator_service,
 )
 from api.main import app as fastapi_app
 from core.config import settings
 from core.exceptions import VersionConflictError
+from core.processor import TranslationOutput
 from services.cache import CacheService
 from services.demo_service import DemoHistoryItem, DemoService
 from models.job import JobStatus
@@ -57,7 +59,7 @@ class FakeTranslator:
     def __init__(self):
         self.calls = 0
 
-    def translate(
+    async def translate_async(
         self,
         image_bytes,
         source_lang,
@@ -67,12 +69,13 @@ class FakeTranslator:
         *,
         protect_product=None,
         engine=None,
+        hedge=False,
     ):  # type: ignore[override]
         self.calls += 1
         image = Image.new("RGB", (8, 8), color="purple")
         buffer = BytesIO()
         image.save(buffer, format="PNG")
-        return buffer.getvalue()
+        return TranslationOutput(image_bytes=buffer.getvalue())
 
 
 class FakeJobQueueService:
@@ -83,7 +86,7 @@ class FakeJobQueueService:
         self.created_jobs.append(len(files))
         return JobCreateResult(job_id="job-123", status=JobStatus.PENDING, images_count=len(files))
 
-    def job_exists(self, job_id: str) -> bool:
+    async def job_exists_async(self, job_id: str) -> bool:
         return job_id == "job-123"
 
 
@@ -127,18 +130,30 @@ class FakeHistoryService:
         ]
         self.deleted = None
 
-    def list_history(self, *, page=1, limit=20, **kwargs):  # type: ignore[override]
+    async def list_history_async(self, *, page=1, limit=20, **kwargs):  # type: ignore[override]
         start = max(page - 1, 0) * limit
         end = start + limit
         return self.records[start:end], len(self.records)
 
-    def get_translation(self, translation_id: str):  # type: ignore[override]
+    async def list_history_keyset_async(self, *, limit=20, after=None, before=None, **kwargs):  # type: ignore[override]
+        ordered = sorted(self.records, key=lambda record: (record.created_at, record.id), reverse=True)
+        if after is not None:
+            ordered = [record for record in ordered if (record.created_at, record.id) < after]
+        if before is not None:
+            ordered = [record for record in ordered if (record.created_at, record.id) > before][::-1]
+            return ordered[:limit][::-1], len(ordered) > limit
+        return ordered[:limit], len(ordered) > limit
+
+    async def count_history_async(self, **kwargs):  # type: ignore[override]
+        return len(self.records)
+
+    async def get_translation_async(self, translation_id: str):  # type: ignore[override]
         for record in self.records:
             if record.id == translation_id:
                 return record
         raise AssertionError("record not found in fake service")
 
-    def delete_translation(self, translation_id: str):  # type: ignore[override]
+    async def delete_translation_async(self, translation_id: str):  # type: ignore[override]
         self.deleted = translation_id
 
 
@@ -163,10 +178,10 @@ class FakeLayerService:
         self.layers = {"layer-1": DummyLayer("layer-1", "tr-1")}
         self.batch_calls: list[tuple[str, list[dict[str, object]]]] = []
 
-    def list_layers(self, translation_id: str):  # type: ignore[override]
+    async def list_layers_async(self, translation_id: str):  # type: ignore[override]
         return [layer for layer in self.layers.values() if layer.translation_id == translation_id]
 
-    def update_layer(self, layer_id: str, *, translated_text, style_updates, version):  # type: ignore[override]
+    async def update_layer_async(self, layer_id: str, *, translated_text, style_updates, version):  # type: ignore[override]
         layer = self.layers[layer_id]
         if version != layer.version:
             raise VersionConflictError("冲突", details={"latest": {"id": layer.id, "version": layer.version}})
@@ -177,7 +192,7 @@ class FakeLayerService:
         layer.version += 1
         return layer
 
-    def batch_update(self, translation_id: str, updates):  # type: ignore[override]
+    async def batch_update_async(self, translation_id: str, updates):  # type: ignore[override]
         self.batch_calls.append((translation_id, list(updates)))
         updated = []
         for item in updates:
@@ -367,6 +382,75 @@ async def test_history_endpoint_merges_demo_records(monkeypatch):
         fastapi_app.dependency_overrides.pop(get_demo_service, None)
 
 
+@pytest.mark.asyncio
+async def test_history_search_route_is_not_shadowed_by_detail():
+    record = FakeHistoryService().records[0]
+
+    class FakeSearchService:
+        async def search_async(self, query, *, limit=20):
+            return [(record, {"original": [f"<mark>{query}</mark>"], "translated": []})]
+
+    fastapi_app.dependency_overrides[get_search_service] = lambda: FakeSearchService()
+    try:
+        async with create_client(fastapi_app) as client:
+            resp = await client.get("/api/history/search", params={"q": "Seller"})
+        assert resp.status_code == HTTP_200_OK
+        payload = resp.json()
+        assert payload["items"][0]["id"] == record.id
+        assert payload["items"][0]["highlights"]["original"] == ["<mark>Seller</mark>"]
+    finally:
+        fastapi_app.dependency_overrides.pop(get_search_service, None)
+
+@pytest.mark.asyncio
+async def test_history_cursor_pagination_merges_demo_records(monkeypatch):
+    fake_history = FakeHistoryService()
+    demo_service = DemoService(
+        history_items=[
+            DemoHistoryItem(
+                id="demo-1",
+                job_id="demo-job-1",
+                image_uuid="demo-img-1",
+                source_lang="zh-CN",
+                target_lang="en",
+                field="e-commerce",
+                status=TranslationStatus.DONE,
+                created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+                original_url="https://example.com/demo-1.png",
+                result_url="https://example.com/demo-1-result.png",
+            )
+        ]
+    )
+    fastapi_app.dependency_overrides[get_history_service] = lambda: fake_history
+    fastapi_app.dependency_overrides[get_demo_service] = lambda: demo_service
+    monkeypatch.setattr(settings, "DEMO_MODE", True)
+
+    try:
+        async with create_client(fastapi_app) as client:
+            seen = []
+            params = {"limit": 1}
+            while True:
+                payload = (await client.get("/api/history", params=params)).json()
+                assert payload["total"] == 3
+                seen.extend(item["id"] for item in payload["items"])
+                if not payload["nextCursor"]:
+                    break
+                last = payload
+                params = {"limit": 1, "cursor": payload["nextCursor"]}
+
+            assert seen == ["demo-1", "rec-1", "rec-2"]
+
+            back = (await client.get("/api/history", params={"limit": 1, "cursor": payload["prevCursor"]})).json()
+            assert [item["id"] for item in back["items"]] == ["rec-1"]
+            assert back["prevCursor"] and back["nextCursor"]
+            assert last["items"][0]["id"] == "rec-1"
+
+            bad = await client.get("/api/history", params={"cursor": "not-a-cursor"})
+            assert bad.status_code == 400
+    finally:
+        fastapi_app.dependency_overrides.pop(get_history_service, None)
+        fastapi_app.dependency_overrides.pop(get_demo_service, None)
+
+
 @pytest.mark.asyncio
 async def test_engines_endpoint_returns_metadata(monkeypatch):
     monkeypatch.setattr(
@@ -469,3 +553,48 @@ async def test_translate_endpoint_rejects_unknown_engine(monkeypatch):
 
     assert resp.status_code == HTTP_400_BAD_REQUEST
     assert resp.json()["error"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_stage_histograms():
+    async with create_client(fastapi_app) as client:
+        await client.post("/api/translate", files={"file": ("test.png", make_image_bytes(), "image/png")})
+        resp = await client.get("/metrics")
+
+    assert resp.status_code == HTTP_200_OK
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'picturetranslate_stage_seconds_count{stage="validate"}' in resp.text
+    assert "# TYPE picturetranslate_queue_depth gauge" in resp.text
+
+
+@pytest.mark.asyncio
+async def test_translate_returns_trace_id_when_tracing_enabled(monkeypatch):
+    from core.tracing import tracer
+
+    monkeypatch.setattr(tracer, "enabled", True)
+    async with create_client(fastapi_app) as client:
+        resp = await client.post("/api/translate", files={"file": ("test.png", make_image_bytes(), "image/png")})
+        trace_id = resp.headers["x-trace-id"]
+        traces = await client.get("/api/traces", params={"trace_id": trace_id})
+
+    assert traces.status_code == HTTP_200_OK
+    spans = traces.json()["traces"][0]["spans"]
+    assert spans[0]["name"] == "POST /api/translate"
+    assert spans[0]["attributes"]["http.status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_admin_profile_requires_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    async with create_client(fastapi_app) as client:
+        denied = await client.get("/api/admin/profile", params={"seconds": 0.05})
+        resp = await client.get(
+            "/api/admin/profile",
+            params={"seconds": 0.05, "interval_ms": 5},
+            headers={"X-Admin-Token": "secret"},
+        )
+
+    assert denied.status_code == 403
+    assert resp.status_code == HTTP_200_OK
+    assert int(resp.headers["x-profile-samples"]) > 0
+    assert "thread:MainThread" in resp.text
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from core.exceptions import NotFoundError, ValidationError
+from services.backup import BackupService, main
+from services.storage import StorageService
+
+
+@pytest.fixture()
+def live(tmp_path):
+    database = tmp_path / "app.db"
+    connection = sqlite3.connect(database)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)")
+    connection.executemany("INSERT INTO items (payload) VALUES (?)", [("x" * 500,) for _ in range(2000)])
+    connection.commit()
+    connection.close()
+    storage = StorageService(tmp_path / "storage")
+    storage.save_original("job-1", "img-1", b"original", filename="a.png")
+    return database, storage
+
+
+def _service(tmp_path, database, **overrides):
+    options = dict(
+        backup_dir=tmp_path / "backups",
+        database_url=f"sqlite:///{database}",
+        storage_dir=tmp_path / "storage",
+        retention=3,
+        pages_per_step=8,
+        step_sleep=0,
+    )
+    options.update(overrides)
+    return BackupService(**options)
+
+
+def _count(path) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT count(*) FROM items").fetchone()[0]
+
+
+def test_stepped_backup_does_not_block_concurrent_writers(tmp_path, live):
+    database, _ = live
+    service = _service(tmp_path, database, step_sleep=0.001)
+    writes: list = []
+    stop = threading.Event()
+
+    def writer() -> None:
+        connection = sqlite3.connect(database, timeout=0.5)
+        while not stop.is_set():
+            connection.execute("INSERT INTO items (payload) VALUES ('y')")
+            connection.commit()
+            writes.append(1)
+        connection.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        result = service.create_backup()
+    finally:
+        stop.set()
+        thread.join()
+
+    assert writes and result.database_pages > 8
+    assert _count(result.path / "translations.db") >= 2000
+    manifest = json.loads((result.path / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["name"] == result.name
+
+
+def test_backup_pauses_between_page_steps(tmp_path, live, monkeypatch):
+    database, _ = live
+    service = _service(tmp_path, database, step_sleep=0.02, include_storage=False)
+    pauses: list = []
+    monkeypatch.setattr("services.backup.time.sleep", pauses.append)
+
+    result = service.create_backup()
+
+    steps = -(-result.database_pages // 8)
+    assert steps > 1
+    # 最后一步之后不再停顿
+    assert pauses == [0.02] * (steps - 1)
+
+
+def test_storage_snapshot_is_hardlinked_and_isolated_from_later_writes(tmp_path, live):
+    database, storage = live
+    service = _service(tmp_path, database)
+    relative = "job-1/img-1/original.png"
+    live_file = storage.base_path / relative
+
+    result = service.create_backup()
+    snapshot_file = result.path / "storage" / relative
+
+    assert result.files_linked == 1 and result.files_copied == 0
+    assert snapshot_file.stat().st_ino == live_file.stat().st_ino
+    # 存储写入是原子替换，快照里的硬链接仍指向旧内容
+    storage.save_original("job-1", "img-1", b"replaced", filename="a.png")
+    assert snapshot_file.read_bytes() == b"original"
+
+
+def test_rotation_keeps_the_newest_snapshots(tmp_path, live):
+    database, _ = live
+    service = _service(tmp_path, database, retention=2, include_storage=False)
+    (tmp_path / "backups").mkdir()
+    (tmp_path / "backups" / "stale.partial").mkdir()
+
+    names = [service.create_backup().name for _ in range(3)]
+
+    assert [path.name for path in service.list_backups()] == names[:0:-1]
+    assert not (tmp_path / "backups" / "stale.partial").exists()
+
+
+def test_restore_replaces_database_and_storage(tmp_path, live):
+    database, storage = live
+    service = _service(tmp_path, database)
+    name = service.create_backup().name
+    with sqlite3.connect(database) as connection:
+        connection.execute("DELETE FROM items")
+    storage.delete_job_files("job-1")
+
+    with pytest.raises(ValidationError):
+        service.restore(name)
+    with pytest.raises(NotFoundError):
+        service.restore("missing", force=True)
+    assert main(["restore", "missing"]) == 1
+
+    service.restore(name, force=True)
+
+    assert _count(database) == 2000
+    assert storage.get_file("job-1/img-1/original.png") == b"original"
+    assert list(tmp_path.glob("storage.before-restore-*"))
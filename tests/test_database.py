@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from core.config import settings
+from core.database import _engine_options, create_app_engine, create_async_app_engine, sqlite_pragmas
+
+
+def test_sqlite_profile_uses_single_writer_and_read_pool():
+    writer = _engine_options("sqlite:///x.db")
+    reader = _engine_options("sqlite:///x.db", readonly=True)
+
+    assert (writer["pool_size"], writer["max_overflow"]) == (1, 0)
+    assert reader["pool_size"] == settings.SQLITE_READ_POOL_SIZE
+    assert "PRAGMA query_only=ON" in sqlite_pragmas(readonly=True)
+    assert "PRAGMA query_only=ON" not in sqlite_pragmas()
+
+
+def test_sqlite_connections_get_tuned_pragmas_and_readers_cannot_write(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    writer = create_app_engine(url)
+    reader = create_app_engine(url, readonly=True)
+    try:
+        with writer.begin() as connection:
+            connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+            assert connection.execute(text("PRAGMA cache_size")).scalar() == -settings.SQLITE_CACHE_SIZE_KB
+            assert connection.execute(text("PRAGMA wal_autocheckpoint")).scalar() == settings.SQLITE_WAL_AUTOCHECKPOINT
+
+        with reader.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM items")).scalar() == 0
+            with pytest.raises(OperationalError):
+                connection.execute(text("INSERT INTO items (id) VALUES (1)"))
+    finally:
+        writer.dispose()
+        reader.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_writes_queue_on_the_writer_connection(tmp_path):
+    pytest.importorskip("aiosqlite")
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    writer = create_async_app_engine(url)
+    async with writer.begin() as connection:
+        await connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)"))
+
+    async def insert(index: int) -> None:
+        async with writer.begin() as connection:
+            await connection.execute(text("INSERT INTO items (id, value) VALUES (:id, 'x')"), {"id": index})
+            # 持有写事务期间让出事件循环，其它写者在连接池排队而不是抢锁
+            await asyncio.sleep(0)
+
+    try:
+        await asyncio.gather(*(insert(index) for index in range(50)))
+        async with writer.connect() as connection:
+            assert (await connection.execute(text("SELECT count(*) FROM items"))).scalar() == 50
+        assert writer.pool.size() == 1
+    finally:
+        await writer.dispose()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import zlib
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from core.database import Base
+from migrations.split_editor_data import migrate
+from models import Job, Translation, TranslationEditorData
+from utils.compression import CODEC_ZLIB, compress_text, decompress_text
+
+
+TEMPLATE = json.dumps(
+    {"children": [{"type": "text", "content": "畅销品", "ocrContent": "Best Seller"}] * 50}, ensure_ascii=False
+)
+
+
+def test_compress_round_trip_shrinks_template():
+    codec, payload = compress_text(TEMPLATE)
+
+    assert decompress_text(codec, payload) == TEMPLATE
+    assert len(payload) < len(TEMPLATE.encode("utf-8")) / 5
+
+
+def test_zlib_payloads_stay_readable():
+    assert decompress_text(CODEC_ZLIB, zlib.compress(b"legacy")) == "legacy"
+
+
+def test_translation_editor_data_property_uses_side_table():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(Job.__table__.insert(), {"id": "job-1", "images_count": 1, "status": "PENDING"})
+
+    with Session(engine) as session:
+        session.add(
+            Translation(
+                id="t-1",
+                job_id="job-1",
+                image_uuid="img",
+                original_path="a.png",
+                source_lang="en",
+                target_lang="zh",
+                editor_data=TEMPLATE,
+            )
+        )
+        session.commit()
+
+    with Session(engine) as session:
+        blob = session.get(TranslationEditorData, "t-1")
+        assert blob.raw_size == len(TEMPLATE.encode("utf-8")) and len(blob.data) < blob.raw_size
+        translation = session.get(Translation, "t-1")
+        assert translation.editor_data == TEMPLATE
+        translation.editor_data = None
+        session.commit()
+        assert session.get(TranslationEditorData, "t-1") is None
+
+
+def test_migration_moves_inline_editor_data_and_drops_column(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE translations ADD COLUMN editor_data TEXT"))
+        connection.execute(Job.__table__.insert(), {"id": "job-1", "images_count": 3, "status": "PENDING"})
+        for index, editor_data in enumerate([TEMPLATE, None, '{"children": []}']):
+            connection.execute(
+                text(
+                    "INSERT INTO translations (id, job_id, image_uuid, order_index, original_path, source_lang, "
+                    "target_lang, field, enable_postprocess, status, created_at, updated_at, editor_data) VALUES "
+                    "(:id, 'job-1', :id, 0, 'a.png', 'en', 'zh', 'e-commerce', 1, 'PENDING', "
+                    "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, :editor_data)"
+                ),
+                {"id": f"t-{index}", "editor_data": editor_data},
+            )
+
+    assert migrate(engine, batch_size=2) == 2
+
+    assert "editor_data" not in {column["name"] for column in inspect(engine).get_columns("translations")}
+    with Session(engine) as session:
+        assert session.get(Translation, "t-0").editor_data == TEMPLATE
+        assert session.get(Translation, "t-1").editor_data is None
+        assert session.get(Translation, "t-2").editor_data == '{"children": []}'
+    assert migrate(engine) == 0
+    engine.dispose()
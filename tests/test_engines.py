@@ -0,0 +1,474 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+
+from core.config import settings
+from core.engines import EngineRegistry, TranslateEngine, TranslateResult
+from core.engines.aliyun import AliyunEngine
+from core.engines.circuit_breaker import CircuitBreaker, CircuitState
+from core.engines.pool import EnginePool
+from core.engines.rate_limit import DatabaseTokenBucket, SQLiteTokenBucket, TokenBucket
+from core.engines.retry import RetryBudget, RetryPolicy, is_engine_fault, is_retryable
+from core.engines.routing import RoutingPolicy, order_engines
+from core.engines.stats import EngineStats
+from core.engines.stub import StubEngine, StubUpstreamError
+from core.exceptions import (
+    EngineRejectedError,
+    EngineUnavailableError,
+    RateLimitError,
+    UpstreamTransientError,
+    ValidationError,
+)
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket("test", qps=10, burst=2, max_wait=5)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    delay = bucket.reserve()
+    assert delay is not None and 0.05 < delay <= 0.1
+    # 第四个请求排在第三个之后
+    assert bucket.reserve() > delay
+
+
+def test_token_bucket_rejects_beyond_max_wait():
+    bucket = TokenBucket("test", qps=1, burst=1, max_wait=0.5)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() is None
+
+
+def test_sqlite_token_bucket_is_shared_between_instances(tmp_path):
+    path = tmp_path / "budget.db"
+    first = SQLiteTokenBucket("aliyun", qps=5, burst=2, max_wait=5, path=path)
+    second = SQLiteTokenBucket("aliyun", qps=5, burst=2, max_wait=5, path=path)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    delay = first.reserve()
+    assert delay is not None and delay > 0
+
+
+def test_database_token_bucket_is_shared_between_instances(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    first = DatabaseTokenBucket("aliyun", qps=5, burst=2, max_wait=5, engine=engine)
+    second = DatabaseTokenBucket("aliyun", qps=5, burst=2, max_wait=5, engine=engine)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    delay = second.reserve()
+    assert delay is not None and delay > 0
+    assert first.reserve(max_wait=0) is None
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_acquire_raises_when_exhausted():
+    bucket = TokenBucket("test", qps=1, burst=1, max_wait=0.1)
+    await bucket.acquire()
+
+    with pytest.raises(RateLimitError):
+        await bucket.acquire()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        "test",
+        window_seconds=10,
+        min_requests=4,
+        error_rate_threshold=0.5,
+        open_seconds=2,
+        half_open_probes=1,
+        clock=clock,
+    )
+
+
+def test_circuit_breaker_trips_on_error_rate_and_recovers():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request() is False
+
+    clock.now += 2
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+    # 半开状态只放行一个探测请求
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.snapshot()["opened"] == 1
+
+
+def test_circuit_breaker_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.force_open()
+
+    clock.now += 2
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_circuit_breaker_forgets_old_failures():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 11
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+class SleepyEngine(TranslateEngine):
+    def __init__(self, name: str, delay: float, *, fail: bool = False, error: Exception | None = None):
+        self.name = name
+        super().__init__()
+        self.delay = delay
+        self.fail = fail
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def translate(self, **kwargs) -> TranslateResult:  # type: ignore[override]
+        await self.acquire_budget()
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        if self.fail:
+            raise ConnectionError(f"{self.name} down")
+        return TranslateResult(engine_name=self.name, translated_image=b"png")
+
+    async def health_check(self) -> bool:
+        return True
+
+
+@pytest.fixture()
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(EngineRegistry, "_engines", {})
+    monkeypatch.setattr(EngineRegistry, "_breakers", {})
+    monkeypatch.setattr(EngineRegistry, "_stats", {})
+    monkeypatch.setattr(EngineRegistry, "_default_engine", None)
+    monkeypatch.setattr(settings, "ENGINE_HEDGE_DEFAULT_DELAY", 0.05)
+    monkeypatch.setattr(settings, "ENGINE_HEDGE_MIN_DELAY", 0.01)
+    return EngineRegistry
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_prefers_first_success(isolated_registry):
+    slow = SleepyEngine("slow", 1.0)
+    fast = SleepyEngine("fast", 0.01)
+    isolated_registry.register(slow, default=True)
+    isolated_registry.register(fast)
+
+    result = await isolated_registry.translate_with_fallback(hedge=True)
+
+    assert result.engine_name == "fast"
+    await asyncio.sleep(0)
+    assert slow.cancelled is True
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_not_sent_when_primary_is_fast(isolated_registry):
+    primary = SleepyEngine("primary", 0.001)
+    backup = SleepyEngine("backup", 0.001)
+    isolated_registry.register(primary, default=True)
+    isolated_registry.register(backup)
+
+    result = await isolated_registry.translate_with_fallback(hedge=True)
+
+    assert result.engine_name == "primary"
+    assert backup.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_only_sent_when_budget_token_is_free(isolated_registry):
+    slow = SleepyEngine("slow", 0.2)
+    backup = SleepyEngine("backup", 0.01)
+    backup.rate_limiter = TokenBucket("backup", qps=0.01, burst=1, max_wait=0)
+    isolated_registry.register(slow, default=True)
+    isolated_registry.register(backup)
+
+    # 预占的令牌被对冲请求直接使用，不会再扣一次
+    assert (await isolated_registry.translate_with_fallback(hedge=True)).engine_name == "backup"
+    # 令牌用完后不再对冲，等主引擎返回
+    assert (await isolated_registry.translate_with_fallback(hedge=True)).engine_name == "slow"
+    assert backup.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_fallback_moves_to_next_engine_on_failure(isolated_registry):
+    broken = SleepyEngine("broken", 0, fail=True)
+    healthy = SleepyEngine("healthy", 0)
+    isolated_registry.register(broken, default=True)
+    isolated_registry.register(healthy)
+
+    result = await isolated_registry.translate_with_fallback()
+
+    assert result.engine_name == "healthy"
+    assert isolated_registry.breaker_stats()["broken"]["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_request_does_not_count_against_engine(isolated_registry):
+    engine = SleepyEngine("picky", 0, error=EngineRejectedError("翻译失败: 图片格式不支持"))
+    isolated_registry.register(engine, default=True)
+
+    with pytest.raises(Exception):
+        await isolated_registry.translate_with_fallback()
+
+    assert isolated_registry.breaker_stats()["picky"]["failures"] == 0
+    assert isolated_registry.latency_stats()["picky"]["error_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [EngineRejectedError("翻译失败: 图片格式不支持"), ValueError("bad image")])
+async def test_invalid_request_costs_exactly_one_engine_call(isolated_registry, error):
+    regions = [SleepyEngine("aliyun@a", 0, error=error), SleepyEngine("aliyun@b", 0, error=error)]
+    other = SleepyEngine("other", 0, error=error)
+    isolated_registry.register(EnginePool("aliyun", regions), default=True)
+    isolated_registry.register(other)
+
+    for calls, hedge in enumerate((False, True), start=1):
+        with pytest.raises(type(error)):
+            await isolated_registry.translate_with_fallback(hedge=hedge)
+        # 一次坏请求只调用一次上游，不在区域和引擎之间来回重试
+        assert sum(engine.calls for engine in [*regions, other]) == calls
+
+
+def test_aliyun_body_errors_carry_code_and_classification():
+    def body(code: str) -> SimpleNamespace:
+        return SimpleNamespace(code=code, message="error", request_id="req-1", data=None)
+
+    rejected = AliyunEngine._body_error(body("10005"))
+    assert isinstance(rejected, EngineRejectedError) and rejected.details["code"] == "10005"
+    assert rejected.status_code < 500 and not is_engine_fault(rejected)
+
+    for code in ("10002", "Throttling.User", "503", "200"):
+        error = AliyunEngine._body_error(body(code))
+        assert isinstance(error, UpstreamTransientError), code
+        assert is_retryable(error) and is_engine_fault(error)
+    assert not is_engine_fault(RateLimitError("限流"))
+
+
+def _stats(name: str, latency: float | None, errors: int = 0) -> EngineStats:
+    stats = EngineStats(name, alpha=0.5)
+    if latency is not None:
+        stats.record(latency)
+    for _ in range(errors):
+        stats.record(latency or 0, ok=False)
+    return stats
+
+
+def test_least_latency_routing_prefers_fastest_engine():
+    stats = {"a": _stats("a", 2.0), "b": _stats("b", 0.5), "c": _stats("c", None)}
+
+    ordered = order_engines(["a", "b", "c"], stats, {}, RoutingPolicy.LEAST_LATENCY)
+
+    # 未观测过的引擎优先探索，其余按延迟排序
+    assert ordered == ["c", "b", "a"]
+
+
+def test_least_latency_routing_penalizes_errors():
+    stats = {"a": _stats("a", 1.0), "b": _stats("b", 0.8, errors=3)}
+
+    assert order_engines(["a", "b"], stats, {}, RoutingPolicy.LEAST_LATENCY) == ["a", "b"]
+
+
+def test_routing_ranks_engine_that_only_fails_last():
+    stats = {"failing": _stats("failing", None, errors=2), "slow": _stats("slow", 5.0), "new": _stats("new", None)}
+
+    ordered = order_engines(["failing", "slow", "new"], stats, {}, RoutingPolicy.LEAST_LATENCY)
+
+    assert ordered == ["new", "slow", "failing"]
+    assert order_engines(["failing", "slow"], stats, {}, RoutingPolicy.POWER_OF_TWO)[0] == "slow"
+
+
+def test_cost_capped_routing_keeps_expensive_engines_as_fallback():
+    stats = {"cheap": _stats("cheap", 3.0), "pricey": _stats("pricey", 0.1)}
+    costs = {"cheap": 0.01, "pricey": 1.0}
+
+    ordered = order_engines(["pricey", "cheap"], stats, costs, RoutingPolicy.COST_CAPPED, cost_cap=0.5)
+
+    assert ordered == ["cheap", "pricey"]
+
+
+def test_priority_routing_keeps_order():
+    stats = {"a": _stats("a", 5.0), "b": _stats("b", 0.1)}
+
+    assert order_engines(["a", "b"], stats, {}, RoutingPolicy.PRIORITY) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_engine_pool_fails_over_between_members():
+    down = SleepyEngine("aliyun@cn-hangzhou", 0, fail=True)
+    up = SleepyEngine("aliyun@ap-southeast-1", 0)
+    pool = EnginePool("aliyun", [down, up])
+
+    result = await pool.translate()
+
+    assert result.engine_name == "aliyun@ap-southeast-1"
+    members = {item["name"]: item for item in pool.describe_members()}
+    assert members["aliyun@cn-hangzhou"]["circuit"]["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_pool_spreads_concurrent_calls():
+    first = SleepyEngine("a", 0.02)
+    second = SleepyEngine("b", 0.02)
+    pool = EnginePool("pool", [first, second])
+
+    await asyncio.gather(*(pool.translate() for _ in range(4)))
+
+    assert first.calls == 2
+    assert second.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_pool_does_not_mark_member_unhealthy_for_rejected_input():
+    picky = SleepyEngine("a", 0, error=EngineRejectedError("翻译失败: 图片格式不支持"))
+    pool = EnginePool("pool", [picky, SleepyEngine("b", 0)])
+
+    with pytest.raises(EngineRejectedError):
+        await pool.translate()
+
+    member = pool.describe_members()[0]
+    assert member["circuit"]["failures"] == 0
+    assert member["latency"]["error_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_engine_pool_members_share_the_account_budget():
+    shared = TokenBucket("account", qps=1, burst=1, max_wait=0)
+    first, second = SleepyEngine("a", 0), SleepyEngine("b", 0)
+    first.rate_limiter = second.rate_limiter = shared
+    pool = EnginePool("pool", [first, second])
+
+    await pool.translate()
+    with pytest.raises(EngineUnavailableError):
+        await pool.translate()
+
+    assert first.calls + second.calls == 1
+    regional = [AliyunEngine(name=f"aliyun@{region}", region=region) for region in ("a", "b")]
+    assert {engine.rate_limiter.name for engine in regional} == {"aliyun"}
+
+
+def test_aliyun_engine_uses_region_endpoint():
+    engine = AliyunEngine(name="aliyun@ap-southeast-1", region="ap-southeast-1")
+
+    assert engine.endpoint == "mt.ap-southeast-1.aliyuncs.com"
+    assert engine.client._endpoint == "mt.ap-southeast-1.aliyuncs.com"
+
+
+def _retry_policy(*, min_retries: int = 5, max_attempts: int = 3) -> RetryPolicy:
+    budget = RetryBudget(ratio=0.0, min_retries=min_retries, window_seconds=10)
+    return RetryPolicy(max_attempts=max_attempts, base_delay=0, budget=budget)
+
+
+def test_retry_classification():
+    assert is_retryable(TimeoutError()) is True
+    assert is_retryable(RateLimitError("限流")) is True
+    assert is_retryable(ValidationError("参数错误")) is False
+    assert is_retryable(ValueError("bad")) is False
+    assert is_retryable(EngineUnavailableError("down")) is False
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_retries_transient_errors():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError("slow")
+        return "ok"
+
+    assert await _retry_policy().run(flaky) == "ok"
+    assert len(attempts) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_does_not_retry_client_errors():
+    attempts = []
+
+    async def invalid():
+        attempts.append(1)
+        raise ValidationError("参数错误")
+
+    with pytest.raises(ValidationError):
+        await _retry_policy().run(invalid)
+    assert len(attempts) == 1
+
+
+def test_retry_budget_caps_retries():
+    policy = _retry_policy(min_retries=1, max_attempts=5)
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        policy.run_sync(failing)
+    # 预算只允许一次重试
+    assert len(attempts) == 2
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color="orange").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_stub_engine_is_deterministic_and_keeps_size():
+    engine = StubEngine(latency_median=0, error_rate=0)
+    image = _png(120, 80)
+    kwargs = dict(image=image, source_lang="en", target_lang="zh", field="e-commerce")
+
+    first = await engine.translate(**kwargs)
+    second = await engine.translate(**kwargs)
+
+    assert Image.open(BytesIO(first.translated_image)).size == (120, 80)
+    assert first.translated_image == second.translated_image
+    assert first.layers == second.layers and first.layers
+    template = json.loads(first.editor_data)
+    assert template["children"][0]["label"] == "element"
+
+
+@pytest.mark.asyncio
+async def test_stub_engine_injects_retryable_errors():
+    engine = StubEngine(latency_median=0, error_rate=1.0)
+
+    with pytest.raises(StubUpstreamError) as excinfo:
+        await engine.translate(image=_png(10, 10), source_lang="en", target_lang="zh", field="general")
+    assert is_retryable(excinfo.value) is True
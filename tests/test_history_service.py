@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select, text, tuple_
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base, create_app_engine, create_async_app_engine
+from core.exceptions import ValidationError
+from models import Job, Translation, TranslationStatus
+from services.history import (
+    HistoryCountCache,
+    HistoryService,
+    _history_filters,
+    decode_cursor,
+    encode_cursor,
+)
+from services.storage import StorageService
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def _seed(session_factory, count: int = 30) -> None:
+    started = datetime(2024, 1, 1)
+    with session_factory() as session:
+        job = Job(id="job-1", images_count=count)
+        session.add(job)
+        for index in range(count):
+            session.add(
+                Translation(
+                    id=f"t-{index:03d}",
+                    job_id=job.id,
+                    image_uuid=f"img-{index}",
+                    original_path=f"jobs/job-1/{index}.png",
+                    source_lang="en" if index % 2 else "ja",
+                    target_lang="zh" if index % 3 else "ko",
+                    status=TranslationStatus.DONE,
+                    # 每两条共享一个时间戳，验证 id 作为次级排序键
+                    created_at=started + timedelta(minutes=index // 2),
+                )
+            )
+        session.commit()
+
+
+def _plan(session_factory, statement) -> str:
+    compiled = statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    with session_factory() as session:
+        rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_list_history_orders_by_created_at_then_id(session_factory):
+    _seed(session_factory)
+    service = HistoryService(session_factory=session_factory)
+
+    items, total = service.list_history(page=1, limit=4)
+
+    assert total == 30
+    assert [item.id for item in items] == ["t-029", "t-028", "t-027", "t-026"]
+
+
+def test_list_history_filters_and_counts_across_pages(session_factory):
+    _seed(session_factory)
+    service = HistoryService(session_factory=session_factory)
+
+    page1, total = service.list_history(page=1, limit=3, source_lang="en", target_lang="zh")
+    page2, _ = service.list_history(page=2, limit=3, source_lang="en", target_lang="zh")
+
+    expected = [f"t-{index:03d}" for index in range(29, -1, -1) if index % 2 and index % 3]
+    assert total == len(expected)
+    assert [item.id for item in page1 + page2] == expected[:6]
+
+
+@pytest.mark.parametrize(
+    "filters, index_name",
+    [
+        ({}, "ix_translations_created_id"),
+        ({"source_lang": "en"}, "ix_translations_source_created_id"),
+        ({"target_lang": "zh"}, "ix_translations_target_created_id"),
+        ({"source_lang": "en", "target_lang": "zh"}, "ix_translations_langs_created_id"),
+    ],
+)
+def test_history_queries_use_composite_index_without_sort(session_factory, filters, index_name):
+    conditions = _history_filters(
+        filters.get("source_lang"), filters.get("target_lang"), datetime(2024, 1, 1), None
+    )
+    statement = (
+        select(Translation)
+        .where(*conditions)
+        .order_by(Translation.created_at.desc(), Translation.id.desc())
+        .limit(20)
+    )
+
+    plan = _plan(session_factory, statement)
+
+    assert index_name in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_keyset_pages_walk_forward_and_back(session_factory):
+    _seed(session_factory)
+    service = HistoryService(session_factory=session_factory)
+
+    first, has_more = service.list_history_keyset(limit=4)
+    assert has_more
+    second, _ = service.list_history_keyset(limit=4, after=(first[-1].created_at, first[-1].id))
+    back, has_newer = service.list_history_keyset(limit=4, before=(second[0].created_at, second[0].id))
+
+    assert [item.id for item in first + second] == [f"t-{index:03d}" for index in range(29, 21, -1)]
+    assert [item.id for item in back] == [item.id for item in first]
+    assert has_newer is False
+
+    last, has_more = service.list_history_keyset(limit=4, after=(datetime(2024, 1, 1), "t-001"))
+    assert [item.id for item in last] == ["t-000"]
+    assert has_more is False
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    key = (datetime(2024, 5, 1, 8, 30), "abc")
+
+    assert decode_cursor(encode_cursor(key, "prev")) == (key, "prev")
+    with pytest.raises(ValidationError):
+        decode_cursor("definitely-not-a-cursor")
+
+
+def test_keyset_query_seeks_the_index(session_factory):
+    conditions = _history_filters(None, "zh", None, None)
+    statement = (
+        select(Translation)
+        .where(*conditions, tuple_(Translation.created_at, Translation.id) < tuple_(datetime(2024, 1, 1), "t-010"))
+        .order_by(Translation.created_at.desc(), Translation.id.desc())
+        .limit(21)
+    )
+
+    plan = _plan(session_factory, statement)
+
+    assert "ix_translations_target_created_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def _add_translation(session_factory, record_id: str, target_lang: str) -> None:
+    with session_factory() as session:
+        session.add(
+            Translation(
+                id=record_id,
+                job_id="job-1",
+                image_uuid=record_id,
+                original_path=f"jobs/job-1/{record_id}.png",
+                source_lang="en",
+                target_lang=target_lang,
+                created_at=datetime(2024, 2, 1),
+            )
+        )
+        session.commit()
+
+
+def test_count_cache_serves_repeat_counts_until_exact(session_factory):
+    _seed(session_factory)
+    service = HistoryService(session_factory=session_factory, count_cache=HistoryCountCache(ttl=60))
+    assert service.count_history(target_lang="ko", exact=False) == 10
+
+    # Core 插入不触发 ORM 事件：非精确模式继续返回缓存值，精确模式重新计数
+    with session_factory() as session:
+        session.execute(
+            insert(Translation),
+            [
+                {
+                    "id": "core-1",
+                    "job_id": "job-1",
+                    "image_uuid": "core-1",
+                    "original_path": "jobs/job-1/core-1.png",
+                    "source_lang": "en",
+                    "target_lang": "ko",
+                }
+            ],
+        )
+        session.commit()
+
+    assert service.count_history(target_lang="ko", exact=False) == 10
+    assert service.count_history(target_lang="ko", exact=True) == 11
+    assert service.count_history(target_lang="ko", exact=False) == 11
+
+
+def test_count_cache_invalidated_by_matching_orm_writes_only(session_factory):
+    _seed(session_factory)
+    cache = HistoryCountCache(ttl=60)
+    service = HistoryService(session_factory=session_factory, count_cache=cache)
+    service.count_history(target_lang="ko", exact=False)
+    service.count_history(target_lang="zh", exact=False)
+
+    _add_translation(session_factory, "new-zh", "zh")
+
+    assert cache.get(HistoryCountCache.key(None, "ko", None, None)) == 10
+    assert cache.get(HistoryCountCache.key(None, "zh", None, None)) is None
+    assert service.count_history(target_lang="zh", exact=False) == 21
+
+    service.delete_translation("new-zh")
+    assert service.count_history(target_lang="zh", exact=False) == 20
+
+
+def test_count_cache_invalidated_on_commit_not_flush(session_factory):
+    _seed(session_factory)
+    cache = HistoryCountCache(ttl=60)
+    service = HistoryService(session_factory=session_factory, count_cache=cache)
+    key = HistoryCountCache.key(None, "zh", None, None)
+
+    with session_factory() as session:
+        session.delete(session.get(Translation, "t-001"))
+        session.flush()
+        # 提交前另一个连接开始的计数：拿到当前 generation，数到的仍是旧行
+        generation = cache.generation
+        cache.set(key, 20, generation=generation)
+        session.rollback()
+    assert cache.get(key) == 20 and cache.generation == generation
+
+    with session_factory() as session:
+        session.delete(session.get(Translation, "t-001"))
+        session.flush()
+        generation = cache.generation
+        session.commit()
+    cache.set(key, 20, generation=generation)
+    assert cache.get(key) is None
+    assert service.count_history(target_lang="zh", exact=False) == 19
+
+
+def test_count_cache_expires_after_ttl(monkeypatch):
+    cache = HistoryCountCache(ttl=5)
+    key = HistoryCountCache.key("en", None, None, None)
+    cache.set(key, 7)
+    now = time.monotonic()
+    monkeypatch.setattr("services.history.time.monotonic", lambda: now + 10)
+
+    assert cache.get(key) is None
+
+
+def test_history_reads_skip_editor_data_until_requested(session_factory):
+    _seed(session_factory, count=3)
+    with session_factory() as session:
+        session.get(Translation, "t-002").editor_data = '{"children": []}'
+        session.commit()
+    service = HistoryService(session_factory=session_factory, count_cache=HistoryCountCache(ttl=60))
+    statements: list[str] = []
+    engine = session_factory.kw["bind"]
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        items, _ = service.list_history(page=1, limit=3)
+        keyset, _ = service.list_history_keyset(limit=3)
+        detail = service.get_translation("t-002")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert not any("editor_data" in statement for statement in statements)
+    assert items[0].status is TranslationStatus.DONE and keyset[0].id == "t-002"
+    assert not hasattr(detail, "editor_data")
+    assert service.get_editor_data("t-002")["editor_data"] == '{"children": []}'
+
+
+@pytest.mark.asyncio
+async def test_async_variants_run_on_async_engine_without_threads(tmp_path, monkeypatch):
+    pytest.importorskip("aiosqlite")
+    url = f"sqlite:///{tmp_path / 'history.db'}"
+    sync_engine = create_app_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    session_factory = sessionmaker(bind=sync_engine, expire_on_commit=False)
+    _seed(session_factory, count=5)
+    async_engine = create_async_app_engine(url)
+    service = HistoryService(
+        session_factory=session_factory,
+        count_cache=HistoryCountCache(ttl=60),
+        async_session_factory=async_sessionmaker(bind=async_engine, expire_on_commit=False),
+        storage_service=StorageService(base_path=tmp_path / "storage"),
+    )
+
+    async def no_threads(*args, **kwargs):
+        raise AssertionError("DB access must not use the default executor")
+
+    monkeypatch.setattr(asyncio, "to_thread", no_threads)
+    try:
+        items, has_more = await service.list_history_keyset_async(limit=2)
+        total = await service.count_history_async(exact=True)
+        detail = await service.get_translation_async("t-004")
+        editor = await service.get_editor_data_async("t-004")
+    finally:
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+    assert [item.id for item in items] == ["t-004", "t-003"] and has_more
+    assert total == 5
+    assert detail.status is TranslationStatus.DONE
+    assert editor["editor_data"] is None
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.datastructures import Headers
+
+from core.config import Settings
+from core.database import Base, _engine_options
+from models import Job, JobStatus, Translation, TranslationStatus
+from services.history import HistoryCountCache
+from services.job_queue import JobQueueService, claim_statement
+from services.queue_notify import NOTIFY_PAYLOAD_LIMIT, QueueWakeup
+from services.sse_manager import SSEEvent, SSEManager
+from services.storage import StorageService
+from services.translator import TranslateParams
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _queue(engine, **kwargs) -> JobQueueService:
+    return JobQueueService(
+        sessionmaker(bind=engine, expire_on_commit=False),
+        storage_service=StorageService(),
+        translator_factory=lambda: None,  # type: ignore[return-value, arg-type]
+        wakeup=QueueWakeup(engine, channel="translation_queue"),
+        **kwargs,
+    )
+
+
+def test_claim_statement_skips_locked_rows_on_postgres_only():
+    assert "SKIP LOCKED" in str(claim_statement("postgresql"))
+    assert "SKIP LOCKED" not in str(claim_statement("sqlite"))
+    assert str(claim_statement("mysql")) == str(claim_statement("sqlite"))
+
+
+@pytest.mark.asyncio
+async def test_pull_pending_claims_oldest_once(engine):
+    session_factory = sessionmaker(bind=engine)
+    started = datetime(2024, 1, 1)
+    with session_factory() as session:
+        session.add(Job(id="job-1", images_count=2))
+        for index in range(2):
+            session.add(
+                Translation(
+                    id=f"t-{index}",
+                    job_id="job-1",
+                    image_uuid=f"img-{index}",
+                    original_path="a.png",
+                    source_lang="en",
+                    target_lang="zh",
+                    created_at=started + timedelta(minutes=1 - index),
+                )
+            )
+        session.commit()
+    queue = _queue(engine)
+
+    claimed = [await queue._pull_pending_translation() for _ in range(3)]
+
+    assert [translation.id if translation else None for translation in claimed] == ["t-1", "t-0", None]
+    with session_factory() as session:
+        assert {row.status for row in session.query(Translation)} == {TranslationStatus.PROCESSING}
+        # 认领与任务状态更新在同一次提交中完成
+        assert session.get(Job, "job-1").status is JobStatus.PROCESSING
+
+
+@pytest.mark.asyncio
+async def test_wakeup_interrupts_idle_wait(engine):
+    wakeup = QueueWakeup(engine, channel="translation_queue")
+    wakeup.start()
+    assert wakeup.cross_process is False
+
+    asyncio.get_running_loop().call_later(0.05, wakeup.wake)
+    started = time.monotonic()
+    await wakeup.wait(5)
+
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_start_spawns_configured_worker_count(engine):
+    queue = _queue(engine, workers=3, poll_interval=0.01)
+    await queue.start()
+    tasks = list(queue._worker_tasks)
+    await queue.start()
+
+    assert len(tasks) == 3 and queue._worker_tasks == tasks
+    queue.shutdown()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(task.done() for task in tasks)
+
+
+class LoopbackWakeup(QueueWakeup):
+    """Stands in for PostgreSQL: a broadcast reaches every listener from another thread."""
+
+    cross_process = True
+    listening = True
+
+    def __init__(self, engine, listeners: list) -> None:
+        super().__init__(engine, channel="translation_queue")
+        self.listeners = listeners
+        listeners.append(self)
+
+    def broadcast(self, payload: str) -> None:
+        if len(payload.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+            raise ValueError("payload too large")
+        for listener in self.listeners:
+            thread = threading.Thread(target=listener.deliver, args=(payload,))
+            thread.start()
+            thread.join()
+
+    def _listen(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_job_events_are_relayed_to_every_instance(engine):
+    listeners: list = []
+    worker = _queue(engine, sse_manager=SSEManager())
+    worker._wakeup = LoopbackWakeup(engine, listeners)
+    worker._wakeup.on_message(worker._relay_event)
+    api = JobQueueService(
+        sessionmaker(bind=engine),
+        storage_service=StorageService(),
+        translator_factory=lambda: None,  # type: ignore[return-value, arg-type]
+        sse_manager=SSEManager(),
+        wakeup=LoopbackWakeup(engine, listeners),
+    )
+    for listener in listeners:
+        listener.start()
+    remote = await api._sse.subscribe("job-1")
+    local = await worker._sse.subscribe("job-1")
+    event = SSEEvent(event="complete", data={"job_id": "job-1", "completed": 1})
+
+    await worker._publish("job-1", event)
+
+    # 订阅者连在哪个实例都能收到，认领任务的实例也只收到一次
+    assert await asyncio.wait_for(remote.get(), 1) == event
+    assert await asyncio.wait_for(local.get(), 1) == event
+    await asyncio.sleep(0)
+    assert remote.empty() and local.empty()
+    # 超过 NOTIFY 负载上限时退回到只推本实例
+    await worker._publish("job-1", SSEEvent(event="error", data={"error": "x" * 9000}))
+    assert (await asyncio.wait_for(local.get(), 1)).event == "error"
+    assert remote.empty()
+
+
+def test_database_url_selects_backend_options():
+    assert Settings(DATABASE_URL="").database_url.startswith("sqlite:///")
+    url = "postgresql+psycopg2://user:secret@db:5432/app"
+    assert Settings(DATABASE_URL=url).database_url == url
+    # QPS 预算默认跟随数据库：PostgreSQL 下存应用库，跨主机共享
+    assert Settings(DATABASE_URL="").rate_limit_backend == "sqlite"
+    assert Settings(DATABASE_URL=url).rate_limit_backend == "database"
+    assert Settings(DATABASE_URL=url, ENGINE_RATE_LIMIT_BACKEND="memory").rate_limit_backend == "memory"
+
+    options = _engine_options(url)
+    assert "connect_args" not in options and options["pool_pre_ping"]
+    assert _engine_options("sqlite:///x.db")["connect_args"]["check_same_thread"] is False
+    with pytest.raises(ValueError):
+        QueueWakeup(create_engine("sqlite://"), channel="bad; DROP")
+
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_create_job_inserts_all_rows_in_one_statement(engine, tmp_path):
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    queue = JobQueueService(
+        session_factory,
+        storage_service=StorageService(base_path=tmp_path),
+        translator_factory=lambda: None,  # type: ignore[return-value, arg-type]
+        wakeup=QueueWakeup(engine, channel="translation_queue"),
+        workers=1,
+    )
+    files = [
+        UploadFile(io.BytesIO(_png()), filename=f"{index}.png", headers=Headers({"content-type": "image/png"}))
+        for index in range(4)
+    ]
+    cache = HistoryCountCache(ttl=60)
+    cache.set(HistoryCountCache.key("en", "zh", None, None), 0)
+    inserts: list = []
+    listener = lambda conn, cursor, statement, params, context, executemany: (  # noqa: E731
+        inserts.append(executemany) if statement.startswith("INSERT INTO translations") else None
+    )
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = await queue.create_job(files, masks=None, params=TranslateParams(source_lang="en", target_lang="zh"))
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+        queue.shutdown()
+
+    assert inserts == [True]
+    with session_factory() as session:
+        rows = session.query(Translation).filter(Translation.job_id == result.job_id).order_by(Translation.order_index)
+        assert [row.order_index for row in rows] == [0, 1, 2, 3]
+        assert len({row.id for row in rows}) == 4
+        assert session.get(Job, result.job_id).images_count == 4
+    # Core 批量插入绕过 ORM 事件，计数缓存需要显式失效
+    assert cache.get(HistoryCountCache.key("en", "zh", None, None)) is None
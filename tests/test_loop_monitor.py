@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from core.loop_monitor import LoopMonitor
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_measures_lag():
+    monitor = LoopMonitor(interval=0.01)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.02)
+        _block_loop(0.1)
+        await asyncio.sleep(0.03)
+    finally:
+        await monitor.stop()
+
+    assert monitor.max_lag >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_blocking_detector_reports_blocking_stack():
+    monitor = LoopMonitor(interval=0.01, blocking_threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.02)
+        _block_loop(0.3)
+        await asyncio.sleep(0.02)
+    finally:
+        await monitor.stop()
+
+    assert monitor.reports
+    assert "_block_loop" in monitor.reports[0]
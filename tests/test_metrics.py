@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+
+from core.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test histogram.", ("stage",), buckets=(0.1, 1.0))
+
+    histogram.observe(0.05, stage="a")
+    histogram.observe(0.5, stage="a")
+    histogram.observe(5.0, stage="a")
+
+    text = registry.render()
+    assert 'test_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{stage="a",le="1"} 2' in text
+    assert 'test_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'test_seconds_count{stage="a"} 3' in text
+    assert histogram.stats(stage="a") == (3, pytest.approx(5.55))
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter.", ("outcome",))
+    gauge = registry.gauge("test_depth", "Test gauge.")
+    lazy = registry.gauge("test_lazy", "Computed at scrape time.", collect=lambda: 7)
+
+    counter.inc(outcome="ok")
+    counter.inc(2, outcome="ok")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+    assert 'test_total{outcome="ok"} 3' in text
+    assert "test_depth 1" in text
+    assert "test_lazy 7" in text
+    assert lazy.value() == 7
+
+
+def test_metric_rejects_unknown_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter.", ("engine",))
+
+    with pytest.raises(ValueError):
+        counter.inc(stage="x")
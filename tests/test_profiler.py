@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from core.profiler import ProfilerBusyError, SamplingProfiler, render_collapsed
+
+
+def _busy_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def test_profiler_collects_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="busy worker")
+    worker.start()
+    try:
+        stacks, samples = SamplingProfiler().profile(0.05, 0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert samples > 0
+    output = render_collapsed(stacks)
+    assert any(line.startswith("thread:busy_worker;") and "_busy_worker" in line for line in output.splitlines())
+
+
+def test_profiler_rejects_concurrent_profiles():
+    profiler = SamplingProfiler()
+    profiler._lock.acquire()
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profiler.profile(0.01)
+    finally:
+        profiler._lock.release()
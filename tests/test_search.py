@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from core.exceptions import ValidationError
+from models import Job, TextLayer, Translation
+from services.search import SEARCH_TABLE, HistorySearchService, ensure_search_index, extract_editor_text
+
+
+def _template(*pairs: tuple[str, str]) -> str:
+    children = [{"type": "text", "ocrContent": source, "content": target} for source, target in pairs]
+    return json.dumps({"children": [{"type": "group", "children": children}]}, ensure_ascii=False)
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(engine):
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _add(session_factory, record_id: str, editor_data: str | None = None) -> None:
+    with session_factory() as session:
+        if session.get(Job, "job-1") is None:
+            session.add(Job(id="job-1", images_count=1))
+        session.add(
+            Translation(
+                id=record_id,
+                job_id="job-1",
+                image_uuid=record_id,
+                original_path=f"jobs/job-1/{record_id}.png",
+                source_lang="en",
+                target_lang="zh",
+                editor_data=editor_data,
+            )
+        )
+        session.commit()
+
+
+def test_extract_editor_text_walks_nested_children():
+    originals, translated = extract_editor_text(_template(("Best Seller", "畅销品"), ("Ingredients", "主要成分")))
+
+    assert originals == ["Best Seller", "Ingredients"]
+    assert translated == ["畅销品", "主要成分"]
+    assert extract_editor_text("not json") == ([], [])
+
+
+def test_search_matches_editor_text_with_highlights(session_factory):
+    _add(session_factory, "t-1", _template(("Best Seller", "畅销品")))
+    _add(session_factory, "t-2", _template(("Free shipping", "包邮")))
+    service = HistorySearchService(session_factory=session_factory)
+
+    results = service.search("best sell")
+
+    assert [translation.id for translation, _ in results] == ["t-1"]
+    assert results[0][1]["original"] == ["<mark>Best Sell</mark>er"]
+    assert service.search("畅销品")[0][1]["translated"] == ["<mark>畅销品</mark>"]
+    # 少于 3 个字符时 trigram 无法 MATCH，退化为对索引表的 LIKE
+    assert [translation.id for translation, _ in service.search("包邮")] == ["t-2"]
+
+
+def test_search_highlights_escape_markup_from_layer_text(session_factory):
+    _add(session_factory, "t-1")
+    with session_factory() as session:
+        session.add(
+            TextLayer(
+                translation_id="t-1",
+                bbox=[0, 0, 10, 10],
+                original_text='<script>alert("sale")</script> & more',
+                translated_text="促销",
+                style={},
+            )
+        )
+        session.commit()
+    service = HistorySearchService(session_factory=session_factory)
+
+    (_, highlights), = service.search("sale")
+
+    assert highlights["original"] == ["&lt;script&gt;alert(&quot;<mark>sale</mark>&quot;)&lt;/script&gt; &amp; more"]
+    assert service.search("<script>")[0][1]["original"][0].startswith("<mark>&lt;script&gt;</mark>")
+
+
+def test_search_index_follows_editor_data_layers_and_deletes(session_factory):
+    _add(session_factory, "t-1")
+    service = HistorySearchService(session_factory=session_factory)
+    assert service.search("Seller") == []
+
+    with session_factory() as session:
+        translation = session.get(Translation, "t-1")
+        translation.editor_data = _template(("Best Seller", "畅销品"))
+        session.add(
+            TextLayer(
+                translation_id="t-1",
+                bbox=[0, 0, 10, 10],
+                original_text="Limited offer",
+                translated_text="限时优惠",
+                style={},
+            )
+        )
+        session.commit()
+    assert [translation.id for translation, _ in service.search("Seller")] == ["t-1"]
+    assert [translation.id for translation, _ in service.search("限时优惠")] == ["t-1"]
+
+    with session_factory() as session:
+        layer = session.query(TextLayer).one()
+        layer.translated_text = "今日特价"
+        session.commit()
+    assert service.search("限时优惠") == []
+    assert [translation.id for translation, _ in service.search("今日特价")] == ["t-1"]
+
+    with session_factory() as session:
+        session.delete(session.get(Translation, "t-1"))
+        session.commit()
+    assert service.search("Seller") == []
+    with session_factory() as session:
+        assert session.execute(text(f"SELECT count(*) FROM {SEARCH_TABLE}")).scalar() == 0
+
+
+def test_ensure_search_index_backfills_existing_database(engine, session_factory):
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TRIGGER {SEARCH_TABLE}_ad"))
+        connection.execute(text(f"DROP TABLE {SEARCH_TABLE}"))
+    _add(session_factory, "t-1", _template(("Best Seller", "畅销品")))
+
+    assert ensure_search_index(engine) is True
+    results = HistorySearchService(session_factory=session_factory).search("Seller")
+
+    assert [translation.id for translation, _ in results] == ["t-1"]
+
+
+def test_search_rejects_blank_query(session_factory):
+    with pytest.raises(ValidationError):
+        HistorySearchService(session_factory=session_factory).search("   ")
@@ -38,6 +38,7 @@ def test_translator_service_returns_bytes(monkeypatch):
             *,
             protect_product=None,
             engine=None,
+            hedge=False,
         ):  # type: ignore[override]
             _ = (image, source_lang, target_lang, field, enable_postprocess, protect_product, engine)
             # 返回 TranslationOutput，包含 image_bytes
@@ -66,3 +67,17 @@ def test_translator_service_returns_bytes(monkeypatch):
     assert len(result.image_bytes) > 10
     assert result.editor_data == '{"test": true}'
     assert result.inpainting_url == "https://example.com/bg.png"
+
+
+def test_cache_service_tracks_size_in_bytes():
+    cache = CacheService(max_size=2)
+    cache.set("a", b"12345")
+    cache.set("a", b"123")
+    cache.set("b", b"12")
+    assert cache.size_bytes() == 5
+
+    cache.set("c", b"1")  # evicts "a"
+    assert cache.size_bytes() == 3
+
+    cache.delete("b")
+    assert cache.size_bytes() == 1
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from core.tracing import NOOP_SPAN, InMemorySpanExporter, Tracer
+
+
+def test_disabled_tracer_returns_noop_span():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=False, exporter=exporter)
+
+    with tracer.start_span("noop") as span:
+        span.set_attribute("ignored", True)
+
+    assert span is NOOP_SPAN
+    assert exporter.get_trace("anything") == []
+
+
+@pytest.mark.asyncio
+async def test_child_spans_share_trace_across_threads_and_tasks():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=True, exporter=exporter)
+
+    def blocking_step():
+        with tracer.start_span("thread.step"):
+            pass
+
+    async def task_step():
+        with tracer.start_span("task.step"):
+            await asyncio.sleep(0)
+
+    with tracer.start_span("root", {"translation_id": "tr-1"}) as root:
+        await asyncio.to_thread(blocking_step)
+        await asyncio.create_task(task_step())
+
+    spans = exporter.get_trace(root.trace_id)
+    assert {span.name for span in spans} == {"root", "thread.step", "task.step"}
+    assert all(span.parent_id == root.span_id for span in spans if span.name != "root")
+    assert list(exporter.find_traces("tr-1")) == [root.trace_id]
+
+
+def test_span_records_errors():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(enabled=True, exporter=exporter)
+
+    with pytest.raises(ValueError):
+        with tracer.start_span("broken") as span:
+            raise ValueError("boom")
+
+    assert span.status == "ERROR"
+    assert "boom" in span.message
+
+
+def test_exporter_evicts_oldest_traces():
+    exporter = InMemorySpanExporter(max_spans=2)
+    tracer = Tracer(enabled=True, exporter=exporter)
+
+    trace_ids = []
+    for index in range(3):
+        with tracer.start_span("op", {"translation_id": f"tr-{index}"}) as span:
+            trace_ids.append(span.trace_id)
+
+    assert exporter.get_trace(trace_ids[0]) == []
+    assert exporter.find_traces("tr-0") == {}
+    assert exporter.find_traces("tr-2")
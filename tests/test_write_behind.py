@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from models import Job, JobStatus, Translation, TranslationStatus
+from services.job_queue import JobQueueService
+from services.queue_notify import QueueWakeup
+from services.storage import StorageService
+from services.write_behind import WriteBehindBuffer
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(engine):
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _seed(session_factory, count: int) -> None:
+    with session_factory() as session:
+        session.add(Job(id="job-1", images_count=count, status=JobStatus.PROCESSING))
+        for index in range(count):
+            session.add(
+                Translation(
+                    id=f"t-{index}",
+                    job_id="job-1",
+                    image_uuid=f"img-{index}",
+                    original_path="a.png",
+                    source_lang="en",
+                    target_lang="zh",
+                    status=TranslationStatus.PROCESSING,
+                )
+            )
+        session.commit()
+
+
+def _count_commits(engine) -> list:
+    commits: list = []
+    event.listen(engine, "commit", lambda connection: commits.append(1))
+    return commits
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(engine, session_factory):
+    _seed(session_factory, 8)
+    buffer = WriteBehindBuffer(session_factory, interval=0.01)
+    commits = _count_commits(engine)
+
+    def mark_done(translation_id: str):
+        def op(session):
+            session.get(Translation, translation_id).status = TranslationStatus.DONE
+            return translation_id
+
+        return op
+
+    results = await asyncio.gather(*(buffer.submit(mark_done(f"t-{index}")) for index in range(8)))
+
+    assert results == [f"t-{index}" for index in range(8)]
+    assert len(commits) == 1 and buffer.batches == 1
+    with session_factory() as session:
+        assert {row.status for row in session.query(Translation)} == {TranslationStatus.DONE}
+    buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_keyed_ops_coalesce_after_later_writes(session_factory):
+    _seed(session_factory, 2)
+    buffer = WriteBehindBuffer(session_factory, interval=0.01)
+    runs: list = []
+
+    def done(translation_id: str):
+        return lambda session: setattr(session.get(Translation, translation_id), "status", TranslationStatus.DONE)
+
+    def count_done(session):
+        runs.append(1)
+        return session.query(Translation).filter(Translation.status == TranslationStatus.DONE).count()
+
+    futures = [
+        buffer.enqueue(done("t-0")),
+        buffer.enqueue(count_done, key="progress"),
+        buffer.enqueue(done("t-1")),
+        buffer.enqueue(count_done, key="progress"),
+    ]
+    results = await asyncio.gather(*futures)
+
+    assert results[1] == results[3] == 2
+    assert len(runs) == 1
+    buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_op_by_op(session_factory):
+    _seed(session_factory, 1)
+    buffer = WriteBehindBuffer(session_factory, interval=0.01)
+
+    def good(session):
+        session.get(Translation, "t-0").status = TranslationStatus.DONE
+
+    def bad(session):
+        raise RuntimeError("boom")
+
+    good_future, bad_future = buffer.enqueue(good), buffer.enqueue(bad)
+
+    assert await good_future is None
+    with pytest.raises(RuntimeError):
+        await bad_future
+    with session_factory() as session:
+        assert session.get(Translation, "t-0").status is TranslationStatus.DONE
+    buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_job_completion_announced_once_for_coalesced_progress(engine, session_factory):
+    _seed(session_factory, 2)
+    queue = JobQueueService(
+        session_factory,
+        storage_service=StorageService(),
+        translator_factory=lambda: None,  # type: ignore[return-value, arg-type]
+        wakeup=QueueWakeup(engine, channel="translation_queue"),
+        write_buffer=WriteBehindBuffer(session_factory, interval=0.01),
+    )
+    outcomes = [
+        queue._record_outcome(
+            "job-1",
+            lambda session, index=index: queue._mark_translation_done(
+                session, translation_id=f"t-{index}", result_path="r.png"
+            ),
+        )
+        for index in range(2)
+    ]
+    progress = await asyncio.gather(*(future for _, future in outcomes))
+
+    assert progress[0] is progress[1] and progress[0].remaining == 0
+    assert [result.take_completion() for result in progress] == [True, False]
+    with session_factory() as session:
+        assert session.get(Job, "job-1").status is JobStatus.DONE
+    await queue.drain_writes()
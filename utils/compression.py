@@ -0,0 +1,44 @@
+"""Compression helpers for large text blobs stored in the database."""
+
+from __future__ import annotations
+
+import zlib
+from typing import Tuple
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - fall back to zlib
+    zstandard = None  # type: ignore[assignment]
+
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+CODEC_IDENTITY = "identity"
+
+# 模板 JSON 重复度高，低压缩级别已能拿到大部分收益且开销很小
+_ZSTD_LEVEL = 3
+_ZLIB_LEVEL = 6
+
+
+def compress_text(text: str) -> Tuple[str, bytes]:
+    """Compress UTF-8 text with zstd when installed, else zlib; returns (codec, payload)."""
+
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+    return CODEC_ZLIB, zlib.compress(raw, _ZLIB_LEVEL)
+
+
+def decompress_text(codec: str, payload: bytes) -> str:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:  # pragma: no cover - depends on optional dependency
+            raise RuntimeError("zstandard 未安装，无法解压 zstd 数据")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == CODEC_IDENTITY:
+        return bytes(payload).decode("utf-8")
+    raise ValueError(f"unknown codec {codec!r}")
+
+
+__all__ = ["CODEC_IDENTITY", "CODEC_ZLIB", "CODEC_ZSTD", "compress_text", "decompress_text"]